@@ -0,0 +1,22 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from pingparsing._generator import (  # noqa
+    GeneratedPing,
+    OsType,
+    PingOutputGenerator,
+    generate_ping_output,
+)
+
+
+def get_mean_time(benchmark):
+    """
+    Mean time [sec] of a benchmark. |None| if benchmarks are disabled
+    (``--benchmark-disable``): the benchmarked function is only called once.
+    """
+
+    if benchmark.stats is None:
+        return None
+
+    return benchmark.stats.stats.mean
@@ -0,0 +1,51 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import heapq
+
+import pytest
+
+from pingparsing import PingStats, PingStatsBatch
+
+
+NUM_RESULTS = 10000
+TOP_K = 100
+
+
+@pytest.fixture(scope="module")
+def stats_list():
+    return [
+        PingStats(
+            destination=f"192.168.{i // 250}.{i % 250 + 1}",
+            packet_transmit=10,
+            packet_receive=10 - i % 4,
+            rtt_min=1.0 + i % 7,
+            rtt_avg=10.0 + i % 11,
+            rtt_max=20.0 + i % 13,
+            rtt_mdev=0.5,
+            duplicates=i % 2,
+        )
+        for i in range(NUM_RESULTS)
+    ]
+
+
+def test_bench_top_k_stats_list(benchmark, stats_list):
+    benchmark(heapq.nlargest, TOP_K, stats_list, key=lambda stats: stats.packet_loss_rate)
+
+
+def test_bench_top_k_batch(benchmark, stats_list):
+    batch = PingStatsBatch.from_stats(stats_list)
+
+    benchmark(batch.top_k, TOP_K, "packet_loss_rate")
+
+
+def test_bench_build_batch(benchmark, stats_list):
+    benchmark(PingStatsBatch.from_stats, stats_list)
+
+
+def test_bench_batch_bytes(benchmark, stats_list):
+    batch = PingStatsBatch.from_stats(stats_list)
+
+    benchmark(lambda: PingStatsBatch.from_bytes(batch.to_bytes()))
+    benchmark.extra_info["bytes"] = len(batch.to_bytes())
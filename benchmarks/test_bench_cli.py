@@ -0,0 +1,57 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from pingparsing.__main__ import ExecutorType
+
+from test.data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, WINDOWS7SP1_SUCCESS
+
+
+NUM_FILES = 32
+
+
+def run_cli(args, input=None):
+    proc = subprocess.run(
+        [sys.executable, "-m", "pingparsing"] + args,
+        input=input,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+
+    return proc.stdout
+
+
+@pytest.fixture(scope="module")
+def ping_files(tmp_path_factory):
+    tmp_dir = tmp_path_factory.mktemp("ping")
+    file_paths = []
+
+    for i in range(NUM_FILES):
+        data = (DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, WINDOWS7SP1_SUCCESS)[i % 3]
+        file_path = tmp_dir / f"ping_{i}.txt"
+        file_path.write_bytes(
+            data.value if isinstance(data.value, bytes) else data.value.encode("ascii")
+        )
+        file_paths.append(str(file_path))
+
+    return file_paths
+
+
+def test_bench_startup_stdin(benchmark):
+    benchmark.pedantic(
+        run_cli, args=(["-", "--no-color"],), kwargs={"input": DEBIAN_SUCCESS_0.value}, rounds=10
+    )
+
+
+@pytest.mark.parametrize(["executor"], [[executor] for executor in ExecutorType.LIST])
+def test_bench_fanout_files(benchmark, ping_files, executor):
+    benchmark.extra_info["files"] = len(ping_files)
+    benchmark.pedantic(
+        run_cli, args=(["--no-color", "--executor", executor] + ping_files,), rounds=5
+    )
@@ -0,0 +1,53 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+
+_IMPORTTIME_REGEXP = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def measure_importtime(code):
+    """
+    Return the cumulative import time [us] of top-level modules reported by
+    ``python -X importtime``.
+    """
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_REGEXP.search(line)
+        if match and len(match.group(3)) == 1:
+            total += int(match.group(2))
+
+    return total
+
+
+def run_python(code):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize(
+    ["code"],
+    [
+        ["import pingparsing"],
+        ["import pingparsing; pingparsing.PingParsing"],
+        ["import pingparsing; pingparsing.PingTransmitter"],
+        ["import pingparsing.__main__"],
+    ],
+)
+def test_bench_importtime(benchmark, code):
+    benchmark.extra_info["importtime_us"] = measure_importtime(code)
+    benchmark.pedantic(run_python, args=(code,), rounds=10)
@@ -0,0 +1,41 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import pytest
+
+from pingparsing import PingParsing, set_logger
+from pingparsing._logger import NullLogger, logger
+
+from test.data import UBUNTU_SUCCESS_1
+
+
+# a few MB of ping output: the cost of a disabled debug message must not depend on the size
+LARGE_TEXT = "x" * (4 * 1024 * 1024)
+
+
+def make_debug_caller(logger_obj):
+    # loguru decides whether a message is enabled by the module name of the caller,
+    # so the caller is defined as if it belongs to the pingparsing package.
+    namespace = {"__name__": "pingparsing._benchmark", "logger": logger_obj}
+    exec(
+        "def call(text):\n    logger.debug('parsing ping result: {}', text)\n",
+        namespace,
+    )
+
+    return namespace["call"]
+
+
+@pytest.fixture
+def disabled_logger():
+    set_logger(False)
+
+
+@pytest.mark.parametrize(["logger_obj"], [[logger], [NullLogger()]])
+def test_bench_debug_disabled(benchmark, disabled_logger, logger_obj):
+    benchmark(make_debug_caller(logger_obj), LARGE_TEXT)
+
+
+def test_bench_parse_logging_disabled(benchmark, disabled_logger):
+    parser = PingParsing()
+    benchmark(parser.parse, UBUNTU_SUCCESS_1.value)
@@ -0,0 +1,157 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import re
+import tracemalloc
+
+import pytest
+
+from pingparsing import ParseMetrics, PingParsing
+from pingparsing._parser import (
+    AlpineLinuxPingParser,
+    LinuxPingParser,
+    MacOsPingParser,
+    WindowsPingParser,
+)
+
+from .corpus import OsType, generate_ping_output, get_mean_time
+
+
+PARSER_CLASSES = (LinuxPingParser, WindowsPingParser, MacOsPingParser, AlpineLinuxPingParser)
+
+
+def set_throughput(benchmark, generated):
+    mean = get_mean_time(benchmark)
+    if mean is None:
+        return
+
+    benchmark.extra_info["lines"] = generated.num_lines
+    benchmark.extra_info["bytes"] = len(generated.text)
+    benchmark.extra_info["lines_per_sec"] = generated.num_lines / mean
+    benchmark.extra_info["mb_per_sec"] = len(generated.text) / mean / 1024**2
+
+
+@pytest.mark.parametrize(
+    ["os_type", "count"],
+    [[os_type, count] for os_type in OsType.LIST for count in (10, 1000, 10000)],
+)
+def test_bench_parse_throughput(benchmark, os_type, count):
+    generated = generate_ping_output(os_type, count=count, loss_rate=0.05, duplicate_rate=0.01)
+    parser = PingParsing()
+
+    benchmark(parser.parse, generated.text)
+    set_throughput(benchmark, generated)
+
+
+@pytest.mark.parametrize(["loss_rate"], [[0.0], [0.5], [1.0]])
+def test_bench_parse_timestamp(benchmark, loss_rate):
+    generated = generate_ping_output(OsType.LINUX, count=1000, loss_rate=loss_rate, timestamp=True)
+    parser = PingParsing()
+
+    benchmark(parser.parse, generated.text)
+    set_throughput(benchmark, generated)
+
+
+@pytest.mark.parametrize(
+    ["parser_class", "os_type"],
+    [[parser_class, os_type] for parser_class in PARSER_CLASSES for os_type in OsType.LIST],
+)
+def test_bench_parser_detection(benchmark, parser_class, os_type):
+    """
+    Cost of a single parser attempt: failed attempts are paid for every output
+    of the formats that are detected later.
+    """
+
+    lines = generate_ping_output(os_type, count=100).text.splitlines()
+    parser = parser_class()
+
+    def attempt():
+        try:
+            return parser.parse(lines)
+        except Exception:
+            return None
+
+    benchmark(attempt)
+
+
+@pytest.mark.parametrize(["os_type"], [[os_type] for os_type in OsType.LIST])
+def test_bench_parse_memory(benchmark, os_type):
+    generated = generate_ping_output(os_type, count=10000, loss_rate=0.05)
+    parser = PingParsing()
+
+    tracemalloc.start()
+    try:
+        parser.parse(generated.text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info["peak_memory_bytes"] = peak
+    benchmark.extra_info["input_bytes"] = len(generated.text)
+    benchmark.pedantic(parser.parse, args=(generated.text,), rounds=3)
+
+
+@pytest.mark.parametrize(["is_enable"], [[False], [True]])
+def test_bench_parse_metrics(benchmark, is_enable):
+    generated = generate_ping_output(OsType.LINUX, count=1000, timestamp=True)
+    parser = PingParsing(metrics=ParseMetrics() if is_enable else None)
+
+    benchmark(parser.parse, generated.text)
+
+
+ADVERSARIAL_LINES = {
+    "digits": lambda length: "9" * length,
+    "spaces": lambda length: " " * length + "x",
+    "timestamp": lambda length: "[" + "1" * length,
+    "destination": lambda length: "64 bytes from " + "a:" * (length // 2),
+    "destination_paren": lambda length: "64 bytes from a" + " (a" * (length // 3),
+    "repeated_from": lambda length: "1 bytes from " * (length // 13),
+    "headline": lambda length: "--- " * (length // 4),
+}
+
+
+@pytest.mark.parametrize(
+    ["parser_class", "kind", "length"],
+    [
+        [parser_class, kind, length]
+        for parser_class in PARSER_CLASSES
+        for kind in ADVERSARIAL_LINES
+        for length in (1000, 10000, 100000)
+    ],
+)
+def test_bench_adversarial_line(benchmark, parser_class, kind, length):
+    """
+    Matching time of the patterns for a line that nearly matches them.
+    Times should grow linearly with the line length.
+    Lines longer than MAX_LINE_LENGTH are not matched at all while parsing:
+    the patterns are applied directly to measure the worst case.
+    """
+
+    line = ADVERSARIAL_LINES[kind](length)
+    parser = parser_class()
+    regexps = [
+        parser._get_regexp("_icmp_reply_pattern", re.IGNORECASE),
+        parser._get_regexp("_icmp_no_ans_pattern", re.IGNORECASE),
+        parser._get_regexp("_duplicate_packet_pattern"),
+        parser._get_regexp("_stats_headline_pattern"),
+    ]
+
+    def search():
+        return [regexp.search(line) for regexp in regexps]
+
+    benchmark(search)
+    mean = get_mean_time(benchmark)
+    if mean is not None:
+        benchmark.extra_info["chars_per_sec"] = len(line) / mean
+
+
+@pytest.mark.parametrize(["num_lines"], [[10], [1000]])
+def test_bench_parse_long_lines(benchmark, num_lines):
+    generated = generate_ping_output(OsType.LINUX, count=100)
+    lines = generated.text.splitlines()
+    lines[1:1] = ["64 bytes from " + "a:" * 100000] * num_lines
+    text = "\n".join(lines)
+    parser = PingParsing()
+
+    benchmark(parser.parse, text)
@@ -0,0 +1,63 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import json
+
+import pytest
+
+from pingparsing import PingParsing, PingStats
+from pingparsing.__main__ import TimestampFormat, dumps_dict
+
+from .corpus import OsType, generate_ping_output
+
+
+pytest.importorskip("msgpack")
+
+
+COUNTS = (10, 1000, 10000)
+
+
+def make_stats(count):
+    generated = generate_ping_output(
+        OsType.LINUX, count=count, timestamp=True, loss_rate=0.05, duplicate_rate=0.01
+    )
+
+    return PingParsing().parse(generated.text)
+
+
+def dumps_json(stats):
+    return dumps_dict(
+        stats.as_dict(include_icmp_replies=True), timestamp_format=TimestampFormat.DATETIME
+    )
+
+
+@pytest.mark.parametrize(["count"], [[count] for count in COUNTS])
+def test_bench_encode_json(benchmark, count):
+    stats = make_stats(count)
+
+    data = benchmark(dumps_json, stats)
+    benchmark.extra_info["bytes"] = len(data.encode("utf-8"))
+
+
+@pytest.mark.parametrize(["count"], [[count] for count in COUNTS])
+def test_bench_encode_msgpack(benchmark, count):
+    stats = make_stats(count)
+
+    data = benchmark(stats.to_bytes)
+    benchmark.extra_info["bytes"] = len(data)
+    benchmark.extra_info["json_bytes"] = len(dumps_json(stats).encode("utf-8"))
+
+
+@pytest.mark.parametrize(["count"], [[count] for count in COUNTS])
+def test_bench_decode_json(benchmark, count):
+    data = dumps_json(make_stats(count))
+
+    benchmark(json.loads, data)
+
+
+@pytest.mark.parametrize(["count"], [[count] for count in COUNTS])
+def test_bench_decode_msgpack(benchmark, count):
+    data = make_stats(count).to_bytes()
+
+    benchmark(PingStats.from_bytes, data)
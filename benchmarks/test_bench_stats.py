@@ -0,0 +1,52 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import csv
+import io
+
+import pytest
+
+from pingparsing import PingStats
+
+
+NUM_RESULTS = 1_000_000
+FIELDS = ["destination", "packet_loss_rate", "rtt_min", "rtt_avg", "rtt_max"]
+
+
+@pytest.fixture(scope="module")
+def stats_list():
+    return [
+        PingStats(
+            destination=f"192.168.{i // 250 % 250}.{i % 250 + 1}",
+            packet_transmit=10,
+            packet_receive=10 - i % 3,
+            rtt_min=1.0 + i % 7,
+            rtt_avg=10.0 + i % 11,
+            rtt_max=20.0 + i % 13,
+            rtt_mdev=0.5,
+            duplicates=i % 2,
+        )
+        for i in range(NUM_RESULTS)
+    ]
+
+
+def test_bench_as_tuple(benchmark, stats_list):
+    benchmark.pedantic(lambda: [stats.as_tuple() for stats in stats_list], rounds=3)
+
+
+def test_bench_rows(benchmark, stats_list):
+    benchmark.pedantic(lambda: list(PingStats.rows(stats_list)), rounds=3)
+
+
+def test_bench_rows_fields(benchmark, stats_list):
+    benchmark.pedantic(lambda: list(PingStats.rows(stats_list, fields=FIELDS)), rounds=3)
+
+
+def test_bench_rows_csv(benchmark, stats_list):
+    def write_csv():
+        writer = csv.writer(io.StringIO())
+        writer.writerow(FIELDS)
+        writer.writerows(PingStats.rows(stats_list, fields=FIELDS))
+
+    benchmark.pedantic(write_csv, rounds=3)
@@ -0,0 +1,55 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import pytest
+
+from pingparsing import PingParsing
+from pingparsing.store import PingStore
+
+from .corpus import OsType, generate_ping_output, get_mean_time
+
+
+NUM_RESULTS = 100
+COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def stats_list():
+    return [
+        PingParsing().parse(
+            generate_ping_output(
+                OsType.LINUX,
+                destination=f"192.168.0.{i % 250 + 1}",
+                count=COUNT,
+                timestamp=True,
+                loss_rate=0.05,
+                seed=i,
+            ).text
+        )
+        for i in range(NUM_RESULTS)
+    ]
+
+
+def test_bench_store_insert(benchmark, tmp_path, stats_list):
+    counter = iter(range(10**6))
+
+    def insert():
+        with PingStore(str(tmp_path / f"results_{next(counter)}.db")) as store:
+            store.add_all(stats_list)
+
+    benchmark.pedantic(insert, rounds=5)
+
+    num_replies = sum(len(stats.icmp_replies) for stats in stats_list)
+    benchmark.extra_info["replies"] = num_replies
+    mean = get_mean_time(benchmark)
+    if mean is not None:
+        benchmark.extra_info["replies_per_sec"] = num_replies / mean
+
+
+def test_bench_store_aggregate(benchmark, tmp_path, stats_list):
+    store = PingStore(str(tmp_path / "results.db"))
+    store.add_all(stats_list)
+    store.flush()
+
+    benchmark(store.aggregate_replies, 60, destination="192.168.0.1")
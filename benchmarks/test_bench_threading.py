@@ -0,0 +1,52 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import sys
+from concurrent import futures
+
+import pytest
+
+from pingparsing import PingParsing
+
+from .corpus import OsType, generate_ping_output, get_mean_time
+
+
+NUM_TASKS = 32
+
+
+def is_gil_enabled():
+    # sys._is_gil_enabled is available since Python 3.13
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+@pytest.fixture(scope="module")
+def texts():
+    return [
+        generate_ping_output(os_type, count=500, loss_rate=0.05, duplicate_rate=0.01).text
+        for os_type in OsType.LIST
+    ]
+
+
+@pytest.mark.parametrize(["num_threads"], [[1], [2], [4], [8]])
+def test_bench_parse_shared_instance(benchmark, texts, num_threads):
+    """
+    Throughput of a single PingParsing instance shared by multiple threads.
+    Scales with the number of threads only on free-threaded builds of CPython.
+    """
+
+    parser = PingParsing()
+    tasks = [texts[i % len(texts)] for i in range(NUM_TASKS)]
+
+    with futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+
+        def parse_all():
+            return list(executor.map(parser.parse, tasks))
+
+        results = benchmark(parse_all)
+
+    assert all(stats.parser_name for stats in results)
+    benchmark.extra_info["gil_enabled"] = is_gil_enabled()
+    mean = get_mean_time(benchmark)
+    if mean is not None:
+        benchmark.extra_info["parses_per_sec"] = NUM_TASKS / mean
@@ -0,0 +1,43 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+
+Load tests of the transmit path with the fake ping backend: no network access required.
+"""
+
+import pytest
+
+from pingparsing.__main__ import ExecutorType, TimestampFormat, run_async, run_pool
+
+from .corpus import get_mean_time
+
+
+NUM_DESTINATIONS = 10000
+
+
+def make_ping_args(count):
+    # interface, count, packet_size, ttl, deadline, timeout, is_parse_icmp_reply,
+    # timestamp, timezone_name, addopts, fake
+    return (None, count, None, None, None, None, False, TimestampFormat.NONE, None, [], True)
+
+
+@pytest.fixture(scope="module")
+def destinations():
+    return [f"10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(NUM_DESTINATIONS)]
+
+
+@pytest.mark.parametrize(["executor"], [[ExecutorType.THREAD], [ExecutorType.ASYNC]])
+def test_bench_fanout_fake(benchmark, destinations, executor):
+    ping_args = make_ping_args(count=10)
+
+    if executor == ExecutorType.ASYNC:
+        output = benchmark.pedantic(run_async, args=(256, destinations, ping_args), rounds=1)
+    else:
+        output = benchmark.pedantic(
+            run_pool, args=(executor, 32, destinations, ping_args), rounds=1
+        )
+
+    assert len(output) == NUM_DESTINATIONS
+    benchmark.extra_info["destinations"] = NUM_DESTINATIONS
+    mean = get_mean_time(benchmark)
+    if mean is not None:
+        benchmark.extra_info["destinations_per_sec"] = NUM_DESTINATIONS / mean
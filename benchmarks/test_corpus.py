@@ -0,0 +1,49 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import pytest
+
+from pingparsing import PingParsing
+
+from .corpus import OsType, generate_ping_output
+
+
+class Test_generate_ping_output:
+    @pytest.mark.parametrize(
+        ["os_type", "loss_rate", "duplicate_rate", "timestamp"],
+        [
+            [os_type, loss_rate, duplicate_rate, timestamp]
+            for os_type in OsType.LIST
+            for loss_rate in (0.0, 0.2, 1.0)
+            for duplicate_rate in (0.0, 0.1)
+            for timestamp in (False, True)
+        ],
+    )
+    def test_normal(self, os_type, loss_rate, duplicate_rate, timestamp):
+        generated = generate_ping_output(
+            os_type,
+            count=100,
+            loss_rate=loss_rate,
+            duplicate_rate=duplicate_rate,
+            timestamp=timestamp,
+        )
+        stats = PingParsing().parse(generated.text)
+
+        assert stats.packet_transmit == generated.packet_transmit
+        assert stats.packet_receive == generated.packet_receive
+        if os_type == OsType.WINDOWS:
+            assert stats.packet_duplicate_count is None
+        else:
+            assert stats.packet_duplicate_count == generated.duplicates
+        assert len([reply for reply in stats.icmp_replies if "time" in reply]) == (
+            generated.packet_receive + generated.duplicates
+        )
+        if generated.packet_receive:
+            assert stats.rtt_min <= stats.rtt_avg <= stats.rtt_max
+        else:
+            assert stats.rtt_avg is None
+
+    def test_exception(self):
+        with pytest.raises(ValueError):
+            generate_ping_output("unknown")
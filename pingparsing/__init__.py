@@ -2,22 +2,86 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from .__version__ import __author__, __copyright__, __email__, __license__, __version__
 from ._logger import set_log_level, set_logger
-from ._pingparsing import PingParsing
-from ._pingtransmitter import PingResult, PingTransmitter
-from ._stats import PingStats
 from .error import ParseError
 
 
+if TYPE_CHECKING:
+    from ._arrow import PingStatsArrowWriter  # noqa
+    from ._batch import PingStatsBatch  # noqa
+    from ._backend import FakePingBackend, PingBackend  # noqa
+    from ._cache import ParseCache  # noqa
+    from ._metrics import ParseMetrics, ParseStage  # noqa
+    from ._pingparsing import PingParsing  # noqa
+    from ._pingresult import PingResult  # noqa
+    from ._pingtransmitter import PingTransmitter  # noqa
+    from ._sampling import RttSketch  # noqa
+    from ._scheduler import ProbeScheduler  # noqa
+    from ._sequence import SequenceStats  # noqa
+    from ._stats import PingStats  # noqa
+    from ._streaming import PingStreamParser  # noqa
+
+
+# attributes that are imported on first access (PEP 562) to reduce the import time:
+# e.g. parsing does not require to import the transmitter dependencies.
+_LAZY_ATTR_MODULE_MAP = {
+    "FakePingBackend": "._backend",
+    "PingBackend": "._backend",
+    "ParseCache": "._cache",
+    "ParseMetrics": "._metrics",
+    "ParseStage": "._metrics",
+    "PingParsing": "._pingparsing",
+    "PingResult": "._pingresult",
+    "PingStats": "._stats",
+    "PingStatsArrowWriter": "._arrow",
+    "PingStatsBatch": "._batch",
+    "PingStreamParser": "._streaming",
+    "PingTransmitter": "._pingtransmitter",
+    "ProbeScheduler": "._scheduler",
+    "RttSketch": "._sampling",
+    "SequenceStats": "._sequence",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_ATTR_MODULE_MAP[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTR_MODULE_MAP))
+
+
 __all__ = (
     "set_log_level",
     "set_logger",
     "PingParsing",
     "PingResult",
     "PingStats",
+    "PingStatsArrowWriter",
+    "PingStatsBatch",
+    "PingStreamParser",
     "PingTransmitter",
     "ParseError",
+    "FakePingBackend",
+    "PingBackend",
+    "ParseCache",
+    "ParseMetrics",
+    "ParseStage",
+    "ProbeScheduler",
+    "RttSketch",
+    "SequenceStats",
     "__author__",
     "__copyright__",
     "__email__",
@@ -3,24 +3,42 @@
 """
 
 import argparse
-import multiprocessing
+import functools
 import os
 import sys
 from datetime import datetime
 from textwrap import dedent
-from typing import Any, Dict, Optional, Tuple
-
-import humanreadable as hr
-from pytz import timezone
-from subprocrunner import CommandError
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
 
 from .__version__ import __version__
 from ._logger import logger, set_logger
-from ._pingparsing import PingParsing
-from ._pingtransmitter import PingTransmitter
 from ._typing import PingAddOpts, TimeArg
 
 
+if TYPE_CHECKING:
+    from ._cache import ParseCache  # noqa
+    from ._pingresult import PingResult  # noqa
+    from ._pingparsing import PingParsing  # noqa
+    from ._pingtransmitter import PingTransmitter  # noqa
+    from ._stats import PingStats  # noqa
+
+
+# heavy modules (the parser stack, subprocrunner, pytz, etc.) are imported where they are
+# actually used to reduce the startup time of short invocations.
+
+
 try:
     import simplejson as json
 except ImportError:
@@ -28,6 +46,7 @@ except ImportError:
 
 
 DEFAULT_COUNT = 10
+PENDING_TASKS_PER_WORKER = 4
 TIMESTAMP_TYPES = (int, float, str)
 
 
@@ -38,6 +57,19 @@ class TimestampFormat:
     LIST = (NONE, EPOCH, DATETIME)
 
 
+class OutputFormat:
+    JSON = "json"
+    MSGPACK = "msgpack"
+    LIST = (JSON, MSGPACK)
+
+
+class ExecutorType:
+    THREAD = "thread"
+    PROCESS = "process"
+    ASYNC = "async"
+    LIST = (THREAD, PROCESS, ASYNC)
+
+
 class LogLevel:
     DEBUG = "DEBUG"
     INFO = "INFO"
@@ -45,12 +77,25 @@ class LogLevel:
 
 
 def _get_unit_help_msg() -> str:
+    import humanreadable as hr
+
     return ", ".join(["/".join(values) for values in hr.Time.get_text_units().values()])
 
 
+class HelpFormatter(argparse.RawDescriptionHelpFormatter):
+    def _get_help_string(self, action: argparse.Action) -> Optional[str]:
+        help_msg = super()._get_help_string(action)
+
+        # defer the import of humanreadable until the help message is actually required
+        if help_msg and "{units}" in help_msg:
+            return help_msg.format(units=_get_unit_help_msg())
+
+        return help_msg
+
+
 def parse_option() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        formatter_class=argparse.RawDescriptionHelpFormatter,
+        formatter_class=HelpFormatter,
         epilog=dedent(
             """\
             Documentation: https://pingparsing.rtfd.io/
@@ -64,10 +109,56 @@ def parse_option() -> argparse.Namespace:
     if not use_stdin or found_stdin_specifier:
         parser.add_argument(
             "destination_or_file",
-            nargs="+",
-            help="Destinations to send ping or files to parse. '-' for parsing the standard input.",
+            nargs="*",
+            help="""Destinations to send ping or files to parse. '-' for parsing the standard input.
+            gzip/bzip2/xz/zstd compressed files are decompressed while parsing.
+            A file/the standard input that contains outputs of multiple ping executions
+            results in a list of results; truncated outputs in it are skipped.
+            """,
         )
 
+    group = parser.add_argument_group("Input Options")  # type: ignore
+    group.add_argument(
+        "--recursive",
+        metavar="DIR",
+        action="append",
+        default=[],
+        help="""Parse files under the directory and its subdirectories.
+        Can be specified multiple times.
+        """,
+    )
+    group.add_argument(
+        "--glob",
+        metavar="PATTERN",
+        help="""Parse only files whose names match the shell-style wildcard pattern
+        (e.g. '*.txt.gz') under directories specified by --recursive.
+        """,
+    )
+    group.add_argument(
+        "--follow",
+        metavar="FILE",
+        help="""Follow a log file that ping outputs are appended to (like 'tail -F'), e.g.
+        outputs of 'ping -D -O'. Replies are summarized for each time window,
+        and a result is output as a line when a window is closed.
+        Rotations and truncations of the file are handled.
+        """,
+    )
+    group.add_argument(
+        "--window",
+        type=float,
+        default=60.0,
+        help="""Length of time windows [sec] to summarize replies for --follow.
+        (default= %(default)s)
+        """,
+    )
+    group.add_argument(
+        "--targets-file",
+        metavar="FILE",
+        help="""File of destinations/files to process: one target per line.
+        Empty lines and lines starting with '#' are ignored.
+        """,
+    )
+
     parser.add_argument(
         "--max-workers",
         type=int,
@@ -75,6 +166,25 @@ def parse_option() -> argparse.Namespace:
         Defaults to equal two times the number of cores.
         """,
     )
+    parser.add_argument(
+        "--executor",
+        choices=ExecutorType.LIST,
+        help="""Execution model for when multiple destinations/files are specified.
+        {0}: send pings/parse files with a thread pool.
+        {1}: send pings/parse files with a process pool, suited for parsing many files.
+        {2}: send pings as asyncio subprocesses within a single thread.
+        Defaults to '{1}' if all of the arguments are files, '{0}' otherwise.
+        """.format(ExecutorType.THREAD, ExecutorType.PROCESS, ExecutorType.ASYNC),
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="""Directory to cache parse results of files.
+        Files are not parsed again unless the paths, modification times, or sizes are changed.
+        Requires the msgpack package.
+        """,
+    )
 
     group = parser.add_argument_group("Ping Options")  # type: ignore
     group.add_argument(
@@ -116,7 +226,7 @@ def parse_option() -> argparse.Namespace:
 
         see also ping(8) [-w deadline] option description.
         note: The meaning of the 'deadline' may differ system from to system.
-        """.format(units=_get_unit_help_msg()),
+        """,
     )
     group.add_argument(
         "--timeout",
@@ -131,12 +241,34 @@ def parse_option() -> argparse.Namespace:
 
         See also ping(8) [-W timeout] option description.
         note: The meaning of the 'timeout' may differ from system to system.
-        """.format(units=_get_unit_help_msg()),
+        """,
     )
     group.add_argument("-I", "--interface", dest="interface", help="network interface")
     group.add_argument("--addopts", metavar="OPTIONS", help="extra command line options")
+    group.add_argument(
+        "--fake",
+        action="store_true",
+        default=False,
+        help="""Generate ping results by a fake backend instead of executing the ping command.
+        No packets are sent. Intended for load testing without network access.
+        """,
+    )
 
     group = parser.add_argument_group("Output Options")  # type: ignore
+    group.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OutputFormat.LIST,
+        default=OutputFormat.JSON,
+        help="""Output format.
+        {0}: JSON text.
+        {1}: compact binary format (MessagePack) written to the standard output.
+        a result is serialized by PingStats.to_bytes(), multiple results are
+        serialized as a map of destinations/files to serialized results.
+        requires the msgpack package.
+        (default= %(default)s)
+        """.format(OutputFormat.JSON, OutputFormat.MSGPACK),
+    )
     group.add_argument(
         "--indent",
         type=int,
@@ -156,6 +288,13 @@ def parse_option() -> argparse.Namespace:
         "--timezone",
         help="Time zone for timestamps.",
     )
+    group.add_argument(
+        "--store",
+        metavar="DB_PATH",
+        help="""Store results including ICMP replies to a SQLite database.
+        The database is created if it does not exist.
+        """,
+    )
     group.add_argument(
         "--no-color",
         action="store_true",
@@ -182,7 +321,22 @@ def parse_option() -> argparse.Namespace:
         help="suppress execution log messages.",
     )
 
-    return parser.parse_args()
+    options = parser.parse_args()
+
+    if options.glob and not options.recursive:
+        parser.error("--glob requires --recursive")
+    if (
+        hasattr(options, "destination_or_file")
+        and not options.destination_or_file
+        and not options.recursive
+        and not options.targets_file
+        and not options.follow
+    ):
+        parser.error("requires destinations/files, --recursive, --targets-file, or --follow")
+    if options.window <= 0:
+        parser.error("--window must be greater than zero")
+
+    return options
 
 
 def initialize_logger(log_level: str) -> None:
@@ -222,6 +376,148 @@ def is_use_stdin() -> Tuple[bool, bool]:
     return (len(sys.argv) == 1 or found_stdin_specifier, found_stdin_specifier)
 
 
+def make_transmitter(
+    destination: str,
+    interface: Optional[str],
+    count: int,
+    packet_size: Optional[int],
+    ttl: Optional[int],
+    deadline: TimeArg,
+    timeout: TimeArg,
+    is_parse_icmp_reply: bool,
+    timestamp: str,
+    addopts: PingAddOpts,
+    fake: bool = False,
+) -> "PingTransmitter":
+    from ._pingtransmitter import PingTransmitter
+
+    transmitter = PingTransmitter()
+    transmitter.destination = destination
+    transmitter.interface = interface
+    transmitter.count = count
+    transmitter.packet_size = packet_size
+    transmitter.ttl = ttl
+    transmitter.deadline = deadline  # type: ignore
+    transmitter.timeout = timeout  # type: ignore
+    transmitter.is_quiet = not is_parse_icmp_reply
+    transmitter.timestamp = timestamp != TimestampFormat.NONE
+    transmitter.ping_option = addopts
+
+    if fake:
+        from ._backend import FakePingBackend
+
+        transmitter.backend = FakePingBackend()
+
+    return transmitter
+
+
+def parse_ping_text(
+    dest_or_file: str,
+    ping_result_text: str,
+    is_parse_icmp_reply: bool,
+    timezone_name: str,
+    output_format: str = OutputFormat.JSON,
+) -> Tuple[str, Any]:
+    stats = parse_text_to_stats(ping_result_text, timezone_name)
+
+    return (dest_or_file, format_stats(stats, is_parse_icmp_reply, output_format))
+
+
+def make_ping_parser(
+    timezone_name: Optional[str], cache: Optional["ParseCache"] = None
+) -> "PingParsing":
+    from ._pingparsing import PingParsing
+
+    if timezone_name:
+        from pytz import timezone
+
+        return PingParsing(timezone=timezone(timezone_name), cache=cache)
+
+    return PingParsing(cache=cache)
+
+
+def parse_text_to_stats(ping_result_text: str, timezone_name: str) -> "PingStats":
+    return make_ping_parser(timezone_name).parse(ping_result_text)
+
+
+def parse_file_to_stats_list(
+    file_path: str, timezone_name: str, cache: Optional["ParseCache"] = None
+) -> List["PingStats"]:
+    from ._compression import open_ping_file
+
+    # a file may be compressed, and may contain outputs of multiple ping executions
+    with open_ping_file(file_path) as f:
+        return list(make_ping_parser(timezone_name, cache).parse_all(f))
+
+
+def format_stats(stats: "PingStats", is_parse_icmp_reply: bool, output_format: str) -> Any:
+    if output_format == OutputFormat.MSGPACK:
+        return stats.to_bytes(include_icmp_replies=is_parse_icmp_reply)
+
+    return stats.as_dict(include_icmp_replies=is_parse_icmp_reply)
+
+
+def format_stats_list(
+    stats_list: Sequence["PingStats"], is_parse_icmp_reply: bool, output_format: str
+) -> Any:
+    """
+    Format a result as is, or results of multiple ping executions as a list.
+    """
+
+    if len(stats_list) > 1:
+        return [format_stats(stats, is_parse_icmp_reply, output_format) for stats in stats_list]
+
+    if not stats_list:
+        from ._stats import PingStats
+
+        return format_stats(PingStats(), is_parse_icmp_reply, output_format)
+
+    return format_stats(stats_list[0], is_parse_icmp_reply, output_format)
+
+
+@functools.lru_cache(maxsize=None)
+def get_parse_cache(cache_dir: str) -> "ParseCache":
+    """
+    Get the cache of a directory, shared among the files parsed in the process.
+    """
+
+    from ._cache import ParseCache
+
+    return ParseCache(disk_dir=cache_dir)
+
+
+def parse_ping_file(
+    file_path: str,
+    is_parse_icmp_reply: bool,
+    timezone_name: str,
+    output_format: str = OutputFormat.JSON,
+    cache_dir: Optional[str] = None,
+) -> Tuple[str, Any]:
+    if not cache_dir:
+        stats_list = parse_file_to_stats_list(file_path, timezone_name)
+
+        return (file_path, format_stats_list(stats_list, is_parse_icmp_reply, output_format))
+
+    cache = get_parse_cache(cache_dir)
+    cached_stats_list = cache.get_file(file_path, timezone_name)
+    if cached_stats_list is None:
+        stats_list = parse_file_to_stats_list(file_path, timezone_name, cache)
+        cache.put_file(file_path, stats_list, timezone_name)
+    else:
+        logger.debug("cache hit: {}", file_path)
+        stats_list = cached_stats_list
+
+    return (file_path, format_stats_list(stats_list, is_parse_icmp_reply, output_format))
+
+
+def handle_ping_result(result: "PingResult") -> str:
+    if result.returncode != 0:
+        if result.stderr:
+            logger.error(result.stderr)
+
+    return result.stdout
+
+
 def parse_ping(
     dest_or_file: str,
     interface: Optional[str],
@@ -234,43 +530,80 @@ def parse_ping(
     timestamp: str,
     timezone_name: str,
     addopts: PingAddOpts,
+    fake: bool = False,
+    output_format: str = OutputFormat.JSON,
+    cache_dir: Optional[str] = None,
 ) -> Tuple[str, Any]:
     if os.path.isfile(dest_or_file):
-        with open(dest_or_file) as f:
-            ping_result_text = f.read()
-    else:
-        transmitter = PingTransmitter()
-        transmitter.destination = dest_or_file
-        transmitter.interface = interface
-        transmitter.count = count
-        transmitter.packet_size = packet_size
-        transmitter.ttl = ttl
-        transmitter.deadline = deadline  # type: ignore
-        transmitter.timeout = timeout  # type: ignore
-        transmitter.is_quiet = not is_parse_icmp_reply
-        transmitter.timestamp = timestamp != TimestampFormat.NONE
-        transmitter.ping_option = addopts
+        return parse_ping_file(
+            dest_or_file, is_parse_icmp_reply, timezone_name, output_format, cache_dir
+        )
 
-        try:
-            result = transmitter.ping()
-        except CommandError as e:
-            logger.error(e)
-            sys.exit(e.errno)
+    transmitter = make_transmitter(
+        dest_or_file,
+        interface,
+        count,
+        packet_size,
+        ttl,
+        deadline,
+        timeout,
+        is_parse_icmp_reply,
+        timestamp,
+        addopts,
+        fake,
+    )
 
-        ping_result_text = result.stdout
-        if result.returncode != 0:
-            if result.stderr:
-                logger.error(result.stderr)
+    result = transmitter.ping()
 
-    if timezone_name:
-        ping_parser = PingParsing(timezone=timezone(timezone_name))
-    else:
-        ping_parser = PingParsing()
+    ping_result_text = handle_ping_result(result)
 
-    stats = ping_parser.parse(ping_result_text)
-    output = stats.as_dict(include_icmp_replies=is_parse_icmp_reply)
+    return parse_ping_text(
+        dest_or_file, ping_result_text, is_parse_icmp_reply, timezone_name, output_format
+    )
 
-    return (dest_or_file, output)
+
+async def parse_ping_async(
+    dest_or_file: str,
+    interface: Optional[str],
+    count: int,
+    packet_size: Optional[int],
+    ttl: Optional[int],
+    deadline: TimeArg,
+    timeout: TimeArg,
+    is_parse_icmp_reply: bool,
+    timestamp: str,
+    timezone_name: str,
+    addopts: PingAddOpts,
+    fake: bool = False,
+    output_format: str = OutputFormat.JSON,
+    cache_dir: Optional[str] = None,
+) -> Tuple[str, Any]:
+    if os.path.isfile(dest_or_file):
+        return parse_ping_file(
+            dest_or_file, is_parse_icmp_reply, timezone_name, output_format, cache_dir
+        )
+
+    transmitter = make_transmitter(
+        dest_or_file,
+        interface,
+        count,
+        packet_size,
+        ttl,
+        deadline,
+        timeout,
+        is_parse_icmp_reply,
+        timestamp,
+        addopts,
+        fake,
+    )
+
+    result = await transmitter.ping_async()
+
+    ping_result_text = handle_ping_result(result)
+
+    return parse_ping_text(
+        dest_or_file, ping_result_text, is_parse_icmp_reply, timezone_name, output_format
+    )
 
 
 def get_ping_param(ns: argparse.Namespace) -> Tuple[int, TimeArg, TimeArg]:
@@ -308,6 +641,105 @@ def print_result(text: str, colorize: bool) -> None:
         print(text)
 
 
+def follow_ping_log(options: argparse.Namespace) -> int:
+    from ._streaming import PingStreamParser
+
+    timezone = None
+    if options.timezone:
+        from pytz import timezone as get_timezone
+
+        timezone = get_timezone(options.timezone)
+
+    store = None
+    if options.store:
+        from .store import PingStore
+
+        store = PingStore(options.store)
+
+    def output(stats: "PingStats") -> None:
+        if store is not None:
+            store.add(stats)
+            store.flush()
+
+        if options.output_format == OutputFormat.MSGPACK:
+            write_binary(stats.to_bytes(include_icmp_replies=options.icmp_reply))
+            return
+
+        print(
+            dumps_dict(
+                stats.as_dict(include_icmp_replies=options.icmp_reply),
+                timestamp_format=options.timestamp,
+            ),
+            flush=True,
+        )
+
+    stream_parser = PingStreamParser(window=options.window, timezone=timezone)
+    try:
+        for stats in stream_parser.follow(options.follow):
+            output(stats)
+    except KeyboardInterrupt:
+        last_stats = stream_parser.flush()
+        if last_stats is not None:
+            output(last_stats)
+    finally:
+        if store is not None:
+            store.close()
+
+    return 0
+
+
+def to_stats(ping_data: Any) -> "PingStats":
+    from ._stats import PingStats
+
+    if isinstance(ping_data, bytes):
+        return PingStats.from_bytes(ping_data)
+
+    return PingStats(
+        destination=ping_data["destination"],
+        packet_transmit=ping_data["packet_transmit"],
+        packet_receive=ping_data["packet_receive"],
+        rtt_min=ping_data["rtt_min"],
+        rtt_avg=ping_data["rtt_avg"],
+        rtt_max=ping_data["rtt_max"],
+        rtt_mdev=ping_data["rtt_mdev"],
+        duplicates=ping_data["packet_duplicate_count"],
+        icmp_replies=ping_data.get("icmp_replies", []),
+    )
+
+
+def to_stats_list(ping_data: Any) -> List["PingStats"]:
+    if isinstance(ping_data, list):
+        return [to_stats(item) for item in ping_data]
+
+    return [to_stats(ping_data)]
+
+
+def store_results(db_path: str, stats_list: Sequence["PingStats"]) -> None:
+    from .store import PingStore
+
+    with PingStore(db_path) as store:
+        store.add_all(stats_list)
+
+    logger.debug("stored {} results to {}", len(stats_list), db_path)
+
+
+def strip_icmp_replies(ping_data: Any) -> Any:
+    if isinstance(ping_data, list):
+        return [strip_icmp_replies(item) for item in ping_data]
+
+    if isinstance(ping_data, bytes):
+        return to_stats(ping_data).to_bytes(include_icmp_replies=False)
+
+    ping_data.pop("icmp_replies", None)
+
+    return ping_data
+
+
+def write_binary(data: bytes) -> None:
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
 def _serialize_epoch(obj):
     if isinstance(obj, datetime):
         return float(obj.strftime("%s.%f"))
@@ -335,7 +767,7 @@ timestamp_serialize_map = {
 }
 
 
-def dumps_dict(obj: Dict, timestamp_format: str, indent: int = 0) -> str:
+def dumps_dict(obj: Any, timestamp_format: str, indent: int = 0) -> str:
     serialize_func = timestamp_serialize_map[timestamp_format]
 
     if indent <= 0:
@@ -344,64 +776,248 @@ def dumps_dict(obj: Dict, timestamp_format: str, indent: int = 0) -> str:
     return json.dumps(obj, indent=indent, default=serialize_func)
 
 
+def iter_dir_files(dir_path: str, pattern: Optional[str] = None) -> Iterator[str]:
+    """
+    Lazily enumerate files under a directory and its subdirectories with ``os.scandir``.
+    Symbolic links to directories are not followed.
+    """
+
+    from fnmatch import fnmatch
+
+    dir_stack = [dir_path]
+
+    while dir_stack:
+        try:
+            with os.scandir(dir_stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        dir_stack.append(entry.path)
+                    elif entry.is_file() and (pattern is None or fnmatch(entry.name, pattern)):
+                        yield entry.path
+        except OSError as e:
+            logger.error(e)
+
+
+def iter_targets_file(file_path: str) -> Iterator[str]:
+    with open(file_path) as f:
+        for line in f:
+            target = line.strip()
+            if target and not target.startswith("#"):
+                yield target
+
+
+def iter_targets(options: argparse.Namespace) -> Iterator[str]:
+    """
+    Lazily enumerate destinations/files specified by the positional arguments,
+    ``--targets-file``, and ``--recursive``.
+    """
+
+    yield from options.destination_or_file
+
+    if options.targets_file:
+        yield from iter_targets_file(options.targets_file)
+
+    for dir_path in options.recursive:
+        yield from iter_dir_files(dir_path, options.glob)
+
+
+def select_executor_type(executor_type: Optional[str], dest_or_file_list: Iterable[str]) -> str:
+    if executor_type:
+        return executor_type
+
+    if all(os.path.isfile(dest_or_file) for dest_or_file in dest_or_file_list):
+        # parsing files is CPU-bound: worth to spread over processes
+        return ExecutorType.PROCESS
+
+    # sending pings is mostly waiting for child processes: threads are enough
+    return ExecutorType.THREAD
+
+
+def make_error_entry(dest_or_file: str, e: Exception) -> Dict[str, str]:
+    """
+    Make an output entry of a target failed to ping/parse
+    (e.g. a corrupted file, or failed to execute ``ping``).
+    Failures of a target should not discard the results of the other targets.
+    """
+
+    logger.error("failed to process {}: {}", dest_or_file, e)
+
+    return {"error": str(e) or type(e).__name__}
+
+
+def is_error_entry(ping_data: Any) -> bool:
+    return isinstance(ping_data, dict) and "error" in ping_data
+
+
+def run_pool(
+    executor_type: str, max_workers: int, dest_or_file_list: Iterable[str], ping_args: Tuple
+) -> Dict[str, Any]:
+    from concurrent import futures
+
+    output = {}
+    executor_class: Type[futures.Executor]
+
+    if executor_type == ExecutorType.PROCESS:
+        executor_class = futures.ProcessPoolExecutor
+    else:
+        executor_class = futures.ThreadPoolExecutor
+
+    def store_output(done: Iterable[futures.Future]) -> None:
+        for future in done:
+            dest_or_file = target_map.pop(future)
+            try:
+                key, ping_data = future.result()
+            except Exception as e:
+                key, ping_data = dest_or_file, make_error_entry(dest_or_file, e)
+            output[key] = ping_data
+
+    # targets are submitted as workers become free: the number of pending futures is bounded
+    # regardless of the number of targets
+    max_pending = max_workers * PENDING_TASKS_PER_WORKER
+
+    with executor_class(max_workers) as executor:
+        pending: Set[futures.Future] = set()
+        target_map: Dict[futures.Future, str] = {}
+
+        for dest_or_file in dest_or_file_list:
+            if len(pending) >= max_pending:
+                done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                store_output(done)
+
+            future = executor.submit(parse_ping, dest_or_file, *ping_args)
+            target_map[future] = dest_or_file
+            pending.add(future)
+
+        store_output(futures.as_completed(pending))
+
+    return output
+
+
+def run_async(
+    max_workers: int, dest_or_file_list: Iterable[str], ping_args: Tuple
+) -> Dict[str, Any]:
+    import asyncio
+
+    async def run() -> Dict[str, Any]:
+        output = {}
+        target_iter = iter(dest_or_file_list)
+
+        # each worker takes the next target when finished the previous one:
+        # targets are not enumerated ahead of the workers
+        async def worker() -> None:
+            for dest_or_file in target_iter:
+                try:
+                    key, ping_data = await parse_ping_async(dest_or_file, *ping_args)
+                except Exception as e:
+                    key, ping_data = dest_or_file, make_error_entry(dest_or_file, e)
+                output[key] = ping_data
+
+        await asyncio.gather(*[worker() for _ in range(max_workers)])
+
+        return output
+
+    return asyncio.run(run())
+
+
 def main() -> int:
     options = parse_option()
 
     initialize_logger(options.log_level)
 
-    output = {}
+    if options.follow:
+        return follow_ping_log(options)
+
+    output: Any = {}
+    returncode = 0
     use_stdin, found_stdin_specifier = is_use_stdin()
     if not use_stdin and not found_stdin_specifier:
-        from concurrent import futures
+        import itertools
+        import multiprocessing
 
         max_workers = (
             multiprocessing.cpu_count() * 2 if options.max_workers is None else options.max_workers
         )
+        target_iter = iter_targets(options)
+
+        # select the executor type by leading targets not to enumerate all of the targets
+        head_targets = list(
+            itertools.islice(target_iter, len(options.destination_or_file) + max_workers)
+        )
+        executor_type = select_executor_type(options.executor, head_targets)
+        target_iter = itertools.chain(head_targets, target_iter)
         count, deadline, timeout = get_ping_param(options)
         logger.debug(
-            "max-workers={}, count={}, deadline={}, timeout={}".format(
-                max_workers, count, deadline, timeout
-            )
+            "executor={}, max-workers={}, count={}, deadline={}, timeout={}",
+            executor_type,
+            max_workers,
+            count,
+            deadline,
+            timeout,
         )
 
-        try:
-            with futures.ProcessPoolExecutor(max_workers) as executor:
-                future_list = []
-                for dest_or_file in options.destination_or_file:
-                    future_list.append(
-                        executor.submit(
-                            parse_ping,
-                            dest_or_file,
-                            options.interface,
-                            count,
-                            options.packet_size,
-                            options.ttl,
-                            deadline,
-                            timeout,
-                            options.icmp_reply,
-                            options.timestamp,
-                            options.timezone,
-                            options.addopts if options.addopts is not None else [],
-                        )
-                    )
-
-                for future in futures.as_completed(future_list):
-                    key, ping_data = future.result()
-                    output[key] = ping_data
-        finally:
-            executor.shutdown()
+        ping_args = (
+            options.interface,
+            count,
+            options.packet_size,
+            options.ttl,
+            deadline,
+            timeout,
+            # replies are required to store them
+            options.icmp_reply or options.store is not None,
+            options.timestamp,
+            options.timezone,
+            options.addopts if options.addopts is not None else [],
+            options.fake,
+            options.output_format,
+            options.cache_dir,
+        )
+
+        if executor_type == ExecutorType.ASYNC:
+            output = run_async(max_workers, target_iter, ping_args)
+        else:
+            output = run_pool(executor_type, max_workers, target_iter, ping_args)
+
+        if any(is_error_entry(ping_data) for ping_data in output.values()):
+            returncode = 1
+
+        if options.store:
+            store_results(
+                options.store,
+                [
+                    stats
+                    for ping_data in output.values()
+                    if not is_error_entry(ping_data)
+                    for stats in to_stats_list(ping_data)
+                ],
+            )
+            if not options.icmp_reply:
+                output = {key: strip_icmp_replies(ping_data) for key, ping_data in output.items()}
     else:
-        ping_result_text = sys.stdin.read()
+        from ._pingparsing import PingParsing
+
+        # the standard input may contain outputs of multiple ping executions
         ping_parser = PingParsing()
-        stats = ping_parser.parse(ping_result_text)
-        output = stats.as_dict(include_icmp_replies=options.icmp_reply)
+        stats_list = list(ping_parser.parse_all(sys.stdin))
+        if options.store:
+            store_results(options.store, stats_list)
+
+        output = format_stats_list(stats_list, options.icmp_reply, options.output_format)
+        if isinstance(output, bytes):
+            write_binary(output)
+            return 0
+
+    if options.output_format == OutputFormat.MSGPACK:
+        import msgpack
+
+        write_binary(msgpack.packb(output, use_bin_type=True))
+        return returncode
 
     print_result(
         dumps_dict(output, timestamp_format=options.timestamp, indent=options.indent),
         colorize=not options.no_color,
     )
 
-    return 0
+    return returncode
 
 
 if __name__ == "__main__":
@@ -0,0 +1,290 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from ._serialization import _to_microseconds
+from ._stats import PingStats
+
+
+if TYPE_CHECKING:
+    import pyarrow  # noqa
+
+
+_SUMMARY_COLUMNS = (
+    "result_id",
+    "destination",
+    "packet_transmit",
+    "packet_receive",
+    "packet_loss_count",
+    "packet_loss_rate",
+    "rtt_min",
+    "rtt_avg",
+    "rtt_max",
+    "rtt_mdev",
+    "packet_duplicate_count",
+    "packet_duplicate_rate",
+)
+_REPLY_COLUMNS = (
+    "result_id",
+    "destination",
+    "timestamp",
+    "icmp_seq",
+    "ttl",
+    "bytes",
+    "time",
+    "duplicate",
+)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow package is required for the Arrow/Parquet export: "
+            "pip install pingparsing[arrow]"
+        ) from e
+
+    return pyarrow
+
+
+def _make_summary_schema(pa) -> "pyarrow.Schema":
+    return pa.schema(
+        [
+            ("result_id", pa.int64()),
+            ("destination", pa.string()),
+            ("packet_transmit", pa.int64()),
+            ("packet_receive", pa.int64()),
+            ("packet_loss_count", pa.int64()),
+            ("packet_loss_rate", pa.float64()),
+            ("rtt_min", pa.float64()),
+            ("rtt_avg", pa.float64()),
+            ("rtt_max", pa.float64()),
+            ("rtt_mdev", pa.float64()),
+            ("packet_duplicate_count", pa.int64()),
+            ("packet_duplicate_rate", pa.float64()),
+        ]
+    )
+
+
+def _make_reply_schema(pa) -> "pyarrow.Schema":
+    return pa.schema(
+        [
+            ("result_id", pa.int64()),
+            ("destination", pa.string()),
+            ("timestamp", pa.timestamp("us", tz="UTC")),
+            ("icmp_seq", pa.int64()),
+            ("ttl", pa.int64()),
+            ("bytes", pa.int64()),
+            ("time", pa.float64()),
+            ("duplicate", pa.bool_()),
+        ]
+    )
+
+
+class ArrowFormat:
+    #: Apache Parquet
+    PARQUET = "parquet"
+
+    #: Arrow IPC file format (Feather V2)
+    ARROW = "arrow"
+
+    LIST = (PARQUET, ARROW)
+
+
+class _ColumnBuffer:
+    def __init__(self) -> None:
+        self.summary: Dict[str, List[Any]] = {name: [] for name in _SUMMARY_COLUMNS}
+        self.replies: Dict[str, List[Any]] = {name: [] for name in _REPLY_COLUMNS}
+        self.num_results = 0
+
+    def add(self, result_id: int, stats: PingStats, include_icmp_replies: bool) -> None:
+        summary = self.summary
+        summary["result_id"].append(result_id)
+        summary["destination"].append(stats.destination)
+        summary["packet_transmit"].append(stats.packet_transmit)
+        summary["packet_receive"].append(stats.packet_receive)
+        summary["packet_loss_count"].append(stats.packet_loss_count)
+        summary["packet_loss_rate"].append(stats.packet_loss_rate)
+        summary["rtt_min"].append(stats.rtt_min)
+        summary["rtt_avg"].append(stats.rtt_avg)
+        summary["rtt_max"].append(stats.rtt_max)
+        summary["rtt_mdev"].append(stats.rtt_mdev)
+        summary["packet_duplicate_count"].append(stats.packet_duplicate_count)
+        summary["packet_duplicate_rate"].append(stats.packet_duplicate_rate)
+        self.num_results += 1
+
+        icmp_replies = stats.icmp_replies
+        if not include_icmp_replies or not icmp_replies:
+            return
+
+        replies = self.replies
+        replies["result_id"].extend([result_id] * len(icmp_replies))
+        for key in ("destination", "icmp_seq", "ttl", "bytes", "time"):
+            replies[key].extend([reply.get(key) for reply in icmp_replies])
+        replies["timestamp"].extend(
+            [
+                _to_microseconds(timestamp) if isinstance(timestamp, datetime) else None
+                for timestamp in (reply.get("timestamp") for reply in icmp_replies)
+            ]
+        )
+        replies["duplicate"].extend([bool(reply.get("duplicate")) for reply in icmp_replies])
+
+    def to_record_batches(self, pa) -> Tuple["pyarrow.RecordBatch", "pyarrow.RecordBatch"]:
+        summary_schema = _make_summary_schema(pa)
+        reply_schema = _make_reply_schema(pa)
+
+        return (
+            pa.record_batch(
+                [pa.array(self.summary[field.name], type=field.type) for field in summary_schema],
+                schema=summary_schema,
+            ),
+            pa.record_batch(
+                [pa.array(self.replies[field.name], type=field.type) for field in reply_schema],
+                schema=reply_schema,
+            ),
+        )
+
+
+class PingStatsArrowWriter:
+    """
+    Write :py:class:`~pingparsing.PingStats` to Apache Parquet or Arrow IPC files
+    for analytical databases/data frames (e.g. DuckDB, pandas, polars).
+
+    Results are written to two tables that are joinable by ``result_id``:
+    a summary table (a row for each result) and a replies table
+    (a row for each ICMP reply). Results are buffered column by column,
+    and written as a record batch every ``batch_size`` results.
+    Requires the ``pyarrow`` package.
+
+    Args:
+        summary_path:
+            Output path of the summary table.
+        replies_path:
+            Output path of the replies table. ICMP replies are not written if |None|.
+        file_format:
+            ``parquet`` or ``arrow``.
+        batch_size:
+            Number of results to buffer before writing a record batch.
+        start_id:
+            ``result_id`` of the first result.
+
+    Examples:
+        >>> import pingparsing
+        >>> with pingparsing.PingStatsArrowWriter("summary.parquet", "replies.parquet") as writer:
+        ...     writer.write_all(stats_list)
+    """
+
+    def __init__(
+        self,
+        summary_path: str,
+        replies_path: Optional[str] = None,
+        file_format: str = ArrowFormat.PARQUET,
+        batch_size: int = 1024,
+        start_id: int = 0,
+    ) -> None:
+        if file_format not in ArrowFormat.LIST:
+            raise ValueError(f"unknown file format: {file_format}")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+
+        self.__pa = _import_pyarrow()
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.__next_id = start_id
+        self.__buffer = _ColumnBuffer()
+        self.__summary_writer = self.__open(summary_path, _make_summary_schema(self.__pa))
+        self.__replies_writer = None
+        if replies_path is not None:
+            self.__replies_writer = self.__open(replies_path, _make_reply_schema(self.__pa))
+
+    def __enter__(self) -> "PingStatsArrowWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, stats: PingStats, result_id: Optional[int] = None) -> int:
+        """
+        Write a result.
+
+        Args:
+            stats: Result to write.
+            result_id: ID of the result. Defaults to a sequential number.
+
+        Returns:
+            |int|: ``result_id`` of the result.
+        """
+
+        if result_id is None:
+            result_id = self.__next_id
+        self.__next_id = max(self.__next_id, result_id + 1)
+
+        self.__buffer.add(result_id, stats, self.__replies_writer is not None)
+        if self.__buffer.num_results >= self.batch_size:
+            self.flush()
+
+        return result_id
+
+    def write_all(self, stats_iter: Iterable[PingStats]) -> None:
+        for stats in stats_iter:
+            self.write(stats)
+
+    def flush(self) -> None:
+        if not self.__buffer.num_results:
+            return
+
+        summary_batch, replies_batch = self.__buffer.to_record_batches(self.__pa)
+        self.__buffer = _ColumnBuffer()
+
+        self.__write_batch(self.__summary_writer, summary_batch)
+        if self.__replies_writer is not None and replies_batch.num_rows:
+            self.__write_batch(self.__replies_writer, replies_batch)
+
+    def close(self) -> None:
+        if self.__summary_writer is None:
+            return
+
+        self.flush()
+        self.__summary_writer.close()
+        if self.__replies_writer is not None:
+            self.__replies_writer.close()
+        self.__summary_writer = None
+        self.__replies_writer = None
+
+    @staticmethod
+    def to_tables(
+        stats_iter: Iterable[PingStats], start_id: int = 0
+    ) -> Tuple["pyarrow.Table", "pyarrow.Table"]:
+        """
+        Convert results to in-memory Arrow tables.
+
+        Returns:
+            Tuple of the summary table and the replies table.
+        """
+
+        pa = _import_pyarrow()
+        buffer = _ColumnBuffer()
+        for result_id, stats in enumerate(stats_iter, start=start_id):
+            buffer.add(result_id, stats, include_icmp_replies=True)
+
+        summary_batch, replies_batch = buffer.to_record_batches(pa)
+
+        return (pa.Table.from_batches([summary_batch]), pa.Table.from_batches([replies_batch]))
+
+    def __open(self, path: str, schema: "pyarrow.Schema"):
+        if self.file_format == ArrowFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            return pq.ParquetWriter(path, schema)
+
+        return self.__pa.ipc.new_file(path, schema)
+
+    def __write_batch(self, writer, batch: "pyarrow.RecordBatch") -> None:
+        if self.file_format == ArrowFormat.PARQUET:
+            writer.write_table(self.__pa.Table.from_batches([batch]))
+        else:
+            writer.write_batch(batch)
@@ -0,0 +1,179 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import abc
+import itertools
+import math
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Union
+
+from ._cmd_maker import DEFAULT_DEADLINE
+from ._generator import OsType, PingOutputGenerator
+from ._pingresult import PingResult
+
+
+if TYPE_CHECKING:
+    from ._pingtransmitter import PingTransmitter  # noqa
+
+
+class PingBackend(metaclass=abc.ABCMeta):
+    """
+    Base class of backends that execute pings for
+    :py:class:`~pingparsing.PingTransmitter` instead of the ``ping`` command.
+    Set an instance to :py:attr:`PingTransmitter.backend <pingparsing.PingTransmitter.backend>`
+    to use the backend.
+    """
+
+    @abc.abstractmethod
+    def ping(self, transmitter: "PingTransmitter") -> PingResult:  # pragma: no cover
+        pass
+
+    async def ping_async(self, transmitter: "PingTransmitter") -> PingResult:
+        return self.ping(transmitter)
+
+    def ping_lines(self, transmitter: "PingTransmitter") -> Iterator[str]:
+        """
+        Yield ``ping`` output lines for
+        :py:meth:`PingTransmitter.ping_stream <pingparsing.PingTransmitter.ping_stream>`.
+        """
+
+        yield from self.ping(transmitter).stdout.splitlines()
+
+
+class FakePingBackend(PingBackend):
+    """
+    Backend that emits ``ping`` outputs without sending any packets.
+    Useful to test the transmit path deterministically at scale without network access.
+
+    Outputs are generated for the destination/count/timestamp settings of
+    a transmitter, or replayed from ``outputs`` in a round-robin manner.
+
+    Args:
+        outputs:
+            ``ping`` outputs to replay. Outputs are generated if |None|.
+        os_type:
+            Output format of generated outputs: ``linux``/``macos``/``windows``/``alpine``.
+        rtt:
+            Average round trip time of generated outputs [ms].
+        jitter:
+            Standard deviation of round trip times of generated outputs [ms].
+        loss_rate:
+            Probability of a packet loss of generated outputs ``[0, 1]``.
+        duplicate_rate:
+            Probability of a reply to be duplicated of generated outputs ``[0, 1]``.
+        speed:
+            Speed of simulated ``ping`` executions. ``1`` takes the same time as
+            the real ``ping`` command (one packet per second), ``10`` is ten times faster.
+            Returns immediately if |None|.
+        seed:
+            Seed of the random number generator.
+
+    Examples:
+        >>> import pingparsing
+        >>> transmitter = pingparsing.PingTransmitter()
+        >>> transmitter.destination = "192.168.0.1"
+        >>> transmitter.count = 10
+        >>> transmitter.backend = pingparsing.FakePingBackend(loss_rate=0.1, seed=0)
+        >>> result = transmitter.ping()
+    """
+
+    def __init__(
+        self,
+        outputs: Optional[Sequence[Union[str, bytes]]] = None,
+        os_type: str = OsType.LINUX,
+        rtt: float = 10.0,
+        jitter: float = 1.0,
+        loss_rate: float = 0.0,
+        duplicate_rate: float = 0.0,
+        speed: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if os_type not in OsType.LIST:
+            raise ValueError(f"unknown os type: {os_type}")
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be greater than zero")
+
+        self.os_type = os_type
+        self.rtt = rtt
+        self.jitter = jitter
+        self.loss_rate = loss_rate
+        self.duplicate_rate = duplicate_rate
+        self.speed = speed
+
+        self.__lock = threading.Lock()
+        self.__random = random.Random(seed)
+        self.__outputs: Optional[Iterator[str]] = None
+        if outputs is not None:
+            if not outputs:
+                raise ValueError("outputs must not be empty")
+
+            self.__outputs = itertools.cycle(
+                [
+                    output.decode("utf-8") if isinstance(output, bytes) else output
+                    for output in outputs
+                ]
+            )
+
+    def ping(self, transmitter: "PingTransmitter") -> PingResult:
+        result = self.__make_result(transmitter)
+
+        duration = self.__calc_duration(transmitter)
+        if duration > 0:
+            time.sleep(duration)
+
+        return result
+
+    async def ping_async(self, transmitter: "PingTransmitter") -> PingResult:
+        import asyncio
+
+        result = self.__make_result(transmitter)
+
+        duration = self.__calc_duration(transmitter)
+        if duration > 0:
+            await asyncio.sleep(duration)
+
+        return result
+
+    def __make_result(self, transmitter: "PingTransmitter") -> PingResult:
+        with self.__lock:
+            if self.__outputs is not None:
+                return PingResult(next(self.__outputs), "", 0)
+
+            seed = self.__random.getrandbits(32)
+
+        generated = PingOutputGenerator(
+            os_type=self.os_type,
+            destination=transmitter.destination,
+            count=self.__get_count(transmitter),
+            loss_rate=self.loss_rate,
+            duplicate_rate=self.duplicate_rate,
+            timestamp=transmitter.timestamp and self.os_type == OsType.LINUX,
+            rtt=self.rtt,
+            jitter=self.jitter,
+            start_time=time.time(),
+            seed=seed,
+        ).generate()
+
+        return PingResult(generated.text, "", 0 if generated.packet_receive > 0 else 1)
+
+    def __calc_duration(self, transmitter: "PingTransmitter") -> float:
+        if self.speed is None:
+            return 0.0
+
+        duration = max(self.__get_count(transmitter) - 1, 0) + self.rtt / 1000
+        if transmitter.deadline is not None:
+            duration = min(duration, transmitter.deadline.seconds)
+
+        return duration / self.speed
+
+    @staticmethod
+    def __get_count(transmitter: "PingTransmitter") -> int:
+        if transmitter.count is not None:
+            return int(transmitter.count)
+        if transmitter.deadline is not None:
+            return max(math.ceil(transmitter.deadline.seconds), 1)
+
+        return DEFAULT_DEADLINE
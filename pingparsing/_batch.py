@@ -0,0 +1,437 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import heapq
+import math
+import struct
+import sys
+from array import array
+from itertools import compress
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ._stats import PingStats
+
+
+_NAN = float("nan")
+_MISSING = -1
+
+# typecodes of int64/float64 columns
+_INT_TYPECODE = "q"
+_FLOAT_TYPECODE = "d"
+
+_INT_COLUMNS = ("destination_index", "packet_transmit", "packet_receive", "packet_duplicate_count")
+_FLOAT_COLUMNS = ("rtt_min", "rtt_avg", "rtt_max", "rtt_mdev")
+_DERIVED_COLUMNS = ("packet_loss_count", "packet_loss_rate", "packet_duplicate_rate")
+
+_MAGIC = b"PSB1"
+_HEADER = struct.Struct("<4sQQQ")
+
+
+def _to_int(value: Optional[int]) -> int:
+    return _MISSING if value is None else value
+
+
+def _to_float(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+def _from_int(value: int) -> Optional[int]:
+    return None if value == _MISSING else value
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _sum_counts(values: array, indices: Sequence[int]) -> Optional[int]:
+    counts = [values[i] for i in indices if values[i] != _MISSING]
+
+    return sum(counts) if counts else None
+
+
+def _select_rtt(select: Callable, values: array, indices: Sequence[int]) -> Optional[float]:
+    rtts = [values[i] for i in indices if not math.isnan(values[i])]
+
+    return select(rtts) if rtts else None
+
+
+def _calc_rate(numerators: Iterable[int], denominators: Iterable[int]) -> array:
+    return array(
+        _FLOAT_TYPECODE,
+        [
+            numerator / denominator * 100 if numerator != _MISSING and denominator > 0 else _NAN
+            for numerator, denominator in zip(numerators, denominators)
+        ],
+    )
+
+
+class PingStatsBatch:
+    """
+    Columnar container of summaries of many :py:class:`~pingparsing.PingStats`
+    (e.g. results of thousands of destinations) to filter/rank/aggregate them
+    without creating a :py:class:`~pingparsing.PingStats` instance for each result.
+
+    Summary fields are stored in contiguous arrays (:py:class:`array.array`):
+    int64 arrays of ``packet_transmit``, ``packet_receive``, ``packet_duplicate_count``,
+    and ``destination_index`` (indices to :py:attr:`.destinations`),
+    and float64 arrays of ``rtt_min``, ``rtt_avg``, ``rtt_max``, and ``rtt_mdev``.
+    Missing values are stored as ``-1`` for integer columns and ``NaN`` for float columns.
+    ICMP replies are not stored.
+
+    Derived columns (``packet_loss_count``, ``packet_loss_rate``, and ``packet_duplicate_rate``)
+    are computed element by element in pure Python for each call, not vectorized.
+    Columns support the buffer protocol:
+    e.g. ``numpy.frombuffer(batch.column("rtt_avg"))`` makes a NumPy array without copying,
+    for vectorized computations.
+
+    Examples:
+        >>> import pingparsing
+        >>> batch = pingparsing.PingStatsBatch.from_stats(stats_list)
+        >>> batch.top_k(10, "packet_loss_rate")  # ten results with the highest loss rates
+        >>> lossy_batch = batch.filter(rate > 5 for rate in batch.packet_loss_rate())
+    """
+
+    @property
+    def destinations(self) -> List[str]:
+        """
+        Unique destinations of the results in the order of appearances.
+
+        Returns:
+            |list| of |str|:
+        """
+
+        return self.__destinations
+
+    def __init__(self) -> None:
+        self.__destinations: List[str] = []
+        self.__destination_index_map: Dict[str, int] = {}
+        self.__columns: Dict[str, array] = {name: array(_INT_TYPECODE) for name in _INT_COLUMNS}
+        self.__columns.update({name: array(_FLOAT_TYPECODE) for name in _FLOAT_COLUMNS})
+
+    @classmethod
+    def from_stats(cls, stats_iter: Iterable[PingStats]) -> "PingStatsBatch":
+        batch = cls()
+        batch.extend(stats_iter)
+
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.__columns["packet_transmit"])
+
+    def __iter__(self) -> Iterator[PingStats]:
+        for i in range(len(self)):
+            yield self.get_stats(i)
+
+    def append(self, stats: PingStats) -> None:
+        self.extend([stats])
+
+    def extend(self, stats_iter: Iterable[PingStats]) -> None:
+        columns = self.__columns
+        destination_indices = columns["destination_index"]
+        transmits = columns["packet_transmit"]
+        receives = columns["packet_receive"]
+        duplicates = columns["packet_duplicate_count"]
+        rtt_mins = columns["rtt_min"]
+        rtt_avgs = columns["rtt_avg"]
+        rtt_maxs = columns["rtt_max"]
+        rtt_mdevs = columns["rtt_mdev"]
+
+        for stats in stats_iter:
+            destination_indices.append(self.__get_destination_index(stats.destination))
+            transmits.append(_to_int(stats.packet_transmit))
+            receives.append(_to_int(stats.packet_receive))
+            duplicates.append(_to_int(stats.packet_duplicate_count))
+            rtt_mins.append(_to_float(stats.rtt_min))
+            rtt_avgs.append(_to_float(stats.rtt_avg))
+            rtt_maxs.append(_to_float(stats.rtt_max))
+            rtt_mdevs.append(_to_float(stats.rtt_mdev))
+
+    def column(self, name: str) -> array:
+        """
+        Get a column. Stored columns are returned as is: do not modify them.
+
+        Args:
+            name:
+                Name of a stored column, or a derived column
+                (``packet_loss_count``, ``packet_loss_rate``, or ``packet_duplicate_rate``).
+        """
+
+        if name in self.__columns:
+            return self.__columns[name]
+
+        if name in _DERIVED_COLUMNS:
+            return getattr(self, name)()
+
+        raise ValueError(f"unknown column: {name}")
+
+    def packet_loss_count(self) -> array:
+        columns = self.__columns
+
+        return array(
+            _INT_TYPECODE,
+            [
+                transmit - receive if transmit != _MISSING and receive != _MISSING else _MISSING
+                for transmit, receive in zip(columns["packet_transmit"], columns["packet_receive"])
+            ],
+        )
+
+    def packet_loss_rate(self) -> array:
+        """
+        Packet loss rates [%] of the results. ``NaN`` if not available.
+        """
+
+        return _calc_rate(self.packet_loss_count(), self.__columns["packet_transmit"])
+
+    def packet_duplicate_rate(self) -> array:
+        """
+        Packet duplicate rates [%] of the results. ``NaN`` if not available.
+        """
+
+        columns = self.__columns
+
+        return _calc_rate(columns["packet_duplicate_count"], columns["packet_receive"])
+
+    def get_destination(self, i: int) -> Optional[str]:
+        destination_index = self.__columns["destination_index"][i]
+        if destination_index == _MISSING:
+            return None
+
+        return self.__destinations[destination_index]
+
+    def get_stats(self, i: int) -> PingStats:
+        """
+        Get the ``i``-th result as a :py:class:`~pingparsing.PingStats`.
+        """
+
+        columns = self.__columns
+
+        return PingStats(
+            destination=self.get_destination(i),
+            packet_transmit=_from_int(columns["packet_transmit"][i]),
+            packet_receive=_from_int(columns["packet_receive"][i]),
+            duplicates=_from_int(columns["packet_duplicate_count"][i]),
+            rtt_min=_from_float(columns["rtt_min"][i]),
+            rtt_avg=_from_float(columns["rtt_avg"][i]),
+            rtt_max=_from_float(columns["rtt_max"][i]),
+            rtt_mdev=_from_float(columns["rtt_mdev"][i]),
+        )
+
+    def filter(self, mask: Iterable[bool]) -> "PingStatsBatch":
+        """
+        Select results by a mask.
+
+        Args:
+            mask: Booleans for each result. Results with |True| are selected.
+
+        Returns:
+            A new batch of the selected results.
+        """
+
+        mask = list(mask)
+        if len(mask) != len(self):
+            raise ValueError(f"length of the mask ({len(mask)}) must be {len(self)}")
+
+        return self.__make_batch(
+            {
+                name: array(values.typecode, compress(values, mask))
+                for name, values in self.__columns.items()
+            }
+        )
+
+    def take(self, indices: Sequence[int]) -> "PingStatsBatch":
+        """
+        Select results by indices.
+
+        Returns:
+            A new batch of the selected results in the order of ``indices``.
+        """
+
+        return self.__make_batch(
+            {
+                name: array(values.typecode, [values[i] for i in indices])
+                for name, values in self.__columns.items()
+            }
+        )
+
+    def top_k(self, k: int, key: str = "packet_loss_rate", largest: bool = True) -> List[int]:
+        """
+        Get indices of the worst ``k`` results.
+
+        Args:
+            k: Number of results to get.
+            key: Name of a column to rank the results by.
+            largest:
+                Rank results by the largest values if |True|, by the smallest values otherwise.
+                Results with missing values are excluded.
+
+        Returns:
+            |list| of |int|: Indices of the results in the ranking order.
+            Use :py:meth:`.take` to get them as a batch.
+        """
+
+        values = self.column(key)
+        if values.typecode == _INT_TYPECODE:
+            candidates = [i for i, value in enumerate(values) if value != _MISSING]
+        else:
+            candidates = [i for i, value in enumerate(values) if not math.isnan(value)]
+
+        select: Callable = heapq.nlargest if largest else heapq.nsmallest
+
+        return select(k, candidates, key=values.__getitem__)
+
+    def group_by_destination(self) -> Dict[Optional[str], List[int]]:
+        """
+        Group results by destinations.
+
+        Returns:
+            |dict|: Mapping of destinations to indices of the results.
+        """
+
+        groups: Dict[int, List[int]] = {}
+        for i, destination_index in enumerate(self.__columns["destination_index"]):
+            groups.setdefault(destination_index, []).append(i)
+
+        return {
+            (None if index == _MISSING else self.__destinations[index]): indices
+            for index, indices in groups.items()
+        }
+
+    def aggregate_by_destination(self) -> "PingStatsBatch":
+        """
+        Aggregate results for each destination: packet counts are summed,
+        ``rtt_avg``/``rtt_mdev`` are combined weighted by the number of received packets.
+
+        Returns:
+            A new batch that has a result for each destination.
+        """
+
+        columns = self.__columns
+        transmits = columns["packet_transmit"]
+        receives = columns["packet_receive"]
+        duplicates = columns["packet_duplicate_count"]
+        rtt_mins = columns["rtt_min"]
+        rtt_avgs = columns["rtt_avg"]
+        rtt_maxs = columns["rtt_max"]
+        rtt_mdevs = columns["rtt_mdev"]
+
+        aggregated = PingStatsBatch()
+        for destination, indices in self.group_by_destination().items():
+            weights = [
+                (receives[i], rtt_avgs[i], rtt_mdevs[i])
+                for i in indices
+                if receives[i] > 0 and not math.isnan(rtt_avgs[i])
+            ]
+            rtt_avg = rtt_mdev = None
+            num_received = sum(weight for weight, _, _ in weights)
+            if num_received:
+                rtt_avg = sum(weight * avg for weight, avg, _ in weights) / num_received
+                if all(not math.isnan(mdev) for _, _, mdev in weights):
+                    # pooled standard deviation of the results
+                    square_mean = (
+                        sum(weight * (mdev**2 + avg**2) for weight, avg, mdev in weights)
+                        / num_received
+                    )
+                    rtt_mdev = math.sqrt(max(square_mean - rtt_avg**2, 0))
+
+            aggregated.append(
+                PingStats(
+                    destination=destination,
+                    packet_transmit=_sum_counts(transmits, indices),
+                    packet_receive=_sum_counts(receives, indices),
+                    duplicates=_sum_counts(duplicates, indices),
+                    rtt_min=_select_rtt(min, rtt_mins, indices),
+                    rtt_avg=rtt_avg,
+                    rtt_max=_select_rtt(max, rtt_maxs, indices),
+                    rtt_mdev=rtt_mdev,
+                )
+            )
+
+        return aggregated
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the batch: columns are written as raw little-endian arrays.
+
+        Returns:
+            |bytes|: Serialized batch. Restore with :py:meth:`.from_bytes`.
+        """
+
+        destinations = "\0".join(self.__destinations).encode("utf-8")
+        chunks = [
+            _HEADER.pack(_MAGIC, len(self), len(self.__destinations), len(destinations)),
+            destinations,
+        ]
+        for name in _INT_COLUMNS + _FLOAT_COLUMNS:
+            values = self.__columns[name]
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            chunks.append(values.tobytes())
+
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PingStatsBatch":
+        """
+        Deserialize a batch serialized by :py:meth:`.to_bytes`.
+
+        Raises:
+            ValueError: If the data is not a serialized batch.
+        """
+
+        try:
+            magic, num_results, num_destinations, destinations_size = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ValueError(f"invalid serialized batch: {e}") from e
+        if magic != _MAGIC:
+            raise ValueError("invalid serialized batch")
+
+        offset = _HEADER.size
+        destinations = data[offset : offset + destinations_size].decode("utf-8")
+        offset += destinations_size
+
+        columns = {}
+        for name in _INT_COLUMNS + _FLOAT_COLUMNS:
+            values = array(_INT_TYPECODE if name in _INT_COLUMNS else _FLOAT_TYPECODE)
+            size = num_results * values.itemsize
+            if offset + size > len(data):
+                raise ValueError("invalid serialized batch: truncated data")
+            values.frombytes(data[offset : offset + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            columns[name] = values
+            offset += size
+
+        batch = cls()
+        if num_destinations:
+            batch.__set_destinations(destinations.split("\0"))
+        batch.__columns = columns
+
+        return batch
+
+    def __get_destination_index(self, destination: Optional[str]) -> int:
+        if destination is None:
+            return _MISSING
+
+        destination_index = self.__destination_index_map.get(destination)
+        if destination_index is None:
+            destination_index = len(self.__destinations)
+            self.__destinations.append(destination)
+            self.__destination_index_map[destination] = destination_index
+
+        return destination_index
+
+    def __set_destinations(self, destinations: List[str]) -> None:
+        self.__destinations = destinations
+        self.__destination_index_map = {
+            destination: i for i, destination in enumerate(destinations)
+        }
+
+    def __make_batch(self, columns: Dict[str, array]) -> "PingStatsBatch":
+        # destinations are shared with the new batch: unused destinations may remain
+        batch = PingStatsBatch()
+        batch.__set_destinations(list(self.__destinations))
+        batch.__columns = columns
+
+        return batch
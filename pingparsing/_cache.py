@@ -0,0 +1,310 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .__version__ import __version__
+from ._stats import PingStats
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024**2
+DEFAULT_MAX_DISK_ENTRIES = 4096
+
+# bump when the layout of the files of the disk tier is changed
+_DISK_SCHEMA_VERSION = 1
+_DISK_SUFFIX = ".msgpack"
+
+
+class CacheCounter:
+    HITS = "hits"
+    MISSES = "misses"
+    EVICTIONS = "evictions"
+    DISK_HITS = "disk_hits"
+    DISK_MISSES = "disk_misses"
+    DISK_EVICTIONS = "disk_evictions"
+
+    LIST = (HITS, MISSES, EVICTIONS, DISK_HITS, DISK_MISSES, DISK_EVICTIONS)
+
+
+def _make_digest(data: bytes, options: Tuple) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(data)
+    for option in options:
+        hasher.update(b"\0")
+        hasher.update(str(option).encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parse results.
+
+    Results are keyed by a hash (BLAKE2b) of the input and the parse options,
+    and kept in memory with LRU eviction bounded by both the number of entries and
+    the total size of the inputs.
+    Optionally, results of files are also persisted to ``disk_dir``
+    keyed by the file path, modification time, and size of the files
+    (and the version of the package).
+    Files of the disk tier are serialized with :py:meth:`~pingparsing.PingStats.to_bytes`
+    (requires the ``msgpack`` package), and the least recently used files are removed
+    when the number of the files exceeds ``max_disk_entries``.
+    The files in ``disk_dir`` are scanned only once per instance:
+    reuse an instance to avoid rescanning the directory for each file.
+
+    Cached results are shared among callers and threads (no copies are made):
+    do not modify them, including :py:attr:`~pingparsing.PingStats.icmp_replies`.
+
+    Args:
+        max_entries: Maximum number of results to keep in memory.
+        max_bytes: Maximum total size of inputs [bytes] of results to keep in memory.
+        disk_dir: Directory to persist results of files. Not persisted if |None|.
+        max_disk_entries: Maximum number of results of files to keep in ``disk_dir``.
+
+    Examples:
+        >>> import pingparsing
+        >>> cache = pingparsing.ParseCache(max_entries=256)
+        >>> parser = pingparsing.PingParsing(cache=cache)
+        >>> stats = parser.parse(ping_result)
+        >>> stats = parser.parse(ping_result)
+        >>> cache.counters
+        {'hits': 1, 'misses': 1, 'evictions': 0,
+         'disk_hits': 0, 'disk_misses': 0, 'disk_evictions': 0}
+    """
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Hit/miss/eviction counts of the cache.
+        """
+
+        with self.__lock:
+            return dict(self.__counters)
+
+    @property
+    def hits(self) -> int:
+        return self.__counters[CacheCounter.HITS]
+
+    @property
+    def misses(self) -> int:
+        return self.__counters[CacheCounter.MISSES]
+
+    @property
+    def num_entries(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def num_bytes(self) -> int:
+        return self.__num_bytes
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than zero")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than zero")
+        if max_disk_entries <= 0:
+            raise ValueError("max_disk_entries must be greater than zero")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self.__num_bytes = 0
+        self.__counters = {name: 0 for name in CacheCounter.LIST}
+
+        # paths of the files of the disk tier in least recently used order,
+        # loaded at the first access to the disk tier
+        self.__disk_paths: "Optional[OrderedDict[str, None]]" = None
+
+    @staticmethod
+    def make_key(data: Union[str, bytes], *options: Any) -> str:
+        """
+        Make a cache key from an input and options that affect the parse result.
+        """
+
+        if isinstance(data, str):
+            data = data.encode("utf-8", errors="surrogatepass")
+
+        return _make_digest(data, options)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__counters[CacheCounter.MISSES] += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__counters[CacheCounter.HITS] += 1
+
+            return entry[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        """
+        Add a result.
+
+        Args:
+            key: Cache key made by :py:meth:`make_key`.
+            value: Result to cache.
+            size: Size of the input [bytes].
+        """
+
+        if size > self.max_bytes:
+            return
+
+        with self.__lock:
+            old_entry = self.__entries.pop(key, None)
+            if old_entry is not None:
+                self.__num_bytes -= old_entry[1]
+
+            self.__entries[key] = (value, size)
+            self.__num_bytes += size
+
+            while len(self.__entries) > self.max_entries or self.__num_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__num_bytes -= evicted_size
+                self.__counters[CacheCounter.EVICTIONS] += 1
+
+    def get_file(self, file_path: str, *options: Any) -> Optional[List[PingStats]]:
+        """
+        Get results of a file from the disk tier.
+        Results of files that have been modified after the results are cached are not returned.
+        """
+
+        from ._serialization import _import_msgpack
+
+        disk_path = self.__make_disk_path(file_path, options)
+        if disk_path is None:
+            return None
+
+        msgpack = _import_msgpack()
+        try:
+            with open(disk_path, "rb") as f:
+                stats_list = [
+                    PingStats.from_bytes(data)
+                    for data in msgpack.unpackb(f.read(), raw=False, use_list=True)
+                ]
+            # mark as recently used
+            os.utime(disk_path)
+        except (OSError, TypeError, ValueError):
+            with self.__lock:
+                self.__counters[CacheCounter.DISK_MISSES] += 1
+            return None
+
+        with self.__lock:
+            self.__counters[CacheCounter.DISK_HITS] += 1
+            disk_paths = self.__load_disk_paths()
+            disk_paths[disk_path] = None
+            disk_paths.move_to_end(disk_path)
+
+        return stats_list
+
+    def put_file(self, file_path: str, stats_list: Sequence[PingStats], *options: Any) -> None:
+        """
+        Persist results of a file to the disk tier.
+        """
+
+        import tempfile
+
+        from ._serialization import _import_msgpack
+
+        disk_path = self.__make_disk_path(file_path, options)
+        if disk_path is None:
+            return
+
+        msgpack = _import_msgpack()
+        data = msgpack.packb([stats.to_bytes() for stats in stats_list], use_bin_type=True)
+
+        # write to a temporary file and rename it to avoid leaving partially written files
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, disk_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self.__lock:
+            disk_paths = self.__load_disk_paths()
+            disk_paths[disk_path] = None
+            disk_paths.move_to_end(disk_path)
+
+            evicted_paths = []
+            while len(disk_paths) > self.max_disk_entries:
+                evicted_paths.append(disk_paths.popitem(last=False)[0])
+
+        for evicted_path in evicted_paths:
+            try:
+                os.unlink(evicted_path)
+            except OSError:
+                # removed by another process
+                continue
+
+            with self.__lock:
+                self.__counters[CacheCounter.DISK_EVICTIONS] += 1
+
+    def clear(self) -> None:
+        """
+        Remove all of the results in memory.
+        """
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__num_bytes = 0
+
+    def __make_disk_path(self, file_path: str, options: Tuple) -> Optional[str]:
+        if self.disk_dir is None:
+            return None
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        digest = _make_digest(
+            os.path.abspath(file_path).encode("utf-8", errors="surrogateescape"),
+            (__version__, _DISK_SCHEMA_VERSION, stat.st_mtime_ns, stat.st_size) + options,
+        )
+
+        return os.path.join(self.disk_dir, digest + _DISK_SUFFIX)
+
+    def __load_disk_paths(self) -> "OrderedDict[str, None]":
+        # the caller must hold the lock
+        if self.__disk_paths is not None:
+            return self.__disk_paths
+
+        assert self.disk_dir is not None
+
+        entries = []
+        with os.scandir(self.disk_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(_DISK_SUFFIX):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    # removed by another process
+                    continue
+
+        entries.sort()
+        self.__disk_paths = OrderedDict((path, None) for _, path in entries)
+
+        return self.__disk_paths
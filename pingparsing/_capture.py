@@ -0,0 +1,127 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import random
+from collections import deque
+from typing import Deque, Iterable, List, MutableSequence, Optional, Tuple
+
+
+class SamplingMethod:
+    #: keep the last lines
+    TAIL = "tail"
+
+    #: keep a uniform random sample of lines
+    RESERVOIR = "reservoir"
+
+    LIST = (TAIL, RESERVOIR)
+
+
+class BoundedLineBuffer:
+    """
+    Line buffer with bounded memory to capture ``ping`` outputs.
+
+    The first line (header) and the last ``tail_lines`` lines (statistics block)
+    are always kept. Of the other lines (ICMP replies), at most ``max_lines`` lines
+    are kept: the last ones (ring buffer) or a reservoir sample of them.
+    The kept lines are returned in the original order.
+
+    Args:
+        max_lines: maximum number of lines to keep except the header and the tail.
+        sampling: ``tail`` or ``reservoir``.
+        tail_lines: number of trailing lines always kept.
+        seed: seed of the random number generator for the reservoir sampling.
+    """
+
+    @property
+    def num_lines(self) -> int:
+        """
+        Number of lines added to the buffer.
+        """
+
+        return self.__num_lines
+
+    @property
+    def num_dropped_lines(self) -> int:
+        return max(self.__num_lines - 1 - len(self.__body) - len(self.__tail), 0)
+
+    def __init__(
+        self,
+        max_lines: int,
+        sampling: str = SamplingMethod.TAIL,
+        tail_lines: int = 8,
+        seed: Optional[int] = None,
+    ) -> None:
+        if max_lines < 0:
+            raise ValueError("max_lines must be greater than or equal to zero")
+        if sampling not in SamplingMethod.LIST:
+            raise ValueError(f"unknown sampling method: {sampling}")
+
+        self.__max_lines = max_lines
+        self.__sampling = sampling
+        self.__random = random.Random(seed)
+
+        self.__head: Optional[str] = None
+        self.__tail: Deque[str] = deque(maxlen=tail_lines)
+        self.__body: MutableSequence[Tuple[int, str]]
+        if sampling == SamplingMethod.TAIL:
+            self.__body = deque(maxlen=max_lines)
+        else:
+            self.__body = []
+        self.__num_lines = 0
+        self.__num_body_lines = 0
+
+    def append(self, line: str) -> None:
+        line = line.rstrip("\r\n")
+        self.__num_lines += 1
+
+        if self.__head is None:
+            self.__head = line
+            return
+
+        if len(self.__tail) == self.__tail.maxlen:
+            self.__add_body_line(self.__tail[0])
+
+        self.__tail.append(line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def getlines(self) -> List[str]:
+        if self.__head is None:
+            return []
+
+        if self.__sampling == SamplingMethod.TAIL:
+            body = [line for _, line in self.__body]
+        else:
+            body = [line for _, line in sorted(self.__body)]
+
+        return [self.__head] + body + list(self.__tail)
+
+    def getvalue(self) -> str:
+        lines = self.getlines()
+        if not lines:
+            return ""
+
+        return "\n".join(lines) + "\n"
+
+    def __add_body_line(self, line: str) -> None:
+        index = self.__num_body_lines
+        self.__num_body_lines += 1
+
+        if not self.__max_lines:
+            return
+
+        if self.__sampling == SamplingMethod.TAIL:
+            self.__body.append((index, line))
+            return
+
+        # reservoir sampling (Algorithm R)
+        if len(self.__body) < self.__max_lines:
+            self.__body.append((index, line))
+            return
+
+        replace_idx = self.__random.randint(0, index)
+        if replace_idx < self.__max_lines:
+            self.__body[replace_idx] = (index, line)
@@ -25,6 +25,7 @@ class PingCmdMaker(metaclass=abc.ABCMeta):
         timestamp: bool = False,
         auto_codepage: bool = False,
         ping_option: PingAddOpts = "",
+        is_continuous: bool = False,
     ):
         self.count = count
         if self.count is not None:
@@ -39,6 +40,7 @@ class PingCmdMaker(metaclass=abc.ABCMeta):
         self._timestamp = timestamp
         self.auto_codepage = auto_codepage
         self.ping_option = ping_option
+        self._is_continuous = is_continuous
 
     def make_cmd(self, destination: str) -> Command:
         command_items = (
@@ -151,7 +153,7 @@ class MacosPingCmdMaker(PosixPingCmdMaker):
 
     def _get_deadline_option(self) -> List[str]:
         if self.deadline is None:
-            if self.count:
+            if self.count or self._is_continuous:
                 return []
 
             deadline = DEFAULT_DEADLINE
@@ -178,7 +180,7 @@ class LinuxPingCmdMaker(PosixPingCmdMaker):
 
     def _get_deadline_option(self) -> List[str]:
         if self.deadline is None:
-            if self.count:
+            if self.count or self._is_continuous:
                 return []
 
             deadline = DEFAULT_DEADLINE
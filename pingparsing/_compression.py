@@ -0,0 +1,87 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import io
+from typing import IO, Optional
+
+
+class Compression:
+    NONE = "none"
+    GZIP = "gzip"
+    BZIP2 = "bzip2"
+    XZ = "xz"
+    ZSTD = "zstd"
+
+    LIST = (NONE, GZIP, BZIP2, XZ, ZSTD)
+
+
+_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", Compression.GZIP),
+    (b"BZh", Compression.BZIP2),
+    (b"\xfd7zXZ\x00", Compression.XZ),
+    (b"\x28\xb5\x2f\xfd", Compression.ZSTD),
+)
+_MAX_MAGIC_NUMBER_LEN = max(len(magic) for magic, _ in _MAGIC_NUMBERS)
+
+
+def detect_compression(file_path: str) -> str:
+    """
+    Detect the compression format of a file by the magic number.
+
+    Returns:
+        |str|: One of :py:class:`Compression` values.
+    """
+
+    with open(file_path, "rb") as f:
+        head = f.read(_MAX_MAGIC_NUMBER_LEN)
+
+    for magic, compression in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return compression
+
+    return Compression.NONE
+
+
+def open_ping_file(
+    file_path: str, encoding: Optional[str] = None, errors: Optional[str] = None
+) -> IO[str]:
+    """
+    Open a file of ``ping`` outputs as a text stream.
+    Compressed files (gzip/bzip2/xz/zstd) are decompressed on the fly while reading,
+    thus even a large file is read with constant memory.
+    zstd requires the ``zstandard`` package.
+    """
+
+    compression = detect_compression(file_path)
+
+    if compression == Compression.NONE:
+        return open(file_path, encoding=encoding, errors=errors)
+
+    if compression == Compression.GZIP:
+        import gzip
+
+        return gzip.open(file_path, "rt", encoding=encoding, errors=errors)
+
+    if compression == Compression.BZIP2:
+        import bz2
+
+        return bz2.open(file_path, "rt", encoding=encoding, errors=errors)
+
+    if compression == Compression.XZ:
+        import lzma
+
+        return lzma.open(file_path, "rt", encoding=encoding, errors=errors)
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            f"zstandard package is required to read zstd compressed files: {file_path} "
+            "(pip install pingparsing[zstd])"
+        ) from e
+
+    # zstandard stream readers do not support readline: buffer them for TextIOWrapper
+    reader = zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True)
+
+    return io.TextIOWrapper(io.BufferedReader(reader), encoding=encoding, errors=errors)
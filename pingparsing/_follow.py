@@ -0,0 +1,177 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import os
+import time
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+
+_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_MAX_LINE_SIZE = 64 * 1024
+
+
+class FileFollower:
+    """
+    Read lines appended to a growing file (like ``tail -F``).
+
+    The file is polled by the size and the offset of the last read:
+    only newly appended bytes are read, and a line is returned when it is terminated by
+    a newline. Rotations of the file are detected by changes of the inode
+    (the rest of the old file is read before switching to the new file),
+    and truncations are detected by the file size smaller than the offset.
+    A line that is not terminated within ``max_line_size`` bytes is returned as is,
+    so that a file without newlines does not consume memory indefinitely.
+
+    Args:
+        file_path: Path to the file to follow. The file may not exist yet.
+        poll_interval: Interval [sec] to poll the file when no new lines are found.
+        from_start: Read the file from the start if |True|, from the end otherwise.
+        encoding: Encoding of the file.
+        sleep: Function to wait for ``poll_interval`` seconds.
+        max_line_size: Maximum size of a line [bytes].
+    """
+
+    @property
+    def offset(self) -> int:
+        """
+        Offset of the file that has been read [bytes].
+        """
+
+        if self.__file is None:
+            return 0
+
+        return self.__file.tell()
+
+    def __init__(
+        self,
+        file_path: str,
+        poll_interval: float = 1.0,
+        from_start: bool = True,
+        encoding: str = "utf-8",
+        sleep: Callable[[float], None] = time.sleep,
+        max_line_size: int = DEFAULT_MAX_LINE_SIZE,
+    ) -> None:
+        if poll_interval < 0:
+            raise ValueError("poll_interval must be greater than or equal to zero")
+        if max_line_size <= 0:
+            raise ValueError("max_line_size must be greater than zero")
+
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self.encoding = encoding
+        self.max_line_size = max_line_size
+        self.__sleep = sleep
+        self.__file: Optional[IO[bytes]] = None
+        self.__file_id: Optional[Tuple[int, int]] = None
+        self.__partial_line = b""
+
+        self.__open(seek_end=not from_start)
+
+    def __enter__(self) -> "FileFollower":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def read_lines(self) -> List[str]:
+        """
+        Read lines appended since the last read.
+
+        Returns:
+            |list| of |str|: New lines without line terminators.
+        """
+
+        return list(self.__iter_new_lines())
+
+    def sleep(self) -> None:
+        """
+        Wait for ``poll_interval`` seconds.
+        """
+
+        self.__sleep(self.poll_interval)
+
+    def iter_lines(self, stop: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+        """
+        Yield lines appended to the file.
+        Waits for new lines until ``stop`` returns |True| (forever if |None|).
+        """
+
+        while True:
+            found = False
+            for line in self.__iter_new_lines():
+                found = True
+                yield line
+
+            if stop is not None and stop():
+                return
+
+            if not found:
+                self.sleep()
+
+    def __open(self, seek_end: bool) -> bool:
+        try:
+            f = open(self.file_path, "rb")
+        except FileNotFoundError:
+            return False
+
+        stat = os.fstat(f.fileno())
+        self.__file = f
+        self.__file_id = (stat.st_dev, stat.st_ino)
+        self.__partial_line = b""
+        if seek_end:
+            f.seek(0, os.SEEK_END)
+
+        return True
+
+    def __iter_new_lines(self) -> Iterator[str]:
+        if self.__file is None and not self.__open(seek_end=False):
+            return
+
+        yield from self.__iter_appended_lines()
+
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            # rotated and the new file is not created yet
+            return
+
+        if (stat.st_dev, stat.st_ino) != self.__file_id:
+            # rotated: the rest of the old file has already been read
+            if self.__partial_line:
+                yield self.__decode(self.__partial_line)
+
+            self.close()
+            if self.__open(seek_end=False):
+                yield from self.__iter_appended_lines()
+        elif stat.st_size < self.offset:
+            # truncated: read the file again from the start
+            assert self.__file is not None
+            self.__file.seek(0)
+            self.__partial_line = b""
+            yield from self.__iter_appended_lines()
+
+    def __iter_appended_lines(self) -> Iterator[str]:
+        assert self.__file is not None
+
+        while True:
+            chunk = self.__file.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+
+            *lines, self.__partial_line = (self.__partial_line + chunk).split(b"\n")
+            for line in lines:
+                yield self.__decode(line)
+
+            if len(self.__partial_line) > self.max_line_size:
+                yield self.__decode(self.__partial_line)
+                self.__partial_line = b""
+
+    def __decode(self, line: bytes) -> str:
+        return line.rstrip(b"\r").decode(self.encoding, errors="replace")
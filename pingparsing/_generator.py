@@ -0,0 +1,227 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+
+Synthetic ``ping`` output generator for benchmarks and the fake ping backend.
+"""
+
+import math
+import random
+from typing import List, NamedTuple, Optional
+
+
+class OsType:
+    LINUX = "linux"
+    MACOS = "macos"
+    WINDOWS = "windows"
+    ALPINE = "alpine"
+    LIST = (LINUX, MACOS, WINDOWS, ALPINE)
+
+
+class GeneratedPing(NamedTuple):
+    text: str
+    packet_transmit: int
+    packet_receive: int
+    duplicates: int
+    num_lines: int
+
+
+class PingOutputGenerator:
+    """
+    Generate realistic ``ping`` command outputs.
+
+    Args:
+        os_type: output format. one of :py:attr:`OsType.LIST`.
+        count: number of ICMP echo requests.
+        loss_rate: probability of a packet loss ``[0, 1]``.
+        duplicate_rate: probability of a reply to be duplicated ``[0, 1]``.
+        timestamp: add timestamps to reply lines (``ping -D -O``, Linux only).
+        rtt: average round trip time [ms].
+        jitter: standard deviation of round trip times [ms].
+        seed: seed of the random number generator.
+    """
+
+    def __init__(
+        self,
+        os_type: str = OsType.LINUX,
+        destination: str = "192.168.0.1",
+        count: int = 10,
+        loss_rate: float = 0.0,
+        duplicate_rate: float = 0.0,
+        timestamp: bool = False,
+        rtt: float = 10.0,
+        jitter: float = 1.0,
+        ttl: int = 64,
+        start_time: float = 1596881133.0,
+        seed: Optional[int] = 0,
+    ) -> None:
+        if os_type not in OsType.LIST:
+            raise ValueError(f"unknown os type: {os_type}")
+
+        self.os_type = os_type
+        self.destination = destination
+        self.count = count
+        self.loss_rate = loss_rate
+        self.duplicate_rate = duplicate_rate
+        self.timestamp = timestamp
+        self.rtt = rtt
+        self.jitter = jitter
+        self.ttl = ttl
+        self.start_time = start_time
+        self.__random = random.Random(seed)
+
+    def generate(self) -> GeneratedPing:
+        lines = [self.__make_header()]
+        rtts: List[float] = []
+        duplicates = 0
+        receive = 0
+        first_seq = 1 if self.os_type == OsType.LINUX else 0
+
+        for i in range(self.count):
+            seq = first_seq + i
+            sent_time = self.start_time + i
+
+            if self.__random.random() < self.loss_rate:
+                lost_line = self.__make_lost_line(seq, sent_time + 1)
+                if lost_line is not None:
+                    lines.append(lost_line)
+                continue
+
+            rtt = max(0.01, self.__random.gauss(self.rtt, self.jitter))
+            rtts.append(rtt)
+            receive += 1
+            lines.append(self.__make_reply_line(seq, rtt, sent_time + rtt / 1000))
+
+            if self.os_type != OsType.WINDOWS and self.__random.random() < self.duplicate_rate:
+                rtt = rtt + abs(self.__random.gauss(0, self.jitter))
+                rtts.append(rtt)
+                duplicates += 1
+                lines.append(self.__make_reply_line(seq, rtt, sent_time + rtt / 1000) + " (DUP!)")
+
+        lines.extend(self.__make_stats(receive, duplicates, rtts))
+        lines.append("")
+
+        return GeneratedPing(
+            text="\n".join(lines),
+            packet_transmit=self.count,
+            packet_receive=receive,
+            duplicates=duplicates,
+            num_lines=len(lines),
+        )
+
+    def __make_header(self) -> str:
+        if self.os_type == OsType.LINUX:
+            return f"PING {self.destination} ({self.destination}) 56(84) bytes of data."
+        if self.os_type == OsType.WINDOWS:
+            return f"Pinging {self.destination} with 32 bytes of data:"
+
+        return f"PING {self.destination} ({self.destination}): 56 data bytes"
+
+    def __make_reply_line(self, seq: int, rtt: float, reply_time: float) -> str:
+        if self.os_type == OsType.LINUX:
+            line = "64 bytes from {}: icmp_seq={} ttl={} time={:.3f} ms".format(
+                self.destination, seq, self.ttl, rtt
+            )
+            if self.timestamp:
+                line = f"[{reply_time:.6f}] {line}"
+
+            return line
+        if self.os_type == OsType.MACOS:
+            return "64 bytes from {}: icmp_seq={} ttl={} time={:.3f} ms".format(
+                self.destination, seq, self.ttl, rtt
+            )
+        if self.os_type == OsType.ALPINE:
+            return "64 bytes from {}: seq={} ttl={} time={:.3f} ms".format(
+                self.destination, seq, self.ttl, rtt
+            )
+
+        if rtt < 1:
+            time_text = "time<1ms"
+        else:
+            time_text = f"time={int(rtt)}ms"
+
+        return f"Reply from {self.destination}: bytes=32 {time_text} TTL={self.ttl}"
+
+    def __make_lost_line(self, seq: int, timeout_time: float) -> Optional[str]:
+        if self.os_type == OsType.LINUX:
+            if self.timestamp:
+                return f"[{timeout_time:.6f}] no answer yet for icmp_seq={seq}"
+
+            return None
+        if self.os_type == OsType.MACOS:
+            return f"Request timeout for icmp_seq {seq}"
+        if self.os_type == OsType.WINDOWS:
+            return "Request timed out."
+
+        return None
+
+    def __make_stats(self, receive: int, duplicates: int, rtts: List[float]) -> List[str]:
+        loss_percent = (self.count - receive) / self.count * 100 if self.count else 0
+
+        if self.os_type == OsType.WINDOWS:
+            lines = [
+                "",
+                f"Ping statistics for {self.destination}:",
+                "    Packets: Sent = {}, Received = {}, Lost = {} ({:.0f}% loss),".format(
+                    self.count, receive, self.count - receive, loss_percent
+                ),
+            ]
+            if rtts:
+                int_rtts = [int(rtt) for rtt in rtts]
+                lines.extend(
+                    [
+                        "Approximate round trip times in milli-seconds:",
+                        "    Minimum = {}ms, Maximum = {}ms, Average = {}ms".format(
+                            min(int_rtts), max(int_rtts), round(sum(int_rtts) / len(int_rtts))
+                        ),
+                    ]
+                )
+
+            return lines
+
+        lines = ["", f"--- {self.destination} ping statistics ---"]
+
+        if self.os_type == OsType.LINUX:
+            packet_line = f"{self.count} packets transmitted, {receive} received, "
+            if duplicates:
+                packet_line += f"+{duplicates} duplicates, "
+            packet_line += "{:g}% packet loss, time {}ms".format(
+                loss_percent, max(self.count - 1, 0) * 1000
+            )
+        else:
+            packet_line = f"{self.count} packets transmitted, {receive} packets received, "
+            if duplicates:
+                prefix = "+" if self.os_type == OsType.MACOS else ""
+                packet_line += f"{prefix}{duplicates} duplicates, "
+            packet_line += f"{loss_percent:.1f}% packet loss"
+        lines.append(packet_line)
+
+        if not rtts:
+            return lines
+
+        rtt_min = min(rtts)
+        rtt_max = max(rtts)
+        rtt_avg = sum(rtts) / len(rtts)
+        rtt_mdev = math.sqrt(sum((rtt - rtt_avg) ** 2 for rtt in rtts) / len(rtts))
+
+        if self.os_type == OsType.LINUX:
+            lines.append(
+                "rtt min/avg/max/mdev = {:.3f}/{:.3f}/{:.3f}/{:.3f} ms".format(
+                    rtt_min, rtt_avg, rtt_max, rtt_mdev
+                )
+            )
+        elif self.os_type == OsType.MACOS:
+            lines.append(
+                "round-trip min/avg/max/stddev = {:.3f}/{:.3f}/{:.3f}/{:.3f} ms".format(
+                    rtt_min, rtt_avg, rtt_max, rtt_mdev
+                )
+            )
+        else:
+            lines.append(
+                "round-trip min/avg/max = {:.3f}/{:.3f}/{:.3f} ms".format(rtt_min, rtt_avg, rtt_max)
+            )
+
+        return lines
+
+
+def generate_ping_output(os_type: str = OsType.LINUX, **kwargs) -> GeneratedPing:
+    return PingOutputGenerator(os_type=os_type, **kwargs).generate()
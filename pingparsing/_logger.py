@@ -2,15 +2,15 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
-import subprocrunner
-
-
 MODULE_NAME = "pingparsing"
 
 
 class NullLogger:
     level_name = None
 
+    def opt(self, *args, **kwargs):  # pragma: no cover
+        return self
+
     def remove(self, handler_id=None):  # pragma: no cover
         pass
 
@@ -51,6 +51,11 @@ class NullLogger:
         pass
 
 
+# messages should be passed as a format string with arguments, e.g.
+# logger.debug("parsing ping result: {}", ping_text), instead of a pre-formatted f-string.
+# loguru formats the message only when a handler actually emits the record, so that
+# debug logging costs almost nothing while logging is disabled.
+# use logger.opt(lazy=True) with callables for arguments that are expensive to compute.
 try:
     from loguru import logger
 
@@ -68,6 +73,9 @@ def set_logger(is_enable: bool, propagation_depth: int = 1) -> None:
     if propagation_depth <= 0:
         return
 
+    # import here to avoid loading subprocrunner for parsing only usages
+    import subprocrunner
+
     subprocrunner.set_logger(is_enable, propagation_depth - 1)
 
 
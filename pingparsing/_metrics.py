@@ -0,0 +1,145 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Union
+
+
+class ParseStage:
+    #: searching for the statistics headline of each parser to detect the format
+    FORMAT_DETECTION = "format_detection"
+
+    #: extracting ICMP replies from each line
+    ICMP_REPLY = "icmp_reply"
+
+    #: locating and validating the statistics lines after the headline
+    STATS_HEADLINE = "stats_headline"
+
+    #: parsing the packet/rtt statistics lines
+    STATS_BODY = "stats_body"
+
+    #: converting timestamps of ICMP replies
+    TIMESTAMP = "timestamp"
+
+    LIST = (FORMAT_DETECTION, ICMP_REPLY, STATS_HEADLINE, STATS_BODY, TIMESTAMP)
+
+
+class ParseCounter:
+    PARSE = "parse"
+    LINES_SCANNED = "lines_scanned"
+    PARSER_ATTEMPTS = "parser_attempts"
+    NULL_PARSER_FALLBACKS = "null_parser_fallbacks"
+    ICMP_REPLIES = "icmp_replies"
+
+    LIST = (PARSE, LINES_SCANNED, PARSER_ATTEMPTS, NULL_PARSER_FALLBACKS, ICMP_REPLIES)
+
+
+class ParseMetrics:
+    """
+    Collector of per-stage durations and counters of
+    :py:meth:`PingParsing.parse <pingparsing.PingParsing.parse>` executions.
+    Pass an instance to :py:class:`~pingparsing.PingParsing` to enable the instrumentation.
+    Parsing is not instrumented at all when no instance is given.
+
+    Args:
+        callback (Optional[Callable[[str, float], None]]):
+            A function called with a stage name (:py:class:`ParseStage`) and
+            the duration [sec] each time a stage is measured.
+            Useful to export the durations to an external metrics system.
+            The function may be called from multiple threads concurrently
+            when the parser is shared by the threads.
+
+    Examples:
+        >>> import pingparsing
+        >>> metrics = pingparsing.ParseMetrics()
+        >>> parser = pingparsing.PingParsing(metrics=metrics)
+        >>> stats = parser.parse(ping_result)
+        >>> metrics.as_dict()
+        {
+            "durations": {
+                "format_detection": 0.0,
+                "icmp_reply": 0.00012,
+                "stats_headline": 0.00002,
+                "stats_body": 0.00087,
+                "timestamp": 0.0
+            },
+            "counters": {
+                "parse": 1,
+                "lines_scanned": 18,
+                "parser_attempts": 1,
+                "null_parser_fallbacks": 0,
+                "icmp_replies": 5
+            }
+        }
+    """
+
+    @property
+    def durations(self) -> Dict[str, float]:
+        """
+        Accumulated durations [sec] for each stage.
+        """
+
+        with self.__lock:
+            return dict(self.__durations)
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Accumulated counters.
+        """
+
+        with self.__lock:
+            return dict(self.__counters)
+
+    def __init__(self, callback: Optional[Callable[[str, float], None]] = None) -> None:
+        self.__callback = callback
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset all of the durations and counters to zero.
+        """
+
+        with self.__lock:
+            self.__durations: Dict[str, float] = {stage: 0.0 for stage in ParseStage.LIST}
+            self.__counters: Dict[str, int] = {counter: 0 for counter in ParseCounter.LIST}
+
+    def add_duration(self, stage: str, duration: float) -> None:
+        with self.__lock:
+            self.__durations[stage] = self.__durations.get(stage, 0.0) + duration
+
+        if self.__callback is not None:
+            self.__callback(stage, duration)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self.__lock:
+            self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+    def merge(self, other: "ParseMetrics") -> None:
+        """
+        Add durations and counters of another instance.
+        """
+
+        other_dict = other.as_dict()
+        for stage, duration in other_dict["durations"].items():
+            if duration:
+                self.add_duration(stage, duration)
+        for counter, value in other_dict["counters"].items():
+            if value:
+                self.increment(counter, int(value))
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_duration(stage, time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        with self.__lock:
+            return {"durations": dict(self.__durations), "counters": dict(self.__counters)}
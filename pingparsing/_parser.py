@@ -4,21 +4,41 @@
 
 import abc
 import re
+import time
+from contextlib import nullcontext
 from datetime import datetime, tzinfo
-from typing import Dict, List, Optional, Pattern, Sequence, Tuple, Union  # noqa
+from typing import Any, ContextManager, Dict, List, Optional, Pattern, Sequence, Tuple, Union  # noqa
 
 import pyparsing as pp
 import typepy
 from typepy import DateTime
 
+from ._capture import SamplingMethod
 from ._common import _to_unicode
 from ._interface import PingParserInterface
 from ._logger import logger
+from ._metrics import ParseCounter, ParseMetrics, ParseStage
+from ._sampling import IcmpReplySampler, RttSketch
+from ._sequence import SequenceAnalyzer, SequenceStats
 from ._stats import PingStats
 from ._typing import IcmpReplies
 from .error import ParseError, ParseErrorReason
 
 
+_NULL_CONTEXT = nullcontext()
+
+# lines longer than this are neither ICMP replies nor statistics headlines:
+# bounds the matching time of a line regardless of the input
+MAX_LINE_LENGTH = 1024
+
+_PIPE_REGEXP = re.compile(r"\s*pipe \d+")
+
+# compiled regexps shared by all of the instances of a parser class:
+# patterns are constant for each class, and compiled patterns are immutable.
+# a race of the first compilations only compiles a pattern more than once.
+_REGEXP_CACHE: Dict[Tuple[type, str], Pattern] = {}
+
+
 class IcmpReplyKey:
     DESTINATION = "destination"
     BYTES = "bytes"
@@ -31,17 +51,49 @@ class IcmpReplyKey:
 
 
 class PingParser(PingParserInterface):
-    _BYTES_PATTERN = rf"\s*(?P<{IcmpReplyKey.BYTES}>[0-9]+) bytes"
-    _DEST_PATTERN = r"(?P<{key}>[a-zA-Z0-9:\-\.\(\)% ]+)".format(
-        key=IcmpReplyKey.DESTINATION
+    # patterns are matched in linear time of a line length with re.search:
+    # - a quantified part does not overlap with the preceding part, and
+    #   a search only starts at the beginning of a run of digits
+    # - a destination is a host/address (may contain spaces) of bounded length,
+    #   optionally followed by an address in parentheses (e.g. "host (192.168.0.1)").
+    #   the lazy quantifiers stop at the literal that follows the destination in each pattern,
+    #   and parentheses are excluded, so the address part can only start at one position
+    _BYTES_PATTERN = rf"(?<![0-9])(?P<{IcmpReplyKey.BYTES}>[0-9]+) bytes"
+    _DEST_PATTERN = r"(?P<{key}>{host}(?: \({host}\))?)".format(
+        key=IcmpReplyKey.DESTINATION, host=r"[^()\r\n]{1,255}?"
     )  # host or ipv4/ipv6 addr
     _IPADDR_PATTERN = r"(\d{1,3}\.){3}\d{1,3}"
     _ICMP_SEQ_PATTERN = rf"\s*icmp_seq=(?P<{IcmpReplyKey.SEQUENCE_NO}>\d+)"
     _TTL_PATTERN = rf"\s*ttl=(?P<{IcmpReplyKey.TTL}>\d+)"
     _TIME_PATTERN = rf"\s*time[=<](?P<{IcmpReplyKey.TIME}>[0-9\.]+)"
 
-    def __init__(self, timezone: Optional[tzinfo] = None) -> None:
+    def __init__(
+        self,
+        timezone: Optional[tzinfo] = None,
+        metrics: Optional[ParseMetrics] = None,
+        max_replies: Optional[int] = None,
+        sampling: str = SamplingMethod.RESERVOIR,
+    ) -> None:
+        if max_replies is not None and max_replies < 0:
+            raise ValueError("max_replies must be greater than or equal to zero")
+        if sampling not in SamplingMethod.LIST:
+            raise ValueError(f"unknown sampling method: {sampling}")
+
         self.__timezone = timezone
+        self._metrics = metrics
+        self._max_replies = max_replies
+        self._sampling = sampling
+        self._rtt_sketch: Optional[RttSketch] = None
+        self._sequence_stats: Optional[SequenceStats] = None
+        self.__icmp_reply_regexps: Optional[Tuple[Pattern, Pattern, Pattern]] = None
+
+    def _get_regexp(self, pattern_name: str, flags: int = 0) -> Pattern:
+        key = (type(self), pattern_name)
+        regexp = _REGEXP_CACHE.get(key)
+        if regexp is None:
+            regexp = _REGEXP_CACHE.setdefault(key, re.compile(getattr(self, pattern_name), flags))
+
+        return regexp
 
     @property
     @abc.abstractmethod
@@ -59,7 +111,7 @@ class PingParser(PingParserInterface):
 
     @property
     def _duplicate_packet_pattern(self) -> str:
-        return r".+ \(DUP!\)$"
+        return r"(?<=.) \(DUP!\)$"
 
     @property
     @abc.abstractmethod
@@ -71,86 +123,203 @@ class PingParser(PingParserInterface):
     def _is_support_packet_duplicate(self) -> bool:  # pragma: no cover
         pass
 
+    def parse(
+        self, ping_message: Sequence[str], stats_headline_idx: Optional[int] = None
+    ) -> PingStats:
+        icmp_replies = self._parse_icmp_reply(ping_message)
+        stats_headline, packet_info_line, body_line_list = self._preprocess_parse_stats(
+            lines=ping_message, stats_headline_idx=stats_headline_idx
+        )
+
+        with self._measure(ParseStage.STATS_BODY):
+            return self._parse_stats_body(
+                stats_headline, packet_info_line, body_line_list, icmp_replies
+            )
+
+    @abc.abstractmethod
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:  # pragma: no cover
+        pass
+
+    def _measure(self, stage: str) -> ContextManager:
+        if self._metrics is None:
+            return _NULL_CONTEXT
+
+        return self._metrics.measure(stage)
+
     def _parse_icmp_reply(self, ping_lines: Sequence[str]) -> IcmpReplies:
-        icmp_reply_regexp = re.compile(self._icmp_reply_pattern, re.IGNORECASE)
-        icmp_no_ans_regexp = re.compile(self._icmp_no_ans_pattern, re.IGNORECASE)
-        duplicate_packet_regexp = re.compile(self._duplicate_packet_pattern)
-        icmp_reply_list = []
+        if self._metrics is not None:
+            self._metrics.increment(ParseCounter.LINES_SCANNED, len(ping_lines))
+
+        with self._measure(ParseStage.ICMP_REPLY):
+            return self.__parse_icmp_reply(ping_lines)
+
+    def __parse_icmp_reply(self, ping_lines: Sequence[str]) -> IcmpReplies:
+        # sequence numbers are analyzed in the same pass as parsing replies
+        sequence_analyzer = SequenceAnalyzer()
+
+        if self._max_replies is not None:
+            icmp_replies = self.__sample_icmp_reply(
+                ping_lines, self._max_replies, sequence_analyzer
+            )
+        else:
+            icmp_replies = []
+            for line in ping_lines:
+                reply = self._parse_icmp_reply_line(line)
+                if reply is not None:
+                    icmp_replies.append(reply)
+                    sequence_analyzer.add(reply)
+
+        self._sequence_stats = None
+        if sequence_analyzer.num_sequences:
+            self._sequence_stats = sequence_analyzer.get_stats()
+
+        return icmp_replies
+
+    def __sample_icmp_reply(
+        self, ping_lines: Sequence[str], max_replies: int, sequence_analyzer: SequenceAnalyzer
+    ) -> IcmpReplies:
+        sampler = IcmpReplySampler(max_replies, sampling=self._sampling)
 
         for line in ping_lines:
-            match = icmp_reply_regexp.search(line)
-            if not match:
-                match = icmp_no_ans_regexp.search(line)
-            if not match:
-                continue
+            reply = self._parse_icmp_reply_line(line)
+            if reply is not None:
+                sampler.add(reply)
+                sequence_analyzer.add(reply)
+
+        self._rtt_sketch = sampler.rtt_sketch
 
-            results = match.groupdict()
-            reply: Dict[str, Union[str, bool, float, int, datetime]] = {}
+        return sampler.get_replies()
 
-            if IcmpReplyKey.DESTINATION in results:
-                reply[IcmpReplyKey.DESTINATION] = results[IcmpReplyKey.DESTINATION]
+    def _parse_icmp_reply_line(
+        self, line: str
+    ) -> Optional[Dict[str, Union[str, bool, float, int, datetime]]]:
+        """
+        Parse a line of ``ping`` outputs as an ICMP reply.
 
-            if IcmpReplyKey.BYTES in results:
-                reply[IcmpReplyKey.BYTES] = int(results[IcmpReplyKey.BYTES])
+        Returns:
+            ICMP reply. |None| if the line is not an ICMP reply
+            or longer than :py:data:`MAX_LINE_LENGTH`.
+        """
 
-            if results.get(IcmpReplyKey.TIMESTAMP):
-                reply[IcmpReplyKey.TIMESTAMP] = self.__timestamp_to_datetime(
-                    results[IcmpReplyKey.TIMESTAMP]
-                )
-            elif results.get(IcmpReplyKey.TIMESTAMP_NO_ANS):
-                reply[IcmpReplyKey.TIMESTAMP] = self.__timestamp_to_datetime(
-                    results[IcmpReplyKey.TIMESTAMP_NO_ANS]
-                )
+        if len(line) > MAX_LINE_LENGTH:
+            return None
 
-            if IcmpReplyKey.SEQUENCE_NO in results:
-                reply[IcmpReplyKey.SEQUENCE_NO] = int(results[IcmpReplyKey.SEQUENCE_NO])
+        if self.__icmp_reply_regexps is None:
+            self.__icmp_reply_regexps = (
+                self._get_regexp("_icmp_reply_pattern", re.IGNORECASE),
+                self._get_regexp("_icmp_no_ans_pattern", re.IGNORECASE),
+                self._get_regexp("_duplicate_packet_pattern"),
+            )
+        icmp_reply_regexp, icmp_no_ans_regexp, duplicate_packet_regexp = self.__icmp_reply_regexps
 
-            if IcmpReplyKey.TTL in results:
-                reply[IcmpReplyKey.TTL] = int(results[IcmpReplyKey.TTL])
+        match = icmp_reply_regexp.search(line)
+        if not match:
+            match = icmp_no_ans_regexp.search(line)
+        if not match:
+            return None
 
-            if IcmpReplyKey.TIME in results:
-                reply[IcmpReplyKey.TIME] = float(results[IcmpReplyKey.TIME])
+        results = match.groupdict()
+        reply: Dict[str, Union[str, bool, float, int, datetime]] = {}
 
-            if duplicate_packet_regexp.search(line):
-                reply[IcmpReplyKey.DUPLICATE] = True
-            else:
-                reply[IcmpReplyKey.DUPLICATE] = False
+        if IcmpReplyKey.DESTINATION in results:
+            reply[IcmpReplyKey.DESTINATION] = results[IcmpReplyKey.DESTINATION]
 
-            icmp_reply_list.append(reply)
+        if IcmpReplyKey.BYTES in results:
+            reply[IcmpReplyKey.BYTES] = int(results[IcmpReplyKey.BYTES])
 
-        return icmp_reply_list
+        if results.get(IcmpReplyKey.TIMESTAMP):
+            reply[IcmpReplyKey.TIMESTAMP] = self.__timestamp_to_datetime(
+                results[IcmpReplyKey.TIMESTAMP]
+            )
+        elif results.get(IcmpReplyKey.TIMESTAMP_NO_ANS):
+            reply[IcmpReplyKey.TIMESTAMP] = self.__timestamp_to_datetime(
+                results[IcmpReplyKey.TIMESTAMP_NO_ANS]
+            )
 
-    def _preprocess_parse_stats(self, lines: Sequence[str]) -> Tuple[str, str, Sequence[str]]:
-        logger.debug(f"parsing as {self._parser_name:s} ping result format")
+        if IcmpReplyKey.SEQUENCE_NO in results:
+            reply[IcmpReplyKey.SEQUENCE_NO] = int(results[IcmpReplyKey.SEQUENCE_NO])
 
-        stats_headline_idx = self.__find_stats_headline_idx(
-            lines, re.compile(self._stats_headline_pattern)
-        )
-        body_line_list = lines[stats_headline_idx + 1 :]
-        self.__validate_stats_body(body_line_list)
+        if IcmpReplyKey.TTL in results:
+            reply[IcmpReplyKey.TTL] = int(results[IcmpReplyKey.TTL])
+
+        if IcmpReplyKey.TIME in results:
+            reply[IcmpReplyKey.TIME] = float(results[IcmpReplyKey.TIME])
+
+        if duplicate_packet_regexp.search(line):
+            reply[IcmpReplyKey.DUPLICATE] = True
+        else:
+            reply[IcmpReplyKey.DUPLICATE] = False
+
+        return reply
+
+    def _preprocess_parse_stats(
+        self, lines: Sequence[str], stats_headline_idx: Optional[int] = None
+    ) -> Tuple[str, str, Sequence[str]]:
+        logger.debug("parsing as {:s} ping result format", self._parser_name)
+
+        with self._measure(ParseStage.STATS_HEADLINE):
+            if stats_headline_idx is None:
+                stats_headline_idx = self._find_stats_headline(lines)
+                if stats_headline_idx is None:
+                    raise ParseError(reason=ParseErrorReason.HEADER_NOT_FOUND)
+
+            body_line_list = lines[stats_headline_idx + 1 :]
+            self.__validate_stats_body(body_line_list)
 
         packet_info_line = body_line_list[0]
 
         return (lines[stats_headline_idx], packet_info_line, body_line_list)
 
+    def _make_stats(self, **kwargs: Any) -> PingStats:
+        # the results of the parser that are common to all of the formats
+        return PingStats(
+            rtt_sketch=self._rtt_sketch,
+            sequence_stats=self._sequence_stats,
+            parser_name=self._parser_name,
+            **kwargs,
+        )
+
     def _parse_destination(self, stats_headline: str) -> str:
-        match = re.search(self._stats_headline_pattern, stats_headline)
+        match = self._get_regexp("_stats_headline_pattern").search(stats_headline)
         if not match:
             return "unknown"
 
         return match.groupdict()[IcmpReplyKey.DESTINATION].strip(":")
 
-    def __find_stats_headline_idx(self, lines: Sequence[str], re_stats_header: Pattern) -> int:
+    def _find_stats_headline(self, lines: Sequence[str]) -> Optional[int]:
+        """
+        Find the statistics headline of the format of the parser.
+
+        Returns:
+            Index of the statistics headline. |None| if not found.
+        """
+
+        re_stats_header = self._get_regexp("_stats_headline_pattern")
         for i, line in enumerate(lines):
-            if re_stats_header.search(line):
-                break
-        else:
-            raise ParseError(reason=ParseErrorReason.HEADER_NOT_FOUND)
+            if len(line) <= MAX_LINE_LENGTH and re_stats_header.search(line):
+                return i
 
-        return i
+        return None
 
     def __timestamp_to_datetime(self, timestamp: str) -> datetime:
-        return DateTime(timestamp.lstrip("[").rstrip("]"), timezone=self.__timezone).force_convert()
+        if self._metrics is None:
+            return DateTime(
+                timestamp.lstrip("[").rstrip("]"), timezone=self.__timezone
+            ).force_convert()
+
+        start_time = time.perf_counter()
+        try:
+            return DateTime(
+                timestamp.lstrip("[").rstrip("]"), timezone=self.__timezone
+            ).force_convert()
+        finally:
+            self._metrics.add_duration(ParseStage.TIMESTAMP, time.perf_counter() - start_time)
 
     def __validate_stats_body(self, body_line_list: Sequence[str]) -> None:
         if typepy.is_empty_sequence(body_line_list):
@@ -191,11 +360,22 @@ class NullPingParser(PingParser):
     def _is_support_packet_duplicate(self) -> bool:  # pragma: no cover
         return False
 
-    def parse(self, ping_message: Sequence[str]) -> PingStats:  # pragma: no cover
+    def parse(
+        self, ping_message: Sequence[str], stats_headline_idx: Optional[int] = None
+    ) -> PingStats:  # pragma: no cover
+        return PingStats()
+
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:  # pragma: no cover
         return PingStats()
 
     def _preprocess_parse_stats(
-        self, lines: Sequence[str]
+        self, lines: Sequence[str], stats_headline_idx: Optional[int] = None
     ) -> Tuple[str, str, List[str]]:  # pragma: no cover
         return ("", "", [])
 
@@ -215,8 +395,7 @@ class LinuxPingParser(PingParser):
     @property
     def _icmp_reply_pattern(self) -> str:
         return (
-            self._TIMESTAMP_PATTERN
-            + "?"
+            rf"(?:{self._TIMESTAMP_PATTERN}\s*)?"
             + self._BYTES_PATTERN
             + r"\s+from "
             + self._DEST_PATTERN
@@ -234,11 +413,13 @@ class LinuxPingParser(PingParser):
     def _is_support_packet_duplicate(self) -> bool:
         return True
 
-    def parse(self, ping_message: Sequence[str]) -> PingStats:
-        icmp_replies = self._parse_icmp_reply(ping_message)
-        stats_headline, packet_info_line, body_line_list = self._preprocess_parse_stats(
-            lines=ping_message
-        )
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:
         packet_pattern = (
             pp.Word(pp.nums)
             + pp.Literal("packets transmitted,")
@@ -260,7 +441,7 @@ class LinuxPingParser(PingParser):
             is_valid_data = False
 
         if not is_valid_data or typepy.is_null_string(rtt_line):
-            return PingStats(
+            return self._make_stats(
                 destination=destination,
                 packet_transmit=packet_transmit,
                 packet_receive=packet_receive,
@@ -282,10 +463,10 @@ class LinuxPingParser(PingParser):
         try:
             parse_list = rtt_pattern.parseString(_to_unicode(rtt_line))
         except pp.ParseException:
-            if not re.search(r"\s*pipe \d+", rtt_line):
+            if not _PIPE_REGEXP.search(rtt_line):
                 raise ValueError
 
-            return PingStats(
+            return self._make_stats(
                 destination=destination,
                 packet_transmit=packet_transmit,
                 packet_receive=packet_receive,
@@ -293,7 +474,7 @@ class LinuxPingParser(PingParser):
                 icmp_replies=icmp_replies,
             )
 
-        return PingStats(
+        return self._make_stats(
             destination=destination,
             packet_transmit=packet_transmit,
             packet_receive=packet_receive,
@@ -324,17 +505,19 @@ class WindowsPingParser(PingParser):
 
     @property
     def _stats_headline_pattern(self) -> str:
-        return rf"^Ping statistics for {self._DEST_PATTERN}"
+        return rf"^Ping statistics for {self._DEST_PATTERN}:\s*$"
 
     @property
     def _is_support_packet_duplicate(self) -> bool:
         return False
 
-    def parse(self, ping_message: Sequence[str]) -> PingStats:
-        icmp_replies = self._parse_icmp_reply(ping_message)
-        stats_headline, packet_info_line, body_line_list = self._preprocess_parse_stats(
-            lines=ping_message
-        )
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:
         packet_pattern = (
             pp.Literal("Packets: Sent = ")
             + pp.Word(pp.nums)
@@ -356,7 +539,7 @@ class WindowsPingParser(PingParser):
             is_valid_data = False
 
         if not is_valid_data or typepy.is_null_string(rtt_line):
-            return PingStats(
+            return self._make_stats(
                 destination=destination,
                 packet_transmit=packet_transmit,
                 packet_receive=packet_receive,
@@ -374,7 +557,7 @@ class WindowsPingParser(PingParser):
         )
         parse_list = rtt_pattern.parseString(_to_unicode(rtt_line))
 
-        return PingStats(
+        return self._make_stats(
             destination=destination,
             packet_transmit=packet_transmit,
             packet_receive=packet_receive,
@@ -397,25 +580,27 @@ class MacOsPingParser(PingParser):
             self._BYTES_PATTERN
             + r"\s+from "
             + self._DEST_PATTERN
-            + ":"
+            + "[:,]"  # ping6: "from ::1, icmp_seq=0 hlim=64"
             + self._ICMP_SEQ_PATTERN
-            + self._TTL_PATTERN
+            + rf"\s*(?:ttl|hlim)=(?P<{IcmpReplyKey.TTL}>\d+)"
             + self._TIME_PATTERN
         )
 
     @property
     def _stats_headline_pattern(self) -> str:
-        return rf"--- {self._DEST_PATTERN} ping statistics ---"
+        return rf"--- {self._DEST_PATTERN} ping6? statistics ---"
 
     @property
     def _is_support_packet_duplicate(self) -> bool:
         return True
 
-    def parse(self, ping_message: Sequence[str]) -> PingStats:
-        icmp_replies = self._parse_icmp_reply(ping_message)
-        stats_headline, packet_info_line, body_line_list = self._preprocess_parse_stats(
-            lines=ping_message
-        )
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:
         packet_pattern = (
             pp.Word(pp.nums)
             + pp.Literal("packets transmitted,")
@@ -437,7 +622,7 @@ class MacOsPingParser(PingParser):
             is_valid_data = False
 
         if not is_valid_data or typepy.is_null_string(rtt_line):
-            return PingStats(
+            return self._make_stats(
                 destination=destination,
                 packet_transmit=packet_transmit,
                 packet_receive=packet_receive,
@@ -446,7 +631,7 @@ class MacOsPingParser(PingParser):
             )
 
         rtt_pattern = (
-            pp.Literal("round-trip min/avg/max/stddev =")
+            pp.Regex(r"round-trip min/avg/max/std-?dev =")
             + pp.Word(pp.nums + ".")
             + "/"
             + pp.Word(pp.nums + ".")
@@ -458,7 +643,7 @@ class MacOsPingParser(PingParser):
         )
         parse_list = rtt_pattern.parseString(_to_unicode(rtt_line))
 
-        return PingStats(
+        return self._make_stats(
             destination=destination,
             packet_transmit=packet_transmit,
             packet_receive=packet_receive,
@@ -492,11 +677,13 @@ class AlpineLinuxPingParser(LinuxPingParser):
     def _is_support_packet_duplicate(self) -> bool:
         return True
 
-    def parse(self, ping_message: Sequence[str]) -> PingStats:
-        icmp_replies = self._parse_icmp_reply(ping_message)
-        stats_headline, packet_info_line, body_line_list = self._preprocess_parse_stats(
-            lines=ping_message
-        )
+    def _parse_stats_body(
+        self,
+        stats_headline: str,
+        packet_info_line: str,
+        body_line_list: Sequence[str],
+        icmp_replies: IcmpReplies,
+    ) -> PingStats:
         packet_pattern = (
             pp.Word(pp.nums)
             + pp.Literal("packets transmitted,")
@@ -518,7 +705,7 @@ class AlpineLinuxPingParser(LinuxPingParser):
             is_valid_data = False
 
         if not is_valid_data or typepy.is_null_string(rtt_line):
-            return PingStats(
+            return self._make_stats(
                 destination=destination,
                 packet_transmit=packet_transmit,
                 packet_receive=packet_receive,
@@ -537,7 +724,7 @@ class AlpineLinuxPingParser(LinuxPingParser):
         )
         parse_list = rtt_pattern.parseString(_to_unicode(rtt_line))
 
-        return PingStats(
+        return self._make_stats(
             destination=destination,
             packet_transmit=packet_transmit,
             packet_receive=packet_receive,
@@ -2,14 +2,19 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import re
+import threading
 from datetime import tzinfo
-from typing import Optional, Union
+from typing import IO, Iterable, Iterator, List, Optional, Union
 
 import pyparsing as pp
 import typepy
 
+from ._cache import ParseCache
+from ._capture import SamplingMethod
 from ._common import _to_unicode
 from ._logger import logger
+from ._metrics import ParseCounter, ParseMetrics, ParseStage
 from ._parser import PingParser  # noqa
 from ._parser import (
     AlpineLinuxPingParser,
@@ -18,11 +23,20 @@ from ._parser import (
     NullPingParser,
     WindowsPingParser,
 )
-from ._pingtransmitter import PingResult
+from ._pingresult import PingResult
 from ._stats import PingStats
 from .error import ParseError, ParseErrorReason
 
 
+# the first line of ping outputs: "PING <dest> ..." (Linux/macOS/Alpine Linux) or
+# "Pinging <dest> ..." (Windows)
+# "PING6(" is the first line of macOS ping6 outputs
+_SESSION_HEADER_REGEXP = re.compile(r"^\s*(PING6?[ (]|Pinging )\S")
+
+_PARSER_CLASSES = (LinuxPingParser, WindowsPingParser, MacOsPingParser, AlpineLinuxPingParser)
+_NULL_PARSER_NAME = NullPingParser()._parser_name
+
+
 class PingParsing:
     """
     Parser class to parsing ping command output.
@@ -30,28 +44,91 @@ class PingParsing:
     Args:
         timezone (Optional[tzinfo]):
             Time zone for parsing timestamps.
+        metrics (Optional[ParseMetrics]):
+            Collector of per-stage durations and counters of parsing.
+            Parsing is not instrumented if |None|.
+        cache (Optional[ParseCache]):
+            Cache of parse results. Inputs that have been parsed with the same options
+            are not parsed again. Results are not cached if |None|.
+            A cached result is the same :py:class:`~pingparsing.PingStats` instance
+            (including its list of ICMP replies) for every caller and thread:
+            treat results as read-only, or copy them (e.g. ``copy.deepcopy``) before modifying.
+
+    An instance only holds the options, and parsing states are local to each call:
+    a single instance can be shared by multiple threads.
+    The detected format of each input is available via
+    :py:attr:`PingStats.parser_name <pingparsing.PingStats.parser_name>`.
     """
 
-    def __init__(self, timezone: Optional[tzinfo] = None) -> None:
-        self.__parser: PingParser = NullPingParser()
+    def __init__(
+        self,
+        timezone: Optional[tzinfo] = None,
+        metrics: Optional[ParseMetrics] = None,
+        cache: Optional[ParseCache] = None,
+    ) -> None:
         self.__timezone = timezone
+        self.__metrics = metrics
+        self.__cache = cache
+        self.__local = threading.local()
+
+    @property
+    def metrics(self) -> Optional[ParseMetrics]:
+        return self.__metrics
+
+    @property
+    def cache(self) -> Optional[ParseCache]:
+        return self.__cache
 
     @property
     def parser_name(self) -> str:
-        return self.__parser._parser_name
+        """
+        Name of the parser of the last :py:meth:`parse` call in the current thread.
+        Prefer :py:attr:`PingStats.parser_name <pingparsing.PingStats.parser_name>`.
+        """
+
+        return getattr(self.__local, "parser_name", _NULL_PARSER_NAME)
 
-    def parse(self, ping_message: Union[str, PingResult]) -> PingStats:
+    def parse(
+        self,
+        ping_message: Union[str, PingResult],
+        max_replies: Optional[int] = None,
+        sampling: str = SamplingMethod.RESERVOIR,
+    ) -> PingStats:
         """
         Parse ping command output.
+        Lines longer than 1024 characters are ignored: they are neither ICMP replies
+        nor statistics lines of ``ping`` outputs.
 
         Args:
             ping_message (str or :py:class:`~pingparsing.PingResult`):
                 ``ping`` command output.
+            max_replies (Optional[int]):
+                Maximum number of ICMP replies to keep in
+                :py:attr:`~pingparsing.PingStats.icmp_replies`, to bound memory usage for
+                very long ``ping`` runs. Replies of lost/duplicated packets are always kept.
+                Quantiles of round trip times of all of the replies are available via
+                :py:attr:`~pingparsing.PingStats.rtt_sketch`.
+                All of the replies are kept if |None|.
+            sampling (str):
+                How to sample replies when ``max_replies`` is specified:
+                ``reservoir`` (uniform random sample) or ``tail`` (the last replies).
 
         Returns:
             :py:class:`~pingparsing.PingStats`: Parsed result.
+            Shared with other callers if the result is cached (see the ``cache`` argument).
         """
 
+        stats = self.__parse(ping_message, max_replies, sampling)
+        self.__local.parser_name = stats.parser_name or _NULL_PARSER_NAME
+
+        return stats
+
+    def __parse(
+        self,
+        ping_message: Union[str, PingResult],
+        max_replies: Optional[int],
+        sampling: str,
+    ) -> PingStats:
         if isinstance(ping_message, PingResult):
             # accept PingResult instance as an input
             if typepy.is_not_null_string(ping_message.stdout):
@@ -61,33 +138,148 @@ class PingParsing:
         else:
             ping_text = ping_message
 
-        logger.debug(f"parsing ping result: {ping_text}")
+        logger.debug("parsing ping result: {}", ping_text)
 
-        self.__parser = NullPingParser()
+        metrics = self.__metrics
+        if metrics is not None:
+            metrics.increment(ParseCounter.PARSE)
 
         if typepy.is_null_string(ping_text):
             logger.debug("ping_message is empty")
 
             return PingStats()
 
+        cache = self.__cache
+        if cache is None:
+            return self.__parse_text(ping_text, max_replies, sampling)
+
+        if isinstance(ping_text, bytes):
+            data = ping_text
+        else:
+            data = ping_text.encode("utf-8", errors="surrogatepass")
+        key = cache.make_key(data, self.__timezone, max_replies, sampling)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        stats = self.__parse_text(ping_text, max_replies, sampling)
+        cache.put(key, stats, size=len(data))
+
+        return stats
+
+    def parse_all(
+        self,
+        text_or_file: Union[str, bytes, PingResult, IO[str], Iterable[str]],
+        max_replies: Optional[int] = None,
+        sampling: str = SamplingMethod.RESERVOIR,
+    ) -> Iterator[PingStats]:
+        """
+        Parse outputs of multiple ``ping`` executions concatenated into a text
+        (e.g. a log file that ``ping`` outputs are appended to).
+
+        The input is split into sessions at the first lines of ``ping`` outputs
+        (``PING ...``/``PING6(...``/``Pinging ...``) in a single pass,
+        and each session is parsed lazily.
+        Sessions without statistics (e.g. interrupted ``ping`` executions) and
+        sessions failed to parse (e.g. truncated outputs) are skipped.
+
+        Args:
+            text_or_file:
+                ``ping`` outputs: a text, a :py:class:`~pingparsing.PingResult`,
+                or a file object/iterable of lines.
+            max_replies:
+                Same as :py:meth:`parse`.
+            sampling:
+                Same as :py:meth:`parse`.
+
+        Yields:
+            :py:class:`~pingparsing.PingStats`: Parsed result for each session.
+
+        Examples:
+            >>> import pingparsing
+            >>> parser = pingparsing.PingParsing()
+            >>> with open("ping.log") as f:
+            ...     for stats in parser.parse_all(f):
+            ...         print(stats.as_dict())
+        """
+
+        lines: Iterable[str]
+        if isinstance(text_or_file, PingResult):
+            lines = (text_or_file.stdout or "").splitlines(keepends=True)
+        elif isinstance(text_or_file, (str, bytes)):
+            lines = _to_unicode(text_or_file).splitlines(keepends=True)
+        else:
+            lines = text_or_file
+
+        session: List[str] = []
+        for line in lines:
+            if session and _SESSION_HEADER_REGEXP.search(line):
+                yield from self.__parse_session(session, max_replies, sampling)
+                session = []
+
+            session.append(line)
+
+        if session:
+            yield from self.__parse_session(session, max_replies, sampling)
+
+    def __parse_session(
+        self, session: List[str], max_replies: Optional[int], sampling: str
+    ) -> Iterator[PingStats]:
+        try:
+            stats = self.parse("".join(session), max_replies=max_replies, sampling=sampling)
+        except (ParseError, ValueError) as e:
+            # a damaged session (e.g. cut off after the statistics headline) should not
+            # prevent parsing the following sessions
+            logger.debug("skip a session failed to parse: {}: {}", session[0].rstrip(), e)
+            return
+
+        if stats.is_empty():
+            logger.debug("skip a session without statistics: {}", session[0].rstrip())
+            return
+
+        yield stats
+
+    def __parse_text(self, ping_text: str, max_replies: Optional[int], sampling: str) -> PingStats:
+        metrics = self.__metrics
         ping_lines = _to_unicode(ping_text).splitlines()
-        parser_class_list = (
-            LinuxPingParser,
-            WindowsPingParser,
-            MacOsPingParser,
-            AlpineLinuxPingParser,
-        )
-
-        for parser_class in parser_class_list:
-            self.__parser = parser_class(timezone=self.__timezone)  # type: ignore
+
+        for parser_class in _PARSER_CLASSES:
+            # stages of an attempt are recorded only if the attempt succeeded,
+            # so that durations of the stages do not overlap with FORMAT_DETECTION
+            attempt_metrics = None if metrics is None else ParseMetrics()
+            parser: PingParser = parser_class(  # type: ignore
+                timezone=self.__timezone,
+                metrics=attempt_metrics,
+                max_replies=max_replies,
+                sampling=sampling,
+            )
+
+            if metrics is None:
+                stats_headline_idx = parser._find_stats_headline(ping_lines)
+            else:
+                metrics.increment(ParseCounter.PARSER_ATTEMPTS)
+                with metrics.measure(ParseStage.FORMAT_DETECTION):
+                    stats_headline_idx = parser._find_stats_headline(ping_lines)
+
+            if stats_headline_idx is None:
+                continue
+
             try:
-                return self.__parser.parse(ping_lines)
+                stats = parser.parse(ping_lines, stats_headline_idx=stats_headline_idx)
             except ParseError as e:
                 if e.reason != ParseErrorReason.HEADER_NOT_FOUND:
                     raise e
             except pp.ParseException:
                 pass
+            else:
+                if metrics is not None:
+                    assert attempt_metrics is not None
+                    metrics.merge(attempt_metrics)
+                    metrics.increment(ParseCounter.ICMP_REPLIES, len(stats.icmp_replies))
+
+                return stats
 
-        self.__parser = NullPingParser()
+        if metrics is not None:
+            metrics.increment(ParseCounter.NULL_PARSER_FALLBACKS)
 
         return PingStats()
@@ -0,0 +1,26 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from collections import namedtuple
+
+
+class PingResult(namedtuple("PingResult", "stdout stderr returncode")):
+    """
+    Data class to store ``ping`` command execution result.
+
+    .. py:attribute:: stdout
+        :type: Optional[str]
+
+        Standard output of ``ping`` command execution result.
+
+    .. py:attribute:: stderr
+        :type: Optional[str]
+
+        Standard error of ``ping`` command execution result.
+
+    .. py:attribute:: returncode
+        :type: int
+
+        Return code of ``ping`` command execution result.
+    """
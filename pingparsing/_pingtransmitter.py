@@ -2,10 +2,11 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import errno
+import functools
 import ipaddress
 import platform
-from collections import namedtuple
-from typing import Optional, cast
+from typing import IO, TYPE_CHECKING, Hashable, Iterator, Optional, Tuple, Type, Union, cast
 
 import humanreadable as hr
 import subprocrunner
@@ -13,33 +14,63 @@ import typepy
 from subprocrunner.typing import Command
 from typepy import Integer, StrictLevel, String, TypeConversionError
 
-from ._cmd_maker import LinuxPingCmdMaker, MacosPingCmdMaker, WindowsPingCmdMaker
+from ._backend import PingBackend
+from ._cmd_maker import (
+    LinuxPingCmdMaker,
+    MacosPingCmdMaker,
+    PingCmdMaker,
+    WindowsPingCmdMaker,
+)
 from ._logger import logger
+from ._pingresult import PingResult
 from ._typing import PingAddOpts, TimeArg
 
 
+if TYPE_CHECKING:
+    import subprocess  # noqa
+
+    from ._capture import BoundedLineBuffer  # noqa
+    from ._stats import PingStats  # noqa
+
+
 DEFAULT_DEADLINE = 3
 
 
-class PingResult(namedtuple("PingResult", "stdout stderr returncode")):
-    """
-    Data class to store ``ping`` command execution result.
+@functools.lru_cache(maxsize=None)
+def _get_cmd_maker_class() -> Type[PingCmdMaker]:
+    # the platform never changes during the process lifetime
+    system = platform.system()
 
-    .. py:attribute:: stdout
-        :type: Optional[str]
+    if system == "Linux":
+        return LinuxPingCmdMaker
+    if system == "Darwin":
+        return MacosPingCmdMaker
+    if system == "Windows":
+        return WindowsPingCmdMaker
 
-        Standard output of ``ping`` command execution result.
+    raise RuntimeError(f"not supported platform: {system}")
 
-    .. py:attribute:: stderr
-        :type: Optional[str]
 
-        Standard error of ``ping`` command execution result.
+@functools.lru_cache(maxsize=4096)
+def _is_ipv6_address(destination: str) -> bool:
+    try:
+        network = ipaddress.ip_address(destination)
+    except ValueError as e:
+        logger.debug(e)
+        return False
 
-    .. py:attribute:: returncode
-        :type: int
+    logger.debug("IP address: version={}, address={}", network.version, destination)
 
-        Return code of ``ping`` command execution result.
-    """
+    return network.version == 6
+
+
+def _decode_output(data: bytes) -> str:
+    # same as the text mode pipes of subprocess.Popen(universal_newlines=True, errors="replace")
+    import locale
+
+    text = data.decode(locale.getpreferredencoding(False), errors="replace")
+
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
 
 class PingTransmitter:
@@ -91,6 +122,33 @@ class PingTransmitter:
 
         [Only for Windows environment] Automatically change the code page if ``True``.
         Defaults to ``True``.
+
+    .. py:attribute:: backend
+        :type: Optional[PingBackend]
+        :value: None
+
+        Backend to execute pings instead of the ``ping`` command
+        (e.g. :py:class:`~pingparsing.FakePingBackend`).
+        Execute the ``ping`` command if the value is |None|.
+
+    .. py:attribute:: max_stdout_lines
+        :type: Optional[int]
+        :value: None
+
+        Maximum number of ICMP reply lines to keep in the captured ``stdout``.
+        If specified, ``stdout`` of the ``ping`` command is streamed through a bounded buffer
+        that keeps the first line, the last few lines (the statistics block), and
+        at most ``max_stdout_lines`` lines of the other lines, so that memory usage is bounded
+        regardless of the number of packets.
+        Statistics of the packets are not affected, but ICMP replies of the result are partial.
+        Capture all of ``stdout`` if the value is |None|.
+
+    .. py:attribute:: stdout_sampling
+        :type: str
+        :value: "tail"
+
+        How to select ICMP reply lines to keep when :py:attr:`~.max_stdout_lines` is specified:
+        ``tail`` keeps the last lines, ``reservoir`` keeps a uniform random sample of lines.
     """
 
     @property
@@ -233,6 +291,11 @@ class PingTransmitter:
         self.timeout: TimeArg = None
         self.deadline: TimeArg = None
         self.timestamp = False
+        self.backend: Optional[PingBackend] = None
+        self.max_stdout_lines: Optional[int] = None
+        self.stdout_sampling = "tail"
+
+        self.__cmd_cache: Optional[Tuple[Tuple[Hashable, ...], Command]] = None
 
     def ping(self) -> PingResult:
         """
@@ -245,33 +308,225 @@ class PingTransmitter:
 
         self.__validate_ping_param()
 
+        if self.max_stdout_lines is not None:
+            return self.__ping_bounded()
+
+        if self.backend is not None:
+            return self.backend.ping(self)
+
         ping_runner = subprocrunner.SubprocessRunner(self.__make_ping_command())
         ping_runner.run()
 
         return PingResult(ping_runner.stdout, ping_runner.stderr, ping_runner.returncode)
 
-    @staticmethod
-    def __is_linux():
-        return platform.system() == "Linux"
+    async def ping_async(self) -> PingResult:
+        """
+        Sending ICMP packets asynchronously.
+        The ``ping`` command is executed as an :py:mod:`asyncio` subprocess,
+        so that many destinations can be waited concurrently within a single thread.
 
-    @staticmethod
-    def __is_macos():
-        return platform.system() == "Darwin"
+        :return: ``ping`` command execution result.
+        :rtype: :py:class:`.PingResult`
+        :raises ValueError: If parameters are not valid.
+        :raises subprocrunner.CommandError: If the ``ping`` command is not found.
+        """
 
-    @staticmethod
-    def __is_windows():
-        return platform.system() == "Windows"
+        import asyncio
+
+        from mbstrdecoder import MultiByteStrDecoder
+
+        self.__validate_ping_param()
+
+        if self.backend is not None:
+            result = await self.backend.ping_async(self)
+            if self.max_stdout_lines is not None:
+                result = self.__bound_result(result)
+
+            return result
+
+        command = self.__make_ping_command()
+        logger.debug("async ping command: {}", command)
 
-    def __is_ipv6(self):
         try:
-            network = ipaddress.ip_address(str(self.destination))
-        except ValueError as e:
-            logger.debug(e)
-            return False
+            if isinstance(command, str):
+                proc = await asyncio.create_subprocess_shell(
+                    command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+        except FileNotFoundError as e:
+            raise subprocrunner.CommandError(
+                f"command not found: {e.filename}", cmd=command, errno=errno.ENOENT
+            )
+
+        if self.max_stdout_lines is not None:
+            assert proc.stdout is not None and proc.stderr is not None
+            stdout_reader = proc.stdout
+            stdout_buffer = self.__make_stdout_buffer()
+
+            async def read_stdout() -> None:
+                while True:
+                    line = await stdout_reader.readline()
+                    if not line:
+                        return
+                    stdout_buffer.append(_decode_output(line))
+
+            # drain both of the pipes concurrently: a child that fills up the stderr pipe
+            # would block while only stdout is read
+            _, stderr = await asyncio.gather(read_stdout(), proc.stderr.read())
+            await proc.wait()
+
+            return PingResult(stdout_buffer.getvalue(), _decode_output(stderr), proc.returncode)
+
+        stdout, stderr = await proc.communicate()
+
+        return PingResult(
+            MultiByteStrDecoder(stdout).unicode_str,
+            MultiByteStrDecoder(stderr).unicode_str,
+            proc.returncode,
+        )
+
+    def ping_stream(self, window: float = 60.0) -> Iterator["PingStats"]:
+        """
+        Keep a ``ping`` process running and yield statistics for each time window,
+        instead of spawning a ``ping`` process for each measurement.
+        ICMP replies are parsed incrementally as the process outputs them.
+        The ``ping`` process runs until the iteration is stopped
+        unless :py:attr:`~.count` or :py:attr:`~.deadline` is specified.
+
+        The ``ping`` command is executed with ``-D -O`` options on Linux,
+        so that windows are sliced by timestamps and lost packets are counted
+        as soon as they are detected.
+        Not supported on Windows: replies of Windows ``ping`` do not have sequence numbers,
+        which are required to count packets of each window.
+
+        Args:
+            window: length of a time window [sec].
+
+        :return: statistics for each time window.
+        :rtype: Iterator[:py:class:`~pingparsing.PingStats`]
+        :raises ValueError: If parameters are not valid.
+        :raises RuntimeError: If the platform is Windows.
+        :raises subprocrunner.CommandError:
+            If the ``ping`` command is not found, or
+            the ``ping`` process failed with error messages (e.g. unknown host).
+
+        Examples:
+            >>> import pingparsing
+            >>> transmitter = pingparsing.PingTransmitter()
+            >>> transmitter.destination = "google.com"
+            >>> for stats in transmitter.ping_stream(window=60):
+            ...     print(stats.as_dict())
+        """
+
+        from ._parser import LinuxPingParser, MacOsPingParser
+        from ._streaming import PingStreamParser
+
+        self.__validate_ping_param()
+
+        if self.backend is not None:
+            stream_parser = PingStreamParser(window=window, destination=self.destination)
+            yield from stream_parser.iter_stats(self.backend.ping_lines(self))
+            return
+
+        cmd_maker_class = _get_cmd_maker_class()
+        if cmd_maker_class is WindowsPingCmdMaker:
+            raise RuntimeError("ping_stream is not supported on Windows")
+
+        parser = MacOsPingParser() if cmd_maker_class is MacosPingCmdMaker else LinuxPingParser()
+        stream_parser = PingStreamParser(window=window, destination=self.destination, parser=parser)
+
+        yield from stream_parser.iter_stats(self.__run_continuous_ping())
+
+    def __run_continuous_ping(self) -> Iterator[str]:
+        import tempfile
+
+        command = self.__make_cmd_maker(
+            timestamp=self.timestamp or _get_cmd_maker_class() is LinuxPingCmdMaker,
+            is_continuous=True,
+        ).make_cmd(destination=self.destination)
+        logger.debug("continuous ping command: {}", command)
+
+        # stderr is written to a file instead of a pipe:
+        # a pipe could fill up and block the process while only stdout is read
+        with tempfile.TemporaryFile(mode="w+", errors="replace") as stderr_file:
+            proc = self.__popen(command, stderr=stderr_file)
+
+            try:
+                assert proc.stdout is not None
+                yield from proc.stdout
+            finally:
+                if proc.poll() is None:
+                    proc.terminate()
+                returncode = proc.wait()
+                logger.debug("continuous ping finished: returncode={}", returncode)
+
+            # reached only when the process exited by itself
+            stderr_file.seek(0)
+            stderr = stderr_file.read().strip()
+            if stderr and returncode != 0:
+                raise subprocrunner.CommandError(stderr, cmd=command, errno=returncode)
+            if stderr:
+                logger.warning("{}", stderr)
+
+    def __make_stdout_buffer(self) -> "BoundedLineBuffer":
+        from ._capture import BoundedLineBuffer
+
+        return BoundedLineBuffer(cast(int, self.max_stdout_lines), sampling=self.stdout_sampling)
+
+    def __bound_result(self, result: PingResult) -> PingResult:
+        stdout_buffer = self.__make_stdout_buffer()
+        stdout_buffer.extend(result.stdout.splitlines())
+
+        return PingResult(stdout_buffer.getvalue(), result.stderr, result.returncode)
+
+    def __ping_bounded(self) -> PingResult:
+        import tempfile
 
-        logger.debug(f"IP address: version={network.version}, address={self.destination}")
+        if self.backend is not None:
+            return self.__bound_result(self.backend.ping(self))
 
-        return network.version == 6
+        command = self.__make_ping_command()
+        logger.debug("bounded capture ping command: {}", command)
+
+        stdout_buffer = self.__make_stdout_buffer()
+
+        # stderr is written to a file instead of a pipe:
+        # a pipe could fill up and block the process while only stdout is read
+        with tempfile.TemporaryFile() as stderr_file:
+            proc = self.__popen(command, stderr=stderr_file)
+            assert proc.stdout is not None
+            with proc:
+                for line in proc.stdout:
+                    stdout_buffer.append(line)
+
+            stderr_file.seek(0)
+            stderr = _decode_output(stderr_file.read())
+
+        return PingResult(stdout_buffer.getvalue(), stderr, proc.returncode)
+
+    @staticmethod
+    def __popen(command: Command, stderr: Union[int, IO]) -> "subprocess.Popen":
+        import subprocess
+
+        try:
+            return subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                universal_newlines=True,
+                errors="replace",
+                shell=isinstance(command, str),
+            )
+        except FileNotFoundError as e:
+            raise subprocrunner.CommandError(
+                f"command not found: {e.filename}", cmd=command, errno=errno.ENOENT
+            )
+
+    def __is_ipv6(self) -> bool:
+        return _is_ipv6_address(str(self.destination))
 
     def __validate_ping_param(self) -> None:
         self.__validate_count()
@@ -299,21 +554,22 @@ class PingTransmitter:
         if typepy.is_null_string(self.interface):
             raise ValueError("interface required to ping to IPv6 link local address")
 
-    def __make_ping_command(self) -> Command:
-        from typing import Any  # noqa
-
-        maker_class: Any = None
-
-        if self.__is_linux():
-            maker_class = LinuxPingCmdMaker
-        elif self.__is_macos():
-            maker_class = MacosPingCmdMaker
-        elif self.__is_windows():
-            maker_class = WindowsPingCmdMaker
-        else:
-            raise RuntimeError(f"not supported platform: {platform.system()}")
-
-        return maker_class(
+    def __make_cmd_cache_key(self) -> Tuple[Hashable, ...]:
+        return (
+            self.destination,
+            self.count,
+            self.packet_size,
+            self.ttl,
+            self.deadline.milliseconds if self.deadline is not None else None,
+            self.timeout.milliseconds if self.timeout is not None else None,
+            self.interface,
+            self.timestamp,
+            self.auto_codepage,
+            self.ping_option if isinstance(self.ping_option, str) else tuple(self.ping_option),
+        )
+
+    def __make_cmd_maker(self, timestamp: bool, is_continuous: bool = False) -> PingCmdMaker:
+        return _get_cmd_maker_class()(
             count=self.count,
             packet_size=self.packet_size,
             ttl=self.ttl,
@@ -321,7 +577,25 @@ class PingTransmitter:
             timeout=self.timeout,
             interface=self.interface,
             is_ipv6=self.__is_ipv6(),
-            timestamp=self.timestamp,
+            timestamp=timestamp,
             auto_codepage=self.auto_codepage,
             ping_option=self.ping_option,
-        ).make_cmd(destination=self.destination)
+            is_continuous=is_continuous,
+        )
+
+    def __make_ping_command(self) -> Command:
+        # reuse the command built by the previous call if none of the attributes changed
+        cache_key = self.__make_cmd_cache_key()
+        if self.__cmd_cache is not None and self.__cmd_cache[0] == cache_key:
+            command = self.__cmd_cache[1]
+        else:
+            command = self.__make_cmd_maker(timestamp=self.timestamp).make_cmd(
+                destination=self.destination
+            )
+            self.__cmd_cache = (cache_key, command)
+
+        if isinstance(command, list):
+            # return a copy to prevent modifications of the cached command
+            return list(command)
+
+        return command
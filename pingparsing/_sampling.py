@@ -0,0 +1,224 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import math
+import random
+from collections import deque
+from typing import Dict, List, MutableSequence, Optional, Tuple
+
+from ._capture import SamplingMethod
+from ._sequence import SequenceUnwrapper
+from ._typing import IcmpReplies
+
+
+_TIME_KEY = "time"
+_SEQUENCE_NO_KEY = "icmp_seq"
+_DUPLICATE_KEY = "duplicate"
+
+
+class RttSketch:
+    """
+    Quantile sketch of round trip times with a bounded relative error.
+
+    Values are counted in logarithmically sized buckets,
+    thus memory usage depends on the range of values, not the number of values.
+    Minimum/maximum values are kept exactly.
+
+    Args:
+        relative_accuracy: relative error of quantiles ``(0, 1)``.
+    """
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    @property
+    def min(self) -> Optional[float]:
+        return self.__min
+
+    @property
+    def max(self) -> Optional[float]:
+        return self.__max
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in the range of (0, 1)")
+
+        self.relative_accuracy = relative_accuracy
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__buckets: Dict[int, int] = {}
+        self.__zero_count = 0
+        self.__count = 0
+        self.__min: Optional[float] = None
+        self.__max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            self.__zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self.__log_gamma)
+            self.__buckets[key] = self.__buckets.get(key, 0) + 1
+
+        self.__count += 1
+        self.__min = value if self.__min is None else min(self.__min, value)
+        self.__max = value if self.__max is None else max(self.__max, value)
+
+    def merge(self, other: "RttSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracies")
+
+        for key, count in other.__buckets.items():
+            self.__buckets[key] = self.__buckets.get(key, 0) + count
+
+        self.__zero_count += other.__zero_count
+        self.__count += other.__count
+        for value in (other.__min, other.__max):
+            if value is None:
+                continue
+
+            self.__min = value if self.__min is None else min(self.__min, value)
+            self.__max = value if self.__max is None else max(self.__max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by the nearest-rank method.
+
+        Args:
+            q: quantile ``[0, 1]``.
+
+        Returns:
+            |float|: |None| if no value has been added.
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in the range of [0, 1]")
+        if not self.__count:
+            return None
+
+        rank = max(0, math.ceil(q * self.__count) - 1)
+        if rank == 0:
+            return self.__min
+        if rank == self.__count - 1:
+            return self.__max
+        if rank < self.__zero_count:
+            return 0.0
+
+        cumulative = self.__zero_count
+        for key in sorted(self.__buckets):
+            cumulative += self.__buckets[key]
+            if cumulative > rank:
+                break
+
+        value = 2 * self.__gamma**key / (self.__gamma + 1)
+
+        return min(max(value, self.__min), self.__max)  # type: ignore
+
+
+class IcmpReplySampler:
+    """
+    Keep a bounded sample of ICMP replies of a long ``ping`` run.
+
+    Replies that indicate a problem are always kept: ``no answer yet`` replies,
+    duplicated replies, and replies following a gap of sequence numbers (lost packets).
+    Sequence numbers are unwrapped beyond 65535 in the same way as
+    :py:attr:`~pingparsing.PingStats.sequence_stats`.
+    Of the other replies, at most ``max_replies`` replies are kept:
+    a uniform random sample of them (reservoir sampling) or the last ones.
+    Kept replies are returned in the original order.
+
+    Round trip times of all of the non-duplicated replies are
+    aggregated into :py:attr:`rtt_sketch` regardless of the sampling.
+
+    Args:
+        max_replies: maximum number of sampled replies.
+        sampling: ``reservoir`` or ``tail``.
+        seed: seed of the random number generator for the reservoir sampling.
+    """
+
+    @property
+    def num_replies(self) -> int:
+        """
+        Number of replies added to the sampler.
+        """
+
+        return self.__num_replies
+
+    @property
+    def rtt_sketch(self) -> RttSketch:
+        return self.__rtt_sketch
+
+    def __init__(
+        self,
+        max_replies: int,
+        sampling: str = SamplingMethod.RESERVOIR,
+        seed: Optional[int] = None,
+    ) -> None:
+        if max_replies < 0:
+            raise ValueError("max_replies must be greater than or equal to zero")
+        if sampling not in SamplingMethod.LIST:
+            raise ValueError(f"unknown sampling method: {sampling}")
+
+        self.__max_replies = max_replies
+        self.__sampling = sampling
+        self.__random = random.Random(seed)
+
+        self.__notable: List[Tuple[int, Dict]] = []
+        self.__samples: MutableSequence[Tuple[int, Dict]]
+        if sampling == SamplingMethod.TAIL:
+            self.__samples = deque(maxlen=max_replies)
+        else:
+            self.__samples = []
+        self.__num_replies = 0
+        self.__num_sampling_replies = 0
+        self.__seq_unwrapper = SequenceUnwrapper()
+        self.__rtt_sketch = RttSketch()
+
+    def add(self, reply: Dict) -> None:
+        index = self.__num_replies
+        self.__num_replies += 1
+
+        is_duplicate = reply.get(_DUPLICATE_KEY)
+        if _TIME_KEY in reply and not is_duplicate:
+            self.__rtt_sketch.add(reply[_TIME_KEY])
+
+        seq = reply.get(_SEQUENCE_NO_KEY)
+        is_after_gap = False
+        if seq is not None:
+            last_seq = self.__seq_unwrapper.max_seq
+            seq = self.__seq_unwrapper.unwrap(seq)
+            is_after_gap = last_seq is not None and seq > last_seq + 1
+
+        if _TIME_KEY not in reply or is_duplicate or is_after_gap:
+            self.__notable.append((index, reply))
+            return
+
+        self.__add_sample(index, reply)
+
+    def get_replies(self) -> IcmpReplies:
+        return [reply for _, reply in sorted(self.__notable + list(self.__samples), key=_get_index)]
+
+    def __add_sample(self, index: int, reply: Dict) -> None:
+        sample_index = self.__num_sampling_replies
+        self.__num_sampling_replies += 1
+
+        if not self.__max_replies:
+            return
+
+        if self.__sampling == SamplingMethod.TAIL:
+            self.__samples.append((index, reply))
+            return
+
+        # reservoir sampling (Algorithm R)
+        if len(self.__samples) < self.__max_replies:
+            self.__samples.append((index, reply))
+            return
+
+        replace_idx = self.__random.randint(0, sample_index)
+        if replace_idx < self.__max_replies:
+            self.__samples[replace_idx] = (index, reply)
+
+
+def _get_index(item: Tuple[int, Dict]) -> int:
+    return item[0]
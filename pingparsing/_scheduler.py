@@ -0,0 +1,295 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import heapq
+import random
+import threading
+import time
+import zlib
+from concurrent import futures
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ._logger import logger
+
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+ProbeFunc = Callable[[str], Any]
+ResultCallback = Callable[[str, Any], None]
+
+
+class ProbeScheduler:
+    """
+    Scheduler to run probes (e.g. sending pings by :py:class:`~pingparsing.PingTransmitter`)
+    for many targets periodically without bursts.
+
+    - Probes of each target are spread across the interval by a per-target phase offset,
+      which is derived from the target name (stable across restarts),
+      plus a random jitter for each run.
+    - A global packets-per-second budget (token bucket) and
+      a maximum number of concurrent probes are enforced.
+      Probes that exceed the budget are deferred until the budget is available.
+    - A probe is skipped when the previous probe for the same target is still running
+      (overrun), and the target is rescheduled for the next interval.
+      Probes that are late for more than an interval are also skipped to the next slot,
+      so that the schedule never builds up a backlog.
+
+    Args:
+        targets: destinations to probe.
+        probe: a function that executes a probe for a target. called in worker threads.
+        interval: interval between probes of each target [sec].
+        packets_per_probe: number of packets sent by a probe.
+        max_pps: global budget of packets per second. unlimited if |None|.
+        max_concurrency: maximum number of concurrently running probes.
+        jitter: ratio of the interval to randomly delay each probe ``[0, 1)``.
+        on_result: a function called with a target and the probe result.
+        clock: monotonic clock function [sec].
+        executor: executor to run probes. defaults to a thread pool of ``max_concurrency``.
+        seed: seed of the jitter random number generator.
+    """
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """
+        Number of ``launched``/``completed``/``failed``/``overrun``/``deferred``/``skipped``
+        probes.
+        """
+
+        with self.__lock:
+            return dict(self.__counters)
+
+    @property
+    def running(self) -> int:
+        with self.__lock:
+            return len(self.__running)
+
+    def __init__(
+        self,
+        targets: Sequence[str],
+        probe: ProbeFunc,
+        interval: float = 60.0,
+        packets_per_probe: int = 1,
+        max_pps: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        jitter: float = 0.1,
+        on_result: Optional[ResultCallback] = None,
+        clock: Callable[[], float] = time.monotonic,
+        executor: Optional[futures.Executor] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be greater than zero")
+        if max_pps is not None and max_pps <= 0:
+            raise ValueError("max_pps must be greater than zero")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be greater than zero")
+        if not (0 <= jitter < 1):
+            raise ValueError("jitter must be in the range of [0, 1)")
+
+        self.__probe = probe
+        self.__interval = interval
+        self.__packets_per_probe = packets_per_probe
+        self.__max_pps = max_pps
+        self.__max_concurrency = max_concurrency
+        self.__jitter = jitter
+        self.__on_result = on_result
+        self.__clock = clock
+        self.__executor = executor
+        self.__random = random.Random(seed)
+
+        self.__lock = threading.Lock()
+        self.__running: Set[str] = set()
+        self.__completed_event = threading.Event()
+        self.__counters = {
+            "launched": 0,
+            "completed": 0,
+            "failed": 0,
+            "overrun": 0,
+            "deferred": 0,
+            "skipped": 0,
+        }
+
+        # token bucket for the packets-per-second budget
+        self.__bucket_capacity = max(max_pps or 0, packets_per_probe)
+        self.__tokens = float(self.__bucket_capacity)
+        self.__token_updated_at = clock()
+
+        # heap of (due time, sequence number, target, base time of the slot)
+        self.__heap: List[Tuple[float, int, str, float]] = []
+        self.__seq = 0
+        start_time = clock()
+        for target in dict.fromkeys(targets):
+            base_time = start_time + self.phase_offset(target)
+            self.__push(base_time + self.__make_jitter(), target, base_time)
+
+    def phase_offset(self, target: str) -> float:
+        """
+        Stable offset of the first probe for a target within the interval [sec].
+        """
+
+        return zlib.crc32(target.encode("utf-8")) / 2**32 * self.__interval
+
+    def next_due(self) -> Optional[float]:
+        """
+        Clock time of the next probe. |None| if there are no targets.
+        """
+
+        with self.__lock:
+            if not self.__heap:
+                return None
+
+            return self.__heap[0][0]
+
+    def run_pending(self) -> List[str]:
+        """
+        Launch probes that are due.
+
+        Returns:
+            List of targets that launched probes.
+        """
+
+        launched = []
+
+        with self.__lock:
+            now = self.__clock()
+            self.__refill_tokens(now)
+
+            while self.__heap and self.__heap[0][0] <= now:
+                due_time, _, target, base_time = self.__heap[0]
+
+                if target in self.__running:
+                    # the previous probe overran the interval
+                    heapq.heappop(self.__heap)
+                    self.__counters["overrun"] += 1
+                    self.__reschedule(target, base_time, now)
+                    continue
+
+                if len(self.__running) >= self.__max_concurrency:
+                    break
+
+                if self.__tokens < self.__packets_per_probe:
+                    # defer all of the due probes until the budget is refilled
+                    assert self.__max_pps is not None
+                    wait = (self.__packets_per_probe - self.__tokens) / self.__max_pps
+                    self.__defer_due_probes(now + wait)
+                    break
+
+                heapq.heappop(self.__heap)
+                if self.__max_pps is not None:
+                    self.__tokens -= self.__packets_per_probe
+
+                self.__running.add(target)
+                self.__counters["launched"] += 1
+                launched.append(target)
+                self.__reschedule(target, base_time, now)
+
+        for target in launched:
+            self.__submit(target)
+
+        return launched
+
+    def run(
+        self,
+        stop_event: threading.Event,
+        max_wait: float = 1.0,
+        tick: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Launch probes until ``stop_event`` is set.
+
+        Args:
+            stop_event: event to stop the scheduler.
+            max_wait: maximum wait time between checks of due probes [sec].
+                Also the maximum time to notice ``stop_event`` while all of
+                the ``max_concurrency`` probes are running.
+            tick: a function called for each loop.
+        """
+
+        while not stop_event.is_set():
+            self.__completed_event.clear()
+            self.run_pending()
+
+            if tick is not None:
+                tick()
+
+            next_due = self.next_due()
+            wait = max_wait if next_due is None else next_due - self.__clock()
+            if wait <= 0 and self.__is_saturated():
+                # due probes are waiting for running probes: wait for a completion
+                # instead of polling until a probe completes
+                self.__completed_event.wait(max_wait)
+                continue
+
+            stop_event.wait(min(max(wait, 0.001), max_wait))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=wait)
+
+    def __push(self, due_time: float, target: str, base_time: float) -> None:
+        self.__seq += 1
+        heapq.heappush(self.__heap, (due_time, self.__seq, target, base_time))
+
+    def __make_jitter(self) -> float:
+        if not self.__jitter:
+            return 0.0
+
+        return self.__random.uniform(0, self.__jitter * self.__interval)
+
+    def __reschedule(self, target: str, base_time: float, now: float) -> None:
+        next_base_time = base_time + self.__interval
+        if next_base_time <= now:
+            # skip the slots that already passed instead of catching up with a burst
+            skipped = int((now - base_time) // self.__interval)
+            self.__counters["skipped"] += skipped
+            next_base_time = base_time + (skipped + 1) * self.__interval
+
+        self.__push(next_base_time + self.__make_jitter(), target, next_base_time)
+
+    def __is_saturated(self) -> bool:
+        with self.__lock:
+            return len(self.__running) >= self.__max_concurrency
+
+    def __defer_due_probes(self, due_time: float) -> None:
+        deferred = []
+        while self.__heap and self.__heap[0][0] < due_time:
+            deferred.append(heapq.heappop(self.__heap))
+
+        for _, _, target, base_time in deferred:
+            self.__counters["deferred"] += 1
+            self.__push(due_time, target, base_time)
+
+    def __refill_tokens(self, now: float) -> None:
+        if self.__max_pps is None:
+            return
+
+        elapsed = max(now - self.__token_updated_at, 0.0)
+        self.__tokens = min(self.__bucket_capacity, self.__tokens + elapsed * self.__max_pps)
+        self.__token_updated_at = now
+
+    def __submit(self, target: str) -> None:
+        if self.__executor is None:
+            self.__executor = futures.ThreadPoolExecutor(self.__max_concurrency)
+
+        future = self.__executor.submit(self.__probe, target)
+        future.add_done_callback(lambda f: self.__complete(target, f))
+
+    def __complete(self, target: str, future: futures.Future) -> None:
+        with self.__lock:
+            self.__running.discard(target)
+        self.__completed_event.set()
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error("failed to probe {}: {}", target, e)
+            with self.__lock:
+                self.__counters["failed"] += 1
+            return
+
+        with self.__lock:
+            self.__counters["completed"] += 1
+
+        if self.__on_result is not None:
+            self.__on_result(target, result)
@@ -0,0 +1,203 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+_SEQUENCE_NO_KEY = "icmp_seq"
+_TIME_KEY = "time"
+_DUPLICATE_KEY = "duplicate"
+
+# ICMP sequence numbers are 16-bit integers: wrap around after 65535
+_SEQ_MODULUS = 2**16
+_SEQ_HALF_MODULUS = 2**15
+
+
+class SequenceStats:
+    """
+    Loss episodes, reordering, and gaps of ICMP sequence numbers of a ``ping`` result.
+
+    Sequence numbers are unwrapped: they continue to count up beyond 65535.
+
+    Attributes:
+        num_lost (int):
+            Number of lost packets: packets with ``no answer yet`` lines (``ping -O``)
+            or without any lines, and never replied afterward.
+            Packets lost at the end of an output without any lines are not counted.
+        loss_episodes (int): Number of runs of consecutive lost packets.
+        max_loss_burst (int): Length of the longest run of consecutive lost packets.
+        loss_bursts (Dict[int, int]): Mapping of lengths of runs to the number of the runs.
+        out_of_order (int):
+            Number of replies that arrived after a reply of a later sequence number.
+        late_replies (int):
+            Number of replies for packets that had been considered lost
+            (replies after ``no answer yet`` lines or after replies of later packets).
+        gaps (List[Tuple[int, int]]):
+            Ranges (first and last, inclusive) of sequence numbers skipped in the outputs.
+    """
+
+    def __init__(
+        self,
+        loss_runs: List[Tuple[int, int]],
+        out_of_order: int,
+        late_replies: int,
+        gaps: List[Tuple[int, int]],
+    ) -> None:
+        loss_bursts: Dict[int, int] = {}
+        for first, last in loss_runs:
+            length = last - first + 1
+            loss_bursts[length] = loss_bursts.get(length, 0) + 1
+
+        self.num_lost = sum(length * count for length, count in loss_bursts.items())
+        self.loss_episodes = len(loss_runs)
+        self.max_loss_burst = max(loss_bursts, default=0)
+        self.loss_bursts = dict(sorted(loss_bursts.items()))
+        self.out_of_order = out_of_order
+        self.late_replies = late_replies
+        self.gaps = gaps
+
+    def __repr__(self) -> str:
+        return "SequenceStats({})".format(
+            ", ".join(f"{key}={value}" for key, value in self.as_dict().items())
+        )
+
+    def as_dict(self) -> Dict:
+        return {
+            "num_lost": self.num_lost,
+            "loss_episodes": self.loss_episodes,
+            "max_loss_burst": self.max_loss_burst,
+            "loss_bursts": self.loss_bursts,
+            "out_of_order": self.out_of_order,
+            "late_replies": self.late_replies,
+            "gaps": self.gaps,
+        }
+
+
+class SequenceUnwrapper:
+    """
+    Unwrap 16-bit ICMP sequence numbers: sequence numbers continue to count up beyond 65535.
+    A sequence number far behind the largest one is regarded as wrapped around,
+    and a number far ahead of it after a wrap around as a late reply sent before the wrap.
+    """
+
+    @property
+    def max_seq(self) -> Optional[int]:
+        """
+        The largest unwrapped sequence number so far.
+        """
+
+        return self.__max_seq
+
+    def __init__(self) -> None:
+        self.__seq_offset = 0
+        self.__max_seq: Optional[int] = None
+
+    def unwrap(self, seq: int) -> int:
+        seq += self.__seq_offset
+
+        if self.__max_seq is not None:
+            if seq < self.__max_seq - _SEQ_HALF_MODULUS:
+                self.__seq_offset += _SEQ_MODULUS
+                seq += _SEQ_MODULUS
+            elif seq > self.__max_seq + _SEQ_HALF_MODULUS and self.__seq_offset:
+                # a late reply for a packet sent before the wrap around
+                seq -= _SEQ_MODULUS
+
+        if self.__max_seq is None or seq > self.__max_seq:
+            self.__max_seq = seq
+
+        return seq
+
+
+class SequenceAnalyzer:
+    """
+    Analyze ICMP sequence numbers of replies in a single pass.
+
+    Lost packets are kept as runs of consecutive sequence numbers:
+    a run is extended/appended at the largest sequence number in O(1).
+    A run that a late reply falls in is found by binary search in O(log(number of runs)),
+    but removing/splitting it shifts the following runs in the lists: O(number of runs)
+    in the worst case (a memmove, fast in practice since late replies are usually
+    for recent packets, i.e. runs near the end).
+    """
+
+    @property
+    def num_sequences(self) -> int:
+        """
+        Number of replies that have sequence numbers.
+        """
+
+        return self.__num_sequences
+
+    def __init__(self) -> None:
+        self.__num_sequences = 0
+        self.__unwrapper = SequenceUnwrapper()
+        self.__max_received_seq: Optional[int] = None
+        self.__loss_firsts: List[int] = []
+        self.__loss_lasts: List[int] = []
+        self.__gaps: List[Tuple[int, int]] = []
+        self.__out_of_order = 0
+        self.__late_replies = 0
+
+    def add(self, reply: Dict) -> None:
+        seq = reply.get(_SEQUENCE_NO_KEY)
+        if seq is None or reply.get(_DUPLICATE_KEY):
+            return
+
+        self.__num_sequences += 1
+        max_seq = self.__unwrapper.max_seq
+        seq = self.__unwrapper.unwrap(seq)
+        is_received = _TIME_KEY in reply
+
+        if max_seq is None or seq > max_seq:
+            if max_seq is not None and seq > max_seq + 1:
+                self.__gaps.append((max_seq + 1, seq - 1))
+                self.__add_loss(max_seq + 1, seq - 1)
+            if not is_received:
+                self.__add_loss(seq, seq)
+        elif is_received and self.__remove_loss(seq):
+            self.__late_replies += 1
+
+        if is_received:
+            if self.__max_received_seq is not None and seq < self.__max_received_seq:
+                self.__out_of_order += 1
+            else:
+                self.__max_received_seq = seq
+
+    def get_stats(self) -> SequenceStats:
+        return SequenceStats(
+            loss_runs=list(zip(self.__loss_firsts, self.__loss_lasts)),
+            out_of_order=self.__out_of_order,
+            late_replies=self.__late_replies,
+            gaps=list(self.__gaps),
+        )
+
+    def __add_loss(self, first: int, last: int) -> None:
+        if self.__loss_lasts and self.__loss_lasts[-1] == first - 1:
+            self.__loss_lasts[-1] = last
+            return
+
+        self.__loss_firsts.append(first)
+        self.__loss_lasts.append(last)
+
+    def __remove_loss(self, seq: int) -> bool:
+        i = bisect_right(self.__loss_firsts, seq) - 1
+        if i < 0 or seq > self.__loss_lasts[i]:
+            return False
+
+        first, last = self.__loss_firsts[i], self.__loss_lasts[i]
+        if first == last:
+            del self.__loss_firsts[i]
+            del self.__loss_lasts[i]
+        elif seq == first:
+            self.__loss_firsts[i] = seq + 1
+        elif seq == last:
+            self.__loss_lasts[i] = seq - 1
+        else:
+            self.__loss_lasts[i] = seq - 1
+            self.__loss_firsts.insert(i + 1, seq + 1)
+            self.__loss_lasts.insert(i + 1, last)
+
+        return True
@@ -0,0 +1,313 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+
+Compact binary serialization of :py:class:`~pingparsing.PingStats` with MessagePack.
+
+A serialized result is a map with the following keys (schema version 1):
+
+- ``v``: schema version.
+- ``s``: statistics: ``[destination, packet_transmit, packet_receive,
+  rtt_min, rtt_avg, rtt_max, rtt_mdev, duplicates]``.
+- ``p``: name of the parser (omitted if the format was not detected).
+- ``r``: ICMP replies in a columnar layout (omitted if there are no replies).
+  A column is omitted when none of the replies have the key, and
+  ``nil`` is stored for replies without the key.
+
+  - ``n``: number of replies.
+  - ``dst``: unique destinations. ``dsti``: indices to ``dst`` for each reply
+    (omitted if all of the replies have the same destination).
+  - ``seq``: delta-encoded ICMP sequence numbers.
+  - ``ts``: delta-encoded timestamps in microseconds since the UNIX epoch.
+    Naive timestamps are regarded as the local time.
+    ``tzo``: UTC offset of timestamps in seconds (omitted for naive timestamps).
+    ``tzos``: UTC offsets for each reply instead of ``tzo`` when the offsets differ
+    (e.g. timestamps across a daylight saving time transition).
+  - ``ttl``/``bytes``: TTLs/sizes of replies.
+  - ``time``: round trip times in microseconds (integers) if ``tq`` is true,
+    round trip times in milliseconds (floats) otherwise.
+  - ``dup``: indices of duplicated replies.
+
+``rtt_sketch`` and ``sequence_stats`` of results are not serialized.
+"""
+
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, List, Optional, Sequence
+
+from ._stats import PingStats
+from ._typing import IcmpReplies
+
+
+SCHEMA_VERSION = 1
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+_TIME_SCALE = 1000
+
+_DESTINATION_KEY = "destination"
+_BYTES_KEY = "bytes"
+_TIMESTAMP_KEY = "timestamp"
+_SEQUENCE_NO_KEY = "icmp_seq"
+_TTL_KEY = "ttl"
+_TIME_KEY = "time"
+_DUPLICATE_KEY = "duplicate"
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "msgpack package is required for the binary serialization: "
+            "pip install pingparsing[msgpack]"
+        ) from e
+
+    return msgpack
+
+
+def _delta_encode(values: Sequence[Optional[int]]) -> List[Optional[int]]:
+    encoded: List[Optional[int]] = []
+    prev = 0
+
+    for value in values:
+        if value is None:
+            encoded.append(None)
+            continue
+
+        encoded.append(value - prev)
+        prev = value
+
+    return encoded
+
+
+def _delta_decode(values: Sequence[Optional[int]]) -> List[Optional[int]]:
+    decoded: List[Optional[int]] = []
+    prev = 0
+
+    for value in values:
+        if value is None:
+            decoded.append(None)
+            continue
+
+        prev += value
+        decoded.append(prev)
+
+    return decoded
+
+
+def _to_microseconds(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        # naive timestamps are in the local time:
+        # typepy converts timestamps of ping -D into naive local datetimes
+        dt = dt.astimezone()
+
+    return (dt - _EPOCH_UTC) // _ONE_MICROSECOND
+
+
+def _from_microseconds(value: int, tz: Optional[tzinfo]) -> datetime:
+    dt = _EPOCH_UTC + timedelta(microseconds=value)
+    if tz is None:
+        return dt.astimezone().replace(tzinfo=None)
+
+    return dt.astimezone(tz)
+
+
+def _to_utc_offset(dt: Optional[datetime]) -> Optional[int]:
+    if dt is None:
+        return None
+
+    utc_offset = dt.utcoffset()
+    if utc_offset is None:
+        return None
+
+    return int(utc_offset.total_seconds())
+
+
+def _encode_replies(icmp_replies: IcmpReplies) -> Dict[str, Any]:
+    columns: Dict[str, Any] = {"n": len(icmp_replies)}
+
+    def get_column(key: str) -> Optional[List]:
+        values = [reply.get(key) for reply in icmp_replies]
+        if all(value is None for value in values):
+            return None
+
+        return values
+
+    destinations = get_column(_DESTINATION_KEY)
+    if destinations is not None:
+        unique_destinations = list(dict.fromkeys(dst for dst in destinations if dst is not None))
+        columns["dst"] = unique_destinations
+        if len(unique_destinations) > 1 or None in destinations:
+            dst_index_map = {dst: i for i, dst in enumerate(unique_destinations)}
+            columns["dsti"] = [None if dst is None else dst_index_map[dst] for dst in destinations]
+
+    seqs = get_column(_SEQUENCE_NO_KEY)
+    if seqs is not None:
+        columns["seq"] = _delta_encode(seqs)
+
+    timestamps = get_column(_TIMESTAMP_KEY)
+    if timestamps is not None:
+        columns["ts"] = _delta_encode(
+            [None if ts is None else _to_microseconds(ts) for ts in timestamps]
+        )
+        utc_offsets = [_to_utc_offset(ts) for ts in timestamps]
+        unique_offsets = set(offset for offset in utc_offsets if offset is not None)
+        if len(unique_offsets) == 1:
+            columns["tzo"] = unique_offsets.pop()
+        elif len(unique_offsets) > 1:
+            columns["tzos"] = utc_offsets
+
+    for key in (_TTL_KEY, _BYTES_KEY):
+        values = get_column(key)
+        if values is not None:
+            columns[key] = values
+
+    times = get_column(_TIME_KEY)
+    if times is not None:
+        # round trip times are printed in up to microseconds:
+        # store them as integers if the conversion is lossless
+        scaled_times = [None if t is None else round(t * _TIME_SCALE) for t in times]
+        if all(
+            t is None or st / _TIME_SCALE == t  # type: ignore
+            for t, st in zip(times, scaled_times)
+        ):
+            columns["tq"] = True
+            columns["time"] = scaled_times
+        else:
+            columns["tq"] = False
+            columns["time"] = times
+
+    columns["dup"] = [i for i, reply in enumerate(icmp_replies) if reply.get(_DUPLICATE_KEY)]
+
+    return columns
+
+
+def _decode_replies(columns: Dict[str, Any], tz: Optional[tzinfo]) -> IcmpReplies:
+    num_replies = columns["n"]
+    icmp_replies: IcmpReplies = [{} for _ in range(num_replies)]
+
+    def set_column(key: str, values: Optional[Sequence]) -> None:
+        if values is None:
+            return
+
+        for reply, value in zip(icmp_replies, values):
+            if value is not None:
+                reply[key] = value
+
+    if "dst" in columns:
+        unique_destinations = columns["dst"]
+        if "dsti" in columns:
+            set_column(
+                _DESTINATION_KEY,
+                [None if i is None else unique_destinations[i] for i in columns["dsti"]],
+            )
+        else:
+            set_column(_DESTINATION_KEY, unique_destinations * num_replies)
+
+    if "bytes" in columns:
+        set_column(_BYTES_KEY, columns["bytes"])
+
+    if "ts" in columns:
+        values = _delta_decode(columns["ts"])
+        if tz is None and "tzos" in columns:
+            tz_list: List[Optional[tzinfo]] = [
+                None if offset is None else timezone(timedelta(seconds=offset))
+                for offset in columns["tzos"]
+            ]
+        else:
+            if tz is None and "tzo" in columns:
+                tz = timezone(timedelta(seconds=columns["tzo"]))
+            tz_list = [tz] * len(values)
+
+        set_column(
+            _TIMESTAMP_KEY,
+            [
+                None if value is None else _from_microseconds(value, value_tz)
+                for value, value_tz in zip(values, tz_list)
+            ],
+        )
+
+    if "seq" in columns:
+        set_column(_SEQUENCE_NO_KEY, _delta_decode(columns["seq"]))
+
+    if "ttl" in columns:
+        set_column(_TTL_KEY, columns["ttl"])
+
+    if "time" in columns:
+        if columns.get("tq"):
+            set_column(
+                _TIME_KEY,
+                [None if t is None else t / _TIME_SCALE for t in columns["time"]],
+            )
+        else:
+            set_column(_TIME_KEY, columns["time"])
+
+    duplicate_indices = set(columns.get("dup", []))
+    for i, reply in enumerate(icmp_replies):
+        reply[_DUPLICATE_KEY] = i in duplicate_indices
+
+    return icmp_replies
+
+
+def dumps_stats(stats: PingStats, include_icmp_replies: bool = True) -> bytes:
+    msgpack = _import_msgpack()
+
+    data: Dict[str, Any] = {
+        "v": SCHEMA_VERSION,
+        "s": [
+            stats.destination,
+            stats.packet_transmit,
+            stats.packet_receive,
+            stats.rtt_min,
+            stats.rtt_avg,
+            stats.rtt_max,
+            stats.rtt_mdev,
+            stats.packet_duplicate_count,
+        ],
+    }
+    if stats.parser_name is not None:
+        data["p"] = stats.parser_name
+    if include_icmp_replies and stats.icmp_replies:
+        data["r"] = _encode_replies(stats.icmp_replies)
+
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def loads_stats(data: bytes, tz: Optional[tzinfo] = None) -> PingStats:
+    msgpack = _import_msgpack()
+
+    try:
+        obj = msgpack.unpackb(data, raw=False, strict_map_key=False)
+    except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+        raise ValueError(f"invalid serialized ping statistics: {e}") from e
+
+    if not isinstance(obj, dict) or "v" not in obj or "s" not in obj:
+        raise ValueError("invalid serialized ping statistics")
+
+    version = obj["v"]
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"unsupported schema version: {version}")
+
+    (
+        destination,
+        packet_transmit,
+        packet_receive,
+        rtt_min,
+        rtt_avg,
+        rtt_max,
+        rtt_mdev,
+        duplicates,
+    ) = obj["s"]
+    icmp_replies = _decode_replies(obj["r"], tz) if "r" in obj else []
+
+    return PingStats(
+        destination=destination,
+        packet_transmit=packet_transmit,
+        packet_receive=packet_receive,
+        rtt_min=rtt_min,
+        rtt_avg=rtt_avg,
+        rtt_max=rtt_max,
+        rtt_mdev=rtt_mdev,
+        duplicates=duplicates,
+        icmp_replies=icmp_replies,
+        parser_name=obj.get("p"),
+    )
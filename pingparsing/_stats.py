@@ -2,11 +2,40 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
-from typing import Dict, Optional, Tuple, Union, cast
+from collections import namedtuple
+from datetime import tzinfo
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union, cast
 
 from ._typing import IcmpReplies
 
 
+if TYPE_CHECKING:
+    from ._sampling import RttSketch  # noqa
+    from ._sequence import SequenceStats  # noqa
+
+
+#: Names of the statistics fields in the order of :py:meth:`PingStats.as_dict`.
+STATS_FIELDS = (
+    "destination",
+    "packet_transmit",
+    "packet_receive",
+    "packet_loss_count",
+    "packet_loss_rate",
+    "rtt_min",
+    "rtt_avg",
+    "rtt_max",
+    "rtt_mdev",
+    "packet_duplicate_count",
+    "packet_duplicate_rate",
+)
+
+# creating a namedtuple class is expensive: create once and reuse it
+PingStatsTuple = namedtuple("PingStatsTuple", STATS_FIELDS)  # type: ignore
+
+_get_stats_fields = attrgetter(*STATS_FIELDS)
+
+
 class PingStats:
     def __init__(self, *args, **kwargs) -> None:
         self.__destination = kwargs.pop("destination", None)
@@ -19,6 +48,9 @@ class PingStats:
         self.__duplicates = kwargs.pop("duplicates", None)
 
         self.__icmp_replies = kwargs.pop("icmp_replies", [])
+        self.__rtt_sketch = kwargs.pop("rtt_sketch", None)
+        self.__sequence_stats = kwargs.pop("sequence_stats", None)
+        self.__parser_name = kwargs.pop("parser_name", None)
 
     @property
     def destination(self) -> str:
@@ -158,12 +190,51 @@ class PingStats:
             .. note:
                 ``time<1ms`` considered as ``time=1``
 
+        Only a sample of replies is included when parsed with ``max_replies``.
+
         Returns:
             |list| of |dict|:
         """
 
         return self.__icmp_replies
 
+    @property
+    def rtt_sketch(self) -> Optional["RttSketch"]:
+        """
+        Quantile sketch of round trip times of all of the non-duplicated ICMP replies.
+        Available when ICMP replies are sampled with ``max_replies``.
+
+        Returns:
+            |None| if ICMP replies are not sampled.
+        """
+
+        return self.__rtt_sketch
+
+    @property
+    def sequence_stats(self) -> Optional["SequenceStats"]:
+        """
+        Loss episodes (bursts of consecutive lost packets), out-of-order replies,
+        and gaps of ICMP sequence numbers. Analyzed from all of the ICMP replies
+        while parsing, even if ICMP replies are sampled with ``max_replies``.
+
+        Returns:
+            |None| if ICMP replies do not have sequence numbers.
+        """
+
+        return self.__sequence_stats
+
+    @property
+    def parser_name(self) -> Optional[str]:
+        """
+        Name of the parser that detected the format of the ``ping`` output
+        (e.g. ``Linux``, ``Windows``).
+
+        Returns:
+            |None| if the format is not detected.
+        """
+
+        return self.__parser_name
+
     def is_empty(self):
         return all(
             [
@@ -244,8 +315,88 @@ class PingStats:
             PingResult(destination='google.com', packet_transmit=60, packet_receive=60, packet_loss_rate=0.0, packet_loss_count=0, rtt_min=61.425, rtt_avg=99.731, rtt_max=212.597, rtt_mdev=27.566, packet_duplicate_rate=0.0, packet_duplicate_count=0)
         """  # noqa
 
-        from collections import namedtuple
+        return PingStatsTuple._make(_get_stats_fields(self))
+
+    @staticmethod
+    def rows(
+        stats_iter: Iterable["PingStats"], fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple]:
+        """
+        Export statistics of multiple results as rows (e.g. to write CSV files):
+        faster than calling :py:meth:`.as_dict`/:py:meth:`.as_tuple` for each result.
+
+        Args:
+            stats_iter: Results to export.
+            fields: Names of fields to export in the order. Defaults to all of the fields.
+
+        Returns:
+            Iterator of |tuple|: A row of values of ``fields`` for each result.
+
+        Examples:
+            >>> import csv
+            >>> import pingparsing
+            >>> fields = ["destination", "packet_loss_rate", "rtt_avg"]
+            >>> writer = csv.writer(f)
+            >>> writer.writerow(fields)
+            >>> writer.writerows(pingparsing.PingStats.rows(stats_list, fields=fields))
+        """
+
+        if fields is None:
+            return map(_get_stats_fields, stats_iter)
+
+        if not fields:
+            raise ValueError("fields must not be empty")
+        invalid_fields = [field for field in fields if field not in STATS_FIELDS]
+        if invalid_fields:
+            raise ValueError(f"unknown fields: {', '.join(invalid_fields)}")
+
+        get_fields = attrgetter(*fields)
+        if len(fields) == 1:
+            # attrgetter returns a value instead of a tuple for a single field
+            return ((get_fields(stats),) for stats in stats_iter)
+
+        return map(get_fields, stats_iter)
+
+    def to_bytes(self, include_icmp_replies: bool = True) -> bytes:
+        """
+        Serialize the statistics into a compact binary format (MessagePack).
+        ICMP replies are stored in columns, and sequence numbers/timestamps are delta-encoded.
+        :py:attr:`.rtt_sketch` and :py:attr:`.sequence_stats` are not serialized.
+        Requires the ``msgpack`` package.
+
+        Args:
+            include_icmp_replies:
+                Serialize :py:attr:`.icmp_replies` too if |True|.
+
+        Returns:
+            |bytes|: Serialized statistics.
+                Restore with :py:meth:`~pingparsing.PingStats.from_bytes`.
+        """
+
+        from ._serialization import dumps_stats
+
+        return dumps_stats(self, include_icmp_replies=include_icmp_replies)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, timezone: Optional[tzinfo] = None) -> "PingStats":
+        """
+        Deserialize statistics serialized by :py:meth:`~pingparsing.PingStats.to_bytes`.
+
+        Args:
+            data:
+                Serialized statistics.
+            timezone:
+                Time zone of timestamps of ICMP replies.
+                Defaults to the UTC offset of the serialized timestamps.
+
+        Returns:
+            :py:class:`~pingparsing.PingStats`: Deserialized statistics.
+
+        Raises:
+            ValueError:
+                If ``data`` is invalid or serialized with an unsupported schema version.
+        """
 
-        ping_result = self.as_dict()
+        from ._serialization import loads_stats
 
-        return namedtuple("PingStatsTuple", ping_result.keys())(**ping_result)  # type: ignore
+        return loads_stats(data, tz=timezone)
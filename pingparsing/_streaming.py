@@ -0,0 +1,338 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import math
+import time
+from datetime import datetime, tzinfo
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from ._capture import SamplingMethod
+from ._parser import IcmpReplyKey, LinuxPingParser, PingParser
+from ._sampling import IcmpReplySampler
+from ._sequence import SequenceAnalyzer
+from ._stats import PingStats
+from ._typing import IcmpReplies
+
+
+class PingStatsAggregator:
+    """
+    Aggregate ICMP replies into a :py:class:`~pingparsing.PingStats` incrementally,
+    without the statistics lines at the end of ``ping`` outputs.
+
+    Packets are counted by ICMP sequence numbers:
+    a sequence number is counted as transmitted when either a reply or
+    a ``no answer yet`` line (``ping -O``) is found,
+    and counted as received when a non-duplicate reply is found.
+
+    Args:
+        destination: destination of the ping. taken from replies if |None|.
+        max_replies:
+            maximum number of ICMP replies to keep. all of the replies are kept if |None|.
+        sampling: ``reservoir`` or ``tail``. how to sample replies when ``max_replies`` is set.
+    """
+
+    @property
+    def num_replies(self) -> int:
+        return self.__num_replies
+
+    @property
+    def sequence_numbers(self) -> Set[int]:
+        return self.__transmit_seqs
+
+    def __init__(
+        self,
+        destination: Optional[str] = None,
+        max_replies: Optional[int] = None,
+        sampling: str = SamplingMethod.RESERVOIR,
+    ) -> None:
+        if max_replies is not None and max_replies < 0:
+            raise ValueError("max_replies must be greater than or equal to zero")
+        if sampling not in SamplingMethod.LIST:
+            raise ValueError(f"unknown sampling method: {sampling}")
+
+        self.__destination = destination
+        self.__max_replies = max_replies
+        self.__sampling = sampling
+        self.reset()
+
+    def reset(self) -> None:
+        self.__icmp_replies: List[Dict] = []
+        self.__sampler: Optional[IcmpReplySampler] = None
+        if self.__max_replies is not None:
+            self.__sampler = IcmpReplySampler(self.__max_replies, sampling=self.__sampling)
+        self.__num_replies = 0
+        self.__sequence_analyzer = SequenceAnalyzer()
+        self.__transmit_seqs: Set[int] = set()
+        self.__receive_seqs: Set[int] = set()
+        self.__duplicates = 0
+        self.__rtt_count = 0
+        self.__rtt_sum = 0.0
+        self.__rtt_square_sum = 0.0
+        self.__rtt_min: Optional[float] = None
+        self.__rtt_max: Optional[float] = None
+
+    def add_reply(self, reply: Dict) -> None:
+        self.__num_replies += 1
+        if self.__sampler is None:
+            self.__icmp_replies.append(reply)
+        else:
+            self.__sampler.add(reply)
+        self.__sequence_analyzer.add(reply)
+
+        if self.__destination is None and reply.get(IcmpReplyKey.DESTINATION):
+            self.__destination = reply[IcmpReplyKey.DESTINATION]
+
+        seq = reply.get(IcmpReplyKey.SEQUENCE_NO)
+        if seq is not None:
+            self.__transmit_seqs.add(seq)
+
+        if IcmpReplyKey.TIME not in reply:
+            # no answer
+            return
+
+        # round trip times of duplicated replies are included as iputils ping does
+        if reply.get(IcmpReplyKey.DUPLICATE):
+            self.__duplicates += 1
+        elif seq is not None:
+            self.__receive_seqs.add(seq)
+
+        rtt = reply[IcmpReplyKey.TIME]
+        self.__rtt_count += 1
+        self.__rtt_sum += rtt
+        self.__rtt_square_sum += rtt * rtt
+        self.__rtt_min = rtt if self.__rtt_min is None else min(self.__rtt_min, rtt)
+        self.__rtt_max = rtt if self.__rtt_max is None else max(self.__rtt_max, rtt)
+
+    def to_stats(self) -> PingStats:
+        rtt_avg = rtt_mdev = None
+        if self.__rtt_count:
+            rtt_avg = self.__rtt_sum / self.__rtt_count
+            # the same definition as the mdev of iputils ping
+            rtt_mdev = math.sqrt(max(self.__rtt_square_sum / self.__rtt_count - rtt_avg**2, 0))
+
+        icmp_replies: IcmpReplies
+        if self.__sampler is None:
+            icmp_replies = self.__icmp_replies
+            rtt_sketch = None
+        else:
+            icmp_replies = self.__sampler.get_replies()
+            rtt_sketch = self.__sampler.rtt_sketch
+
+        sequence_stats = None
+        if self.__sequence_analyzer.num_sequences:
+            sequence_stats = self.__sequence_analyzer.get_stats()
+
+        return PingStats(
+            destination=self.__destination,
+            packet_transmit=len(self.__transmit_seqs),
+            packet_receive=len(self.__receive_seqs),
+            rtt_min=_round(self.__rtt_min),
+            rtt_avg=_round(rtt_avg),
+            rtt_max=_round(self.__rtt_max),
+            rtt_mdev=_round(rtt_mdev),
+            duplicates=self.__duplicates,
+            icmp_replies=icmp_replies,
+            rtt_sketch=rtt_sketch,
+            sequence_stats=sequence_stats,
+        )
+
+
+class PingStreamParser:
+    """
+    Parse ``ping`` outputs line by line and slice them into time windows,
+    to get :py:class:`~pingparsing.PingStats` periodically from
+    a long-running ``ping`` process (e.g. ``ping -D -O <destination>`` on Linux).
+
+    Windows are aligned to multiples of ``window`` seconds of the UNIX time.
+    The time of a line is taken from its timestamp (``ping -D``),
+    or the arrival time of the line if the line does not have a timestamp.
+    A window is closed when a line of the next window arrives,
+    or by :py:meth:`flush_expired` when the window has elapsed without new lines.
+
+    Args:
+        window: length of a time window [sec].
+        destination: destination of the ping. taken from replies if |None|.
+        parser: parser for ICMP reply lines. Defaults to the Linux ``ping`` parser.
+        timezone: time zone for timestamps.
+        clock: function that returns the current UNIX time.
+        max_replies:
+            maximum number of ICMP replies to keep for each window.
+            all of the replies are kept if |None|.
+        sampling: ``reservoir`` or ``tail``. how to sample replies when ``max_replies`` is set.
+
+    Examples:
+        >>> import pingparsing
+        >>> stream_parser = pingparsing.PingStreamParser(window=10)
+        >>> for stats in stream_parser.iter_stats(lines):
+        ...     print(stats.as_dict())
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        destination: Optional[str] = None,
+        parser: Optional[PingParser] = None,
+        timezone: Optional[tzinfo] = None,
+        clock: Callable[[], float] = time.time,
+        max_replies: Optional[int] = None,
+        sampling: str = SamplingMethod.RESERVOIR,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("window must be greater than zero")
+
+        self.window = window
+        self.__parser = parser if parser is not None else LinuxPingParser(timezone=timezone)
+        self.__clock = clock
+        self.__aggregator = PingStatsAggregator(destination, max_replies, sampling)
+        self.__window_start: Optional[float] = None
+        self.__prev_window_seqs: Set[int] = set()
+
+    def feed(self, line: str) -> List[PingStats]:
+        """
+        Parse a line.
+
+        Returns:
+            Statistics of windows closed by the line.
+        """
+
+        reply = self.__parser._parse_icmp_reply_line(line)
+        if reply is None:
+            return []
+
+        timestamp = reply.get(IcmpReplyKey.TIMESTAMP)
+        if isinstance(timestamp, datetime):
+            line_time = timestamp.timestamp()
+        else:
+            line_time = self.__clock()
+
+        window_start = math.floor(line_time / self.window) * self.window
+        closed = []
+
+        if self.__window_start is None:
+            self.__window_start = window_start
+        elif window_start > self.__window_start:
+            stats = self.flush()
+            if stats is not None:
+                closed.append(stats)
+            self.__window_start = window_start
+
+        if reply.get(IcmpReplyKey.SEQUENCE_NO) in self.__prev_window_seqs:
+            # a late reply for a packet counted in the previous window
+            return closed
+
+        self.__aggregator.add_reply(reply)
+
+        return closed
+
+    def flush(self) -> Optional[PingStats]:
+        """
+        Close the current window.
+
+        Returns:
+            Statistics of the current window. |None| if the window is empty.
+        """
+
+        if not self.__aggregator.num_replies:
+            return None
+
+        stats = self.__aggregator.to_stats()
+        self.__prev_window_seqs = set(self.__aggregator.sequence_numbers)
+        self.__aggregator.reset()
+
+        return stats
+
+    def flush_expired(self) -> Optional[PingStats]:
+        """
+        Close the current window if the end of the window has passed by the clock.
+        Call this when no lines arrive for a while (e.g. at read timeouts), so that
+        the window of an idle input is output without waiting for the next line.
+
+        Returns:
+            Statistics of the current window.
+            |None| if the window is empty or has not been elapsed yet.
+        """
+
+        if self.__window_start is None:
+            return None
+
+        if self.__clock() < self.__window_start + self.window:
+            return None
+
+        # the next line starts a new window
+        self.__window_start = None
+
+        return self.flush()
+
+    def iter_stats(self, lines: Iterable[str]) -> Iterator[PingStats]:
+        """
+        Parse lines and yield statistics for each window.
+        The last window is yielded when the lines are exhausted.
+        """
+
+        for line in lines:
+            yield from self.feed(line)
+
+        stats = self.flush()
+        if stats is not None:
+            yield stats
+
+    def follow(
+        self,
+        file_path: str,
+        poll_interval: float = 1.0,
+        from_start: bool = True,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[PingStats]:
+        """
+        Follow a growing log file of ``ping`` outputs (like ``tail -F``) and
+        yield statistics for each window.
+        Only newly appended bytes of the file are read on each poll.
+        Rotations of the file are detected by changes of the inode,
+        and truncations are detected by the file size smaller than the read offset.
+        When a poll finds no new lines, the current window is yielded if it has elapsed
+        (see :py:meth:`flush_expired`).
+
+        Args:
+            file_path: Path to the log file.
+            poll_interval: Interval [sec] to poll the file when no new lines are found.
+            from_start: Parse existing lines of the file if |True|.
+            stop:
+                Function that returns |True| to stop following.
+                The last window is yielded when stopped. Follows forever if |None|.
+
+        Examples:
+            >>> import pingparsing
+            >>> stream_parser = pingparsing.PingStreamParser(window=60)
+            >>> for stats in stream_parser.follow("ping.log"):
+            ...     print(stats.as_dict())
+        """
+
+        from ._follow import FileFollower
+
+        with FileFollower(file_path, poll_interval=poll_interval, from_start=from_start) as f:
+            while True:
+                lines = f.read_lines()
+                for line in lines:
+                    yield from self.feed(line)
+
+                if stop is not None and stop():
+                    break
+
+                if not lines:
+                    stats = self.flush_expired()
+                    if stats is not None:
+                        yield stats
+
+                    f.sleep()
+
+        stats = self.flush()
+        if stats is not None:
+            yield stats
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return None
+
+    return round(value, 3)
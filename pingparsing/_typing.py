@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Dict, Sequence, Union
+from typing import TYPE_CHECKING, Dict, Sequence, Union
 
-import humanreadable as hr
 
+if TYPE_CHECKING:
+    import humanreadable as hr  # noqa
 
-TimeArg = Union[hr.Time, int, str, None]
+
+TimeArg = Union["hr.Time", int, str, None]
 IcmpReplies = Sequence[Dict[str, Union[str, bool, float, int, datetime]]]
 PingAddOpts = Union[str, Sequence[str]]
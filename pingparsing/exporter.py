@@ -0,0 +1,500 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+
+Prometheus exporter: sends pings to the targets periodically and serves the latest
+results at ``/metrics``.
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from textwrap import dedent
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
+
+from .__version__ import __version__
+from ._logger import logger
+from ._pingparsing import PingParsing
+from ._pingtransmitter import PingTransmitter
+from ._scheduler import DEFAULT_MAX_CONCURRENCY, ProbeScheduler
+from ._stats import PingStats
+from ._typing import TimeArg
+from .error import ParseError
+
+
+DEFAULT_PORT = 9346
+DEFAULT_INTERVAL = 60.0
+DEFAULT_COUNT = 10
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+QUANTILES = (0.5, 0.9, 0.99)
+
+TransmitterFactory = Callable[[str], PingTransmitter]
+
+_METRIC_DEFINITIONS: Tuple[Tuple[str, str, Callable[[PingStats], Optional[float]]], ...] = (
+    (
+        "ping_packets_transmitted",
+        "Number of packets transmitted.",
+        lambda stats: stats.packet_transmit,
+    ),
+    (
+        "ping_packets_received",
+        "Number of packets received.",
+        lambda stats: stats.packet_receive,
+    ),
+    (
+        "ping_packet_loss_rate",
+        "Percentage of packet loss.",
+        lambda stats: stats.packet_loss_rate,
+    ),
+    (
+        "ping_packet_duplicates",
+        "Number of duplicated packets.",
+        lambda stats: stats.packet_duplicate_count,
+    ),
+    (
+        "ping_rtt_min_milliseconds",
+        "Minimum round trip time.",
+        lambda stats: stats.rtt_min,
+    ),
+    (
+        "ping_rtt_avg_milliseconds",
+        "Average round trip time.",
+        lambda stats: stats.rtt_avg,
+    ),
+    (
+        "ping_rtt_max_milliseconds",
+        "Maximum round trip time.",
+        lambda stats: stats.rtt_max,
+    ),
+    (
+        "ping_rtt_mdev_milliseconds",
+        "Standard deviation of round trip times.",
+        lambda stats: stats.rtt_mdev,
+    ),
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+def calc_rtt_quantiles(
+    stats: PingStats, quantiles: Sequence[float] = QUANTILES
+) -> Dict[float, float]:
+    """
+    Calculate quantiles of round trip times from ICMP replies of a ping result
+    by the nearest-rank method.
+    Quantiles are estimated by the sketch of the result if ICMP replies are sampled.
+    """
+
+    rtt_sketch = stats.rtt_sketch
+    if rtt_sketch is not None:
+        if not rtt_sketch.count:
+            return {}
+
+        return {q: cast(float, rtt_sketch.quantile(q)) for q in quantiles}
+
+    rtts: List[float] = sorted(
+        cast(float, reply["time"])
+        for reply in stats.icmp_replies
+        if "time" in reply and not reply.get("duplicate")
+    )
+    if not rtts:
+        return {}
+
+    return {q: rtts[max(0, math.ceil(q * len(rtts)) - 1)] for q in quantiles}
+
+
+def render_metrics(
+    stats_map: Mapping[str, PingStats],
+    up_map: Optional[Mapping[str, bool]] = None,
+    updated_at_map: Optional[Mapping[str, float]] = None,
+) -> str:
+    """
+    Render ping results in the Prometheus text exposition format.
+
+    Args:
+        stats_map: ping results for each destination.
+        up_map: whether the last ping succeeded for each destination.
+        updated_at_map: UNIX time of the last update for each destination.
+    """
+
+    lines: List[str] = []
+    labels = {dest: f'destination="{_escape_label_value(dest)}"' for dest in stats_map}
+
+    if up_map is not None:
+        lines.append("# HELP ping_up Whether the last ping execution succeeded.")
+        lines.append("# TYPE ping_up gauge")
+        for dest, is_up in up_map.items():
+            label = f'destination="{_escape_label_value(dest)}"'
+            lines.append(f"ping_up{{{label}}} {1 if is_up else 0}")
+
+    if updated_at_map is not None:
+        lines.append("# HELP ping_last_update_timestamp_seconds UNIX time of the last ping result.")
+        lines.append("# TYPE ping_last_update_timestamp_seconds gauge")
+        for dest, updated_at in updated_at_map.items():
+            label = f'destination="{_escape_label_value(dest)}"'
+            lines.append(
+                f"ping_last_update_timestamp_seconds{{{label}}} {_format_value(updated_at)}"
+            )
+
+    for name, help_text, getter in _METRIC_DEFINITIONS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for dest, stats in stats_map.items():
+            value = getter(stats)
+            if value is None:
+                continue
+
+            lines.append(f"{name}{{{labels[dest]}}} {_format_value(value)}")
+
+    name = "ping_rtt_milliseconds"
+    lines.append(f"# HELP {name} Quantiles of round trip times of ICMP replies.")
+    lines.append(f"# TYPE {name} gauge")
+    for dest, stats in stats_map.items():
+        for q, value in calc_rtt_quantiles(stats).items():
+            lines.append(f'{name}{{{labels[dest]},quantile="{q}"}} {_format_value(value)}')
+
+    lines.append("")
+
+    return "\n".join(lines)
+
+
+class PingExporter:
+    """
+    Send pings to the targets periodically in background threads and keep
+    the latest :py:class:`~pingparsing.PingStats` for each target.
+    The metrics text is re-rendered when results are updated, so that
+    :py:attr:`.metrics` never waits for ``ping`` executions.
+
+    :py:meth:`.start` spreads pings of the targets across the interval by
+    :py:class:`~pingparsing.ProbeScheduler` instead of sending them all at once.
+
+    Args:
+        targets: destinations to send pings.
+        interval: interval between ping cycles [sec].
+        count: number of ICMP packets to send for each target in a cycle.
+        deadline: timeout before ``ping`` exits.
+        timeout: time to wait for a response per packet.
+        max_workers: maximum number of concurrent ``ping`` executions.
+        transmitter_factory: a function that creates a
+            :py:class:`~pingparsing.PingTransmitter` for a destination.
+        max_pps: global budget of ICMP packets per second. unlimited if |None|.
+        jitter: ratio of the interval to randomly delay each ping ``[0, 1)``.
+    """
+
+    @property
+    def metrics(self) -> bytes:
+        """
+        Pre-rendered metrics in the Prometheus text exposition format.
+        """
+
+        return self.__metrics
+
+    @property
+    def stats_map(self) -> Dict[str, PingStats]:
+        with self.__lock:
+            return dict(self.__stats_map)
+
+    def __init__(
+        self,
+        targets: Sequence[str],
+        interval: float = DEFAULT_INTERVAL,
+        count: Optional[int] = DEFAULT_COUNT,
+        deadline: TimeArg = None,
+        timeout: TimeArg = None,
+        max_workers: Optional[int] = None,
+        transmitter_factory: Optional[TransmitterFactory] = None,
+        render_interval: float = 1.0,
+        max_pps: Optional[float] = None,
+        jitter: float = 0.1,
+    ) -> None:
+        self.targets = list(targets)
+        self.interval = interval
+        self.count = count
+        self.deadline = deadline
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.render_interval = render_interval
+        self.max_pps = max_pps
+        self.jitter = jitter
+        self.__transmitter_factory = transmitter_factory or self.__make_transmitter
+
+        self.__lock = threading.Lock()
+        self.__transmitter_map: Dict[str, PingTransmitter] = {}
+        self.__stats_map: Dict[str, PingStats] = {}
+        self.__up_map: Dict[str, bool] = {}
+        self.__updated_at_map: Dict[str, float] = {}
+        self.__metrics = render_metrics({}).encode("utf-8")
+        self.__is_updated = False
+        self.__last_render_time = time.monotonic()
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    def run_cycle(self) -> None:
+        """
+        Send pings to all of the targets once and update the results.
+        """
+
+        with futures.ThreadPoolExecutor(self.max_workers) as executor:
+            future_map = {executor.submit(self.__ping, target): target for target in self.targets}
+
+            for future in futures.as_completed(future_map):
+                self.__update(future_map[future], future.result())
+                self.__render_if_updated()
+
+        self.render()
+
+    def render(self) -> None:
+        with self.__lock:
+            text = render_metrics(self.__stats_map, self.__up_map, self.__updated_at_map)
+            self.__is_updated = False
+            self.__last_render_time = time.monotonic()
+
+        self.__metrics = text.encode("utf-8")
+
+    def start(self) -> None:
+        """
+        Start sending pings periodically in a background thread.
+        """
+
+        if self.__thread is not None:
+            return
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, name="ping-exporter", daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self.__stop_event.set()
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def make_server(self, host: str = "", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+        """
+        Make an HTTP server that serves :py:attr:`.metrics` at ``/metrics``.
+        """
+
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = exporter.metrics
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.opt(lazy=True).debug("{}", lambda: format % args)
+
+        return ThreadingHTTPServer((host, port), MetricsHandler)
+
+    def __run(self) -> None:
+        scheduler = ProbeScheduler(
+            self.targets,
+            self.__ping,
+            interval=self.interval,
+            packets_per_probe=self.count or 1,
+            max_pps=self.max_pps,
+            max_concurrency=self.max_workers or DEFAULT_MAX_CONCURRENCY,
+            jitter=self.jitter,
+            on_result=self.__update,
+        )
+
+        try:
+            scheduler.run(
+                self.__stop_event,
+                max_wait=self.render_interval,
+                tick=self.__render_if_updated,
+            )
+        finally:
+            scheduler.shutdown(wait=False)
+            self.render()
+
+    def __update(self, target: str, stats: Optional[PingStats]) -> None:
+        with self.__lock:
+            self.__up_map[target] = stats is not None
+            if stats is not None:
+                self.__stats_map[target] = stats
+                self.__updated_at_map[target] = time.time()
+            self.__is_updated = True
+
+    def __render_if_updated(self) -> None:
+        with self.__lock:
+            if not self.__is_updated:
+                return
+            if time.monotonic() - self.__last_render_time < self.render_interval:
+                return
+
+        self.render()
+
+    def __make_transmitter(self, destination: str) -> PingTransmitter:
+        # reuse a transmitter for each target so that the ping command is built only once
+        with self.__lock:
+            transmitter = self.__transmitter_map.get(destination)
+            if transmitter is None:
+                transmitter = PingTransmitter()
+                transmitter.destination = destination
+                self.__transmitter_map[destination] = transmitter
+
+        transmitter.count = self.count
+        transmitter.deadline = self.deadline
+        transmitter.timeout = self.timeout
+
+        return transmitter
+
+    def __ping(self, destination: str) -> Optional[PingStats]:
+        from subprocrunner import CommandError
+
+        try:
+            result = self.__transmitter_factory(destination).ping()
+        except (CommandError, ValueError) as e:
+            logger.error("failed to ping to {}: {}", destination, e)
+            return None
+
+        if result.returncode != 0 and result.stderr:
+            logger.error("{}: {}", destination, result.stderr)
+
+        try:
+            return PingParsing().parse(result)
+        except (ParseError, ValueError) as e:
+            logger.error("failed to parse a ping result of {}: {}", destination, e)
+            return None
+
+
+def parse_option(args: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="pingparsing-exporter",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description="Send pings to the targets periodically and export the results "
+        "as Prometheus metrics.",
+        epilog=dedent(
+            """\
+            Documentation: https://pingparsing.rtfd.io/
+            Issue tracker: https://github.com/thombashi/pingparsing/issues
+            """
+        ),
+    )
+    parser.add_argument("-V", "--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("targets", nargs="+", help="Destinations to send ping.")
+    parser.add_argument(
+        "--host",
+        default="",
+        help="Address to listen for HTTP requests. Defaults to all of the interfaces.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="Port to listen for HTTP requests. (default= %(default)s)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help="Interval seconds between ping cycles. (default= %(default)s)",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Maximum number of concurrent ping executions.",
+    )
+    parser.add_argument(
+        "--max-pps",
+        type=float,
+        help="Global budget of ICMP packets per second. Defaults to unlimited.",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.1,
+        help="Ratio of the interval to randomly delay each ping. (default= %(default)s)",
+    )
+
+    group = parser.add_argument_group("Ping Options")  # type: ignore
+    group.add_argument(
+        "-c",
+        "--count",
+        type=int,
+        default=DEFAULT_COUNT,
+        help="Number of ICMP packets to send for each cycle. (default= %(default)s)",
+    )
+    group.add_argument("-w", "--deadline", type=str, help="Timeout before ping exits.")
+    group.add_argument("--timeout", type=str, help="Time to wait for a response per packet.")
+
+    loglevel_dest = "log_level"
+    group = parser.add_mutually_exclusive_group()  # type: ignore
+    group.add_argument(
+        "--debug",
+        dest=loglevel_dest,
+        action="store_const",
+        const="DEBUG",
+        default="INFO",
+        help="for debug print.",
+    )
+    group.add_argument(
+        "--quiet",
+        dest=loglevel_dest,
+        action="store_const",
+        const="QUIET",
+        default="INFO",
+        help="suppress execution log messages.",
+    )
+
+    return parser.parse_args(args)
+
+
+def main() -> int:
+    from .__main__ import initialize_logger
+
+    options = parse_option()
+
+    initialize_logger(options.log_level)
+
+    exporter = PingExporter(
+        options.targets,
+        interval=options.interval,
+        count=options.count,
+        deadline=options.deadline,
+        timeout=options.timeout,
+        max_workers=options.max_workers,
+        max_pps=options.max_pps,
+        jitter=options.jitter,
+    )
+    server = exporter.make_server(options.host, options.port)
+    logger.info("serving metrics at http://{}:{}/metrics", options.host, server.server_port)
+
+    exporter.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        exporter.stop()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
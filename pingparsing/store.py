@@ -0,0 +1,384 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+
+SQLite store of ping results: persists summaries and ICMP replies of
+:py:class:`~pingparsing.PingStats` to a local database file, and queries them.
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
+
+from ._serialization import _to_microseconds
+from ._stats import PingStats
+
+
+DEFAULT_BATCH_SIZE = 10000
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    destination TEXT,
+    timestamp REAL NOT NULL,
+    packet_transmit INTEGER,
+    packet_receive INTEGER,
+    packet_loss_count INTEGER,
+    packet_loss_rate REAL,
+    rtt_min REAL,
+    rtt_avg REAL,
+    rtt_max REAL,
+    rtt_mdev REAL,
+    packet_duplicate_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_destination_timestamp ON results (destination, timestamp);
+CREATE TABLE IF NOT EXISTS replies (
+    result_id INTEGER NOT NULL REFERENCES results (id),
+    destination TEXT,
+    timestamp REAL NOT NULL,
+    icmp_seq INTEGER,
+    ttl INTEGER,
+    bytes INTEGER,
+    time REAL,
+    duplicate INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_destination_timestamp ON replies (destination, timestamp);
+CREATE INDEX IF NOT EXISTS replies_result_id ON replies (result_id);
+"""
+
+_INSERT_RESULT = """\
+INSERT INTO results (
+    destination,
+    timestamp,
+    packet_transmit,
+    packet_receive,
+    packet_loss_count,
+    packet_loss_rate,
+    rtt_min,
+    rtt_avg,
+    rtt_max,
+    rtt_mdev,
+    packet_duplicate_count
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_INSERT_REPLY = "INSERT INTO replies VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def _to_unix_time(value: Any) -> Optional[float]:
+    if isinstance(value, datetime):
+        return _to_microseconds(value) / 1_000_000
+
+    return None
+
+
+def _to_reply_time(value: Any, default: float) -> float:
+    unix_time = _to_unix_time(value)
+    if unix_time is None:
+        return default
+
+    return unix_time
+
+
+class PingStore:
+    """
+    Store ping results to a SQLite database.
+
+    The database is opened in the WAL mode so that it can be read while writing.
+    Results are buffered and inserted in a transaction
+    when the number of buffered rows reaches ``batch_size``,
+    or when :py:meth:`flush` / :py:meth:`close` is called.
+    IDs of results are assigned by SQLite when the results are inserted,
+    so that multiple stores can write to the same database.
+
+    A result is stored as a row of the ``results`` table and ICMP replies of the result
+    are stored as rows of the ``replies`` table. Both tables are indexed on
+    ``(destination, timestamp)``, where ``timestamp`` is a UNIX time.
+
+    A store is not thread-safe: use a store for each thread.
+
+    Args:
+        path: Path to the database file. ``:memory:`` for an in-memory database.
+        batch_size: Number of rows to buffer before inserting them.
+
+    Examples:
+        >>> from pingparsing.store import PingStore
+        >>> with PingStore("results.db") as store:
+        ...     store.add(stats)
+        ...     store.flush()
+        ...     store.aggregate(window=60)
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.__con = sqlite3.connect(path, isolation_level=None)
+        self.__con.execute("PRAGMA journal_mode=WAL")
+        self.__con.execute("PRAGMA synchronous=NORMAL")
+        self.__con.executescript(_SCHEMA)
+
+        # pairs of a result row and rows of its replies (without the result ID)
+        self.__rows: List[Tuple[Tuple, List[Tuple]]] = []
+        self.__num_rows = 0
+
+    def __enter__(self) -> "PingStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def add(self, stats: PingStats, timestamp: Optional[float] = None) -> List[int]:
+        """
+        Add a result to the buffer.
+
+        Args:
+            stats: Result to store.
+            timestamp:
+                UNIX time of the result. Defaults to the timestamp of the first ICMP reply,
+                or the current time if the replies do not have timestamps.
+
+        Returns:
+            |list| of |int|: IDs of results inserted by the addition
+            (when the buffer reached ``batch_size``). Empty if the result is only buffered.
+        """
+
+        icmp_replies = stats.icmp_replies
+
+        if timestamp is None:
+            if icmp_replies:
+                timestamp = _to_unix_time(icmp_replies[0].get("timestamp"))
+            if timestamp is None:
+                timestamp = time.time()
+
+        destination = stats.destination
+        result_row = (
+            destination,
+            timestamp,
+            stats.packet_transmit,
+            stats.packet_receive,
+            stats.packet_loss_count,
+            stats.packet_loss_rate,
+            stats.rtt_min,
+            stats.rtt_avg,
+            stats.rtt_max,
+            stats.rtt_mdev,
+            stats.packet_duplicate_count,
+        )
+        reply_rows = [
+            (
+                destination,
+                _to_reply_time(reply.get("timestamp"), timestamp),
+                reply.get("icmp_seq"),
+                reply.get("ttl"),
+                reply.get("bytes"),
+                reply.get("time"),
+                1 if reply.get("duplicate") else 0,
+            )
+            for reply in icmp_replies
+        ]
+        self.__rows.append((result_row, reply_rows))
+        self.__num_rows += 1 + len(reply_rows)
+
+        if self.__num_rows >= self.batch_size:
+            return self.flush()
+
+        return []
+
+    def add_all(self, stats_iter: Iterable[PingStats]) -> List[int]:
+        """
+        Add results and insert them to the database.
+
+        Returns:
+            |list| of |int|: IDs of the results in the order of the inputs.
+            Includes IDs of results that had been buffered before the call.
+        """
+
+        result_ids = []
+        for stats in stats_iter:
+            result_ids.extend(self.add(stats))
+        result_ids.extend(self.flush())
+
+        return result_ids
+
+    def flush(self) -> List[int]:
+        """
+        Insert buffered results to the database in a transaction.
+        The buffer is cleared even if the insertion failed: the transaction is rolled back
+        and the buffered results are discarded, so that later flushes do not fail again.
+
+        Returns:
+            |list| of |int|: IDs of the inserted results in the order of the additions.
+        """
+
+        if not self.__rows:
+            return []
+
+        rows = self.__rows
+        self.__rows = []
+        self.__num_rows = 0
+
+        result_ids = []
+        with self.__con:
+            cursor = self.__con.cursor()
+            cursor.execute("BEGIN")
+            for result_row, reply_rows in rows:
+                cursor.execute(_INSERT_RESULT, result_row)
+                result_id = cast(int, cursor.lastrowid)
+                cursor.executemany(
+                    _INSERT_REPLY, [(result_id,) + reply_row for reply_row in reply_rows]
+                )
+                result_ids.append(result_id)
+
+        return result_ids
+
+    def close(self) -> None:
+        self.flush()
+        self.__con.close()
+
+    def get_results(
+        self,
+        destination: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get stored results. Buffered results are flushed before the query.
+
+        Args:
+            destination: Destination to get. All of the destinations if |None|.
+            start: Start of the time range (UNIX time, inclusive).
+            end: End of the time range (UNIX time, exclusive).
+
+        Returns:
+            |list| of |dict|: Results ordered by timestamps.
+        """
+
+        where, params = self.__make_where(destination, start, end)
+
+        return self.__query(f"SELECT * FROM results{where} ORDER BY timestamp, id", params)
+
+    def aggregate(
+        self,
+        window: float,
+        destination: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate stored results into time windows for each destination.
+
+        Args:
+            window: Length of a time window [sec]. Windows are aligned to multiples of the length.
+            destination: Destination to aggregate. All of the destinations if |None|.
+            start: Start of the time range (UNIX time, inclusive).
+            end: End of the time range (UNIX time, exclusive).
+
+        Returns:
+            |list| of |dict|: Aggregates ordered by windows and destinations:
+            ``window_start``, ``destination``, ``num_results``, ``packet_transmit``,
+            ``packet_receive``, ``packet_loss_rate``, ``rtt_min``,
+            ``rtt_avg`` (weighted by the number of received packets), ``rtt_max``.
+        """
+
+        if window <= 0:
+            raise ValueError("window must be greater than zero")
+
+        where, params = self.__make_where(destination, start, end)
+        rows = self.__query(
+            f"""
+            SELECT
+                CAST(timestamp / ? AS INTEGER) * ? AS window_start,
+                destination,
+                COUNT(*) AS num_results,
+                SUM(packet_transmit) AS packet_transmit,
+                SUM(packet_receive) AS packet_receive,
+                MIN(rtt_min) AS rtt_min,
+                SUM(rtt_avg * packet_receive)
+                    / SUM(CASE WHEN rtt_avg IS NOT NULL THEN packet_receive END) AS rtt_avg,
+                MAX(rtt_max) AS rtt_max
+            FROM results{where}
+            GROUP BY window_start, destination
+            ORDER BY window_start, destination
+            """,
+            (window, window) + params,
+        )
+
+        for row in rows:
+            transmit, receive = row["packet_transmit"], row["packet_receive"]
+            row["packet_loss_rate"] = (
+                (transmit - receive) / transmit * 100 if transmit and receive is not None else None
+            )
+
+        return rows
+
+    def aggregate_replies(
+        self,
+        window: float,
+        destination: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate stored ICMP replies into time windows for each destination.
+        Arguments are the same as :py:meth:`aggregate`.
+
+        Returns:
+            |list| of |dict|: Aggregates ordered by windows and destinations:
+            ``window_start``, ``destination``, ``num_replies``,
+            ``num_answered`` (replies with round trip times), ``num_duplicates``,
+            ``rtt_min``, ``rtt_avg``, ``rtt_max``.
+        """
+
+        if window <= 0:
+            raise ValueError("window must be greater than zero")
+
+        where, params = self.__make_where(destination, start, end)
+
+        return self.__query(
+            f"""
+            SELECT
+                CAST(timestamp / ? AS INTEGER) * ? AS window_start,
+                destination,
+                COUNT(*) AS num_replies,
+                COUNT(time) AS num_answered,
+                SUM(duplicate) AS num_duplicates,
+                MIN(time) AS rtt_min,
+                AVG(time) AS rtt_avg,
+                MAX(time) AS rtt_max
+            FROM replies{where}
+            GROUP BY window_start, destination
+            ORDER BY window_start, destination
+            """,
+            (window, window) + params,
+        )
+
+    def __query(self, sql: str, params: Sequence) -> List[Dict[str, Any]]:
+        self.flush()
+
+        cursor = self.__con.execute(sql, params)
+        columns = [desc[0] for desc in cursor.description]
+
+        return [dict(zip(columns, row)) for row in cursor]
+
+    @staticmethod
+    def __make_where(
+        destination: Optional[str], start: Optional[float], end: Optional[float]
+    ) -> Tuple[str, Tuple]:
+        conditions = []
+        params: Tuple = ()
+
+        if destination is not None:
+            conditions.append("destination = ?")
+            params += (destination,)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params += (start,)
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params += (end,)
+
+        if not conditions:
+            return ("", params)
+
+        return (" WHERE " + " AND ".join(conditions), params)
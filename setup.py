@@ -59,7 +59,7 @@ setuptools.setup(
     license=pkg_info["__license__"],
     long_description=long_description,
     long_description_content_type="text/x-rst",
-    packages=setuptools.find_packages(exclude=["test*"]),
+    packages=setuptools.find_packages(exclude=["benchmarks*", "test*"]),
     package_data={MODULE_NAME: ["py.typed"]},
     project_urls={
         "Changelog": f"{REPOSITORY_URL:s}/blob/master/CHANGELOG.md",
@@ -72,7 +72,10 @@ setuptools.setup(
     extras_require={
         "docs": docs_requires,
         "test": tests_requires,
+        "arrow": ["pyarrow>=7"],
         "cli": CLI_OPT_REQUIRES,
+        "msgpack": ["msgpack>=1,<2"],
+        "zstd": ["zstandard"],
     },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -103,5 +106,10 @@ setuptools.setup(
         "Typing :: Typed",
     ],
     cmdclass=get_release_command_class(),
-    entry_points={"console_scripts": ["pingparsing=pingparsing.__main__:main"]},
+    entry_points={
+        "console_scripts": [
+            "pingparsing=pingparsing.__main__:main",
+            "pingparsing-exporter=pingparsing.exporter:main",
+        ]
+    },
 )
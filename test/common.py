@@ -2,12 +2,15 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import io
+import time
 from collections import namedtuple
 
 import pytest
 import pytz
 
-from pingparsing import PingParsing
+from pingparsing import PingParsing, PingStats, PingTransmitter
+from pingparsing._generator import OsType, generate_ping_output
 
 
 @pytest.fixture
@@ -15,4 +18,158 @@ def ping_parser():
     return PingParsing(timezone=pytz.UTC)
 
 
+@pytest.fixture
+def local_tz_tokyo(monkeypatch):
+    """
+    Set the local time zone of the process to Asia/Tokyo (UTC+9).
+    """
+
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
 PingTestData = namedtuple("PingTestData", "value expected replies")
+
+
+class FakeClock:
+    """
+    Clock that returns ``now`` until it is advanced.
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, sec):
+        self.now += sec
+
+
+class FakePopen:
+    """
+    Fake ``subprocess.Popen`` that outputs ``text`` instead of running a command.
+    Subclasses set the outputs and the behavior of the process.
+    """
+
+    instances = []
+
+    #: stdout of the process
+    text = ""
+
+    #: stderr of the process
+    stderr_text = ""
+
+    #: exit code of the process
+    exit_code = 0
+
+    #: the process keeps running until terminated (e.g. a continuous ping) if |True|
+    continuous = False
+
+    def __init__(self, command, stderr=None, **kwargs):
+        self.command = command
+        self.stdout = io.StringIO(self.text)
+        if hasattr(stderr, "write"):
+            # stderr is redirected to a file
+            if "b" in stderr.mode:
+                stderr.write(self.stderr_text.encode("utf-8"))
+            else:
+                stderr.write(self.stderr_text)
+            self.stderr = None
+        else:
+            self.stderr = io.StringIO(self.stderr_text)
+        self.returncode = None if self.continuous else self.exit_code
+        self.terminated = False
+        self.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.wait()
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.terminated = True
+        self.returncode = -15
+
+    def wait(self):
+        if self.returncode is None:
+            self.returncode = self.exit_code
+
+        return self.returncode
+
+
+def make_transmitter(destination="192.168.0.1", count=10, deadline=None, backend=None, **kwargs):
+    transmitter = PingTransmitter()
+    transmitter.destination = destination
+    transmitter.count = count
+    transmitter.deadline = deadline
+    transmitter.backend = backend
+    for name, value in kwargs.items():
+        setattr(transmitter, name, value)
+
+    return transmitter
+
+
+def make_stats_list():
+    """
+    Results parsed from generated outputs of each OS, with timestamps, losses, and duplicates.
+    """
+
+    return [
+        PingParsing().parse(
+            generate_ping_output(
+                os_type, count=20, timestamp=True, loss_rate=0.1, duplicate_rate=0.1, seed=i
+            ).text
+        )
+        for i, os_type in enumerate(OsType.LIST)
+    ]
+
+
+def make_summary_stats_list():
+    """
+    Results without ICMP replies, including an empty result.
+    """
+
+    return [
+        PingStats(
+            destination="a",
+            packet_transmit=10,
+            packet_receive=9,
+            rtt_min=1.0,
+            rtt_avg=2.0,
+            rtt_max=3.0,
+            rtt_mdev=0.5,
+            duplicates=1,
+        ),
+        PingStats(
+            destination="b",
+            packet_transmit=10,
+            packet_receive=5,
+            rtt_min=4.0,
+            rtt_avg=5.0,
+            rtt_max=6.0,
+            rtt_mdev=0.5,
+            duplicates=0,
+        ),
+        PingStats(
+            destination="a",
+            packet_transmit=10,
+            packet_receive=10,
+            rtt_min=0.5,
+            rtt_avg=3.0,
+            rtt_max=4.0,
+            rtt_mdev=1.0,
+            duplicates=0,
+        ),
+        PingStats(),
+    ]
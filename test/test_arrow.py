@@ -0,0 +1,110 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from datetime import datetime, timezone
+from textwrap import dedent
+
+import pytest
+
+from pingparsing import PingParsing, PingStats, PingStatsArrowWriter
+from pingparsing._arrow import ArrowFormat
+
+from .common import local_tz_tokyo  # noqa
+from .common import make_stats_list
+
+
+pa = pytest.importorskip("pyarrow")
+
+
+def read_table(path, file_format):
+    if file_format == ArrowFormat.PARQUET:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path)
+
+    with pa.ipc.open_file(path) as reader:
+        return reader.read_all()
+
+
+class Test_PingStatsArrowWriter:
+    @pytest.mark.parametrize(
+        ["file_format", "batch_size"],
+        [[file_format, batch_size] for file_format in ArrowFormat.LIST for batch_size in (1, 3)],
+    )
+    def test_normal(self, tmpdir, file_format, batch_size):
+        stats_list = make_stats_list()
+        summary_path = str(tmpdir.join("summary"))
+        replies_path = str(tmpdir.join("replies"))
+
+        with PingStatsArrowWriter(
+            summary_path, replies_path, file_format=file_format, batch_size=batch_size
+        ) as writer:
+            writer.write_all(stats_list)
+
+        summary = read_table(summary_path, file_format).to_pylist()
+        replies = read_table(replies_path, file_format).to_pylist()
+
+        assert len(summary) == len(stats_list)
+        for result_id, (row, stats) in enumerate(zip(summary, stats_list)):
+            assert row.pop("result_id") == result_id
+            assert row == stats.as_dict()
+
+            result_replies = [reply for reply in replies if reply["result_id"] == result_id]
+            assert len(result_replies) == len(stats.icmp_replies)
+            for reply, expected in zip(result_replies, stats.icmp_replies):
+                assert reply["icmp_seq"] == expected.get("icmp_seq")
+                assert reply["time"] == expected.get("time")
+                assert reply["duplicate"] == expected["duplicate"]
+                if "timestamp" in expected:
+                    # naive timestamps are in the local time
+                    assert reply["timestamp"] == expected["timestamp"].astimezone(timezone.utc)
+
+    def test_normal_wo_replies(self, tmpdir):
+        summary_path = str(tmpdir.join("summary.parquet"))
+
+        with PingStatsArrowWriter(summary_path, start_id=100) as writer:
+            assert writer.write(PingStats()) == 100
+            assert writer.write(PingStats(), result_id=200) == 200
+            assert writer.write(PingStats()) == 201
+
+        summary = read_table(summary_path, ArrowFormat.PARQUET)
+        assert summary.column("result_id").to_pylist() == [100, 200, 201]
+
+    def test_normal_to_tables(self):
+        stats_list = make_stats_list()
+
+        summary, replies = PingStatsArrowWriter.to_tables(stats_list)
+
+        assert summary.num_rows == len(stats_list)
+        assert replies.num_rows == sum(len(stats.icmp_replies) for stats in stats_list)
+        assert replies.schema.field("timestamp").type == pa.timestamp("us", tz="UTC")
+
+    def test_normal_local_timestamp(self, local_tz_tokyo):
+        # timestamps of ping -D are converted into naive local datetimes without a timezone
+        stats = PingParsing().parse(
+            dedent(
+                """\
+                PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.
+                [1596881133.123000] 64 bytes from 192.168.0.1: icmp_seq=1 ttl=64 time=10.0 ms
+
+                --- 192.168.0.1 ping statistics ---
+                1 packets transmitted, 1 received, 0% packet loss, time 0ms
+                rtt min/avg/max/mdev = 10.000/10.000/10.000/0.000 ms
+                """
+            )
+        )
+
+        _, replies = PingStatsArrowWriter.to_tables([stats])
+
+        assert replies.column("timestamp").to_pylist() == [
+            datetime.fromtimestamp(1596881133.123, timezone.utc)
+        ]
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [[{"file_format": "csv"}, ValueError], [{"batch_size": 0}, ValueError]],
+    )
+    def test_exception(self, tmpdir, kwargs, expected):
+        with pytest.raises(expected):
+            PingStatsArrowWriter(str(tmpdir.join("summary")), **kwargs)
@@ -0,0 +1,108 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from pingparsing import FakePingBackend, PingParsing
+
+from .common import make_transmitter
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_0, WINDOWS7SP1_SUCCESS
+
+
+class Test_FakePingBackend:
+    @pytest.mark.parametrize(
+        ["os_type", "loss_rate"],
+        [
+            [os_type, loss_rate]
+            for os_type in ("linux", "macos", "windows", "alpine")
+            for loss_rate in (0.0, 0.5)
+        ],
+    )
+    def test_normal_generate(self, os_type, loss_rate):
+        transmitter = make_transmitter(
+            backend=FakePingBackend(os_type=os_type, loss_rate=loss_rate, rtt=50, seed=0), count=100
+        )
+        result = transmitter.ping()
+        stats = PingParsing().parse(result)
+
+        assert result.returncode == 0
+        assert stats.destination == "192.168.0.1"
+        assert stats.packet_transmit == 100
+        assert stats.packet_loss_rate == pytest.approx(loss_rate * 100, abs=15)
+        assert stats.rtt_avg == pytest.approx(50, abs=5)
+
+    def test_normal_deterministic(self):
+        outputs = [
+            make_transmitter(backend=FakePingBackend(loss_rate=0.3, seed=1)).ping().stdout
+            for _ in range(2)
+        ]
+        assert outputs[0] == outputs[1]
+
+    def test_normal_count_from_deadline(self):
+        transmitter = make_transmitter(backend=FakePingBackend(seed=0), count=None, deadline=5)
+        stats = PingParsing().parse(transmitter.ping())
+
+        assert stats.packet_transmit == 5
+
+    def test_normal_all_lost(self):
+        transmitter = make_transmitter(backend=FakePingBackend(loss_rate=1, seed=0))
+        result = transmitter.ping()
+
+        assert result.returncode == 1
+        assert PingParsing().parse(result).packet_receive == 0
+
+    def test_normal_timestamp(self):
+        transmitter = make_transmitter(backend=FakePingBackend(seed=0))
+        transmitter.timestamp = True
+        stats = PingParsing().parse(transmitter.ping())
+
+        assert all("timestamp" in reply for reply in stats.icmp_replies)
+
+    def test_normal_replay(self):
+        backend = FakePingBackend(
+            outputs=[DEBIAN_SUCCESS_0.value, UBUNTU_SUCCESS_0.value, WINDOWS7SP1_SUCCESS.value]
+        )
+        transmitter = make_transmitter(backend=backend)
+
+        for expected in (DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_0, WINDOWS7SP1_SUCCESS, DEBIAN_SUCCESS_0):
+            assert PingParsing().parse(transmitter.ping()).as_dict() == expected.expected
+
+    def test_normal_speed(self):
+        transmitter = make_transmitter(backend=FakePingBackend(rtt=0, jitter=0, speed=100), count=6)
+
+        start = time.perf_counter()
+        transmitter.ping()
+
+        assert time.perf_counter() - start >= 0.05
+
+    def test_normal_async(self):
+        backend = FakePingBackend(speed=100, seed=0)
+        transmitters = [make_transmitter(f"host{i}", count=6, backend=backend) for i in range(100)]
+
+        async def run():
+            return await asyncio.gather(*[t.ping_async() for t in transmitters])
+
+        start = time.perf_counter()
+        results = asyncio.run(run())
+
+        # pings are waited concurrently
+        assert time.perf_counter() - start < 1
+        assert [PingParsing().parse(result).destination for result in results] == [
+            f"host{i}" for i in range(100)
+        ]
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [
+            [{"os_type": "unknown"}, ValueError],
+            [{"speed": 0}, ValueError],
+            [{"outputs": []}, ValueError],
+        ],
+    )
+    def test_exception(self, kwargs, expected):
+        with pytest.raises(expected):
+            FakePingBackend(**kwargs)
@@ -0,0 +1,100 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import math
+
+import pytest
+
+from pingparsing import PingStatsBatch
+
+from .common import make_summary_stats_list
+
+
+def assert_nan_equal(actual, expected):
+    assert len(actual) == len(expected)
+    for value, expected_value in zip(actual, expected):
+        if expected_value is None:
+            assert math.isnan(value)
+        else:
+            assert value == pytest.approx(expected_value)
+
+
+class Test_PingStatsBatch:
+    def test_normal(self):
+        stats_list = make_summary_stats_list()
+        batch = PingStatsBatch.from_stats(stats_list)
+
+        assert len(batch) == 4
+        assert batch.destinations == ["a", "b"]
+        assert list(batch.column("destination_index")) == [0, 1, 0, -1]
+        assert [stats.as_dict() for stats in batch] == [stats.as_dict() for stats in stats_list]
+
+    def test_normal_derived_columns(self):
+        batch = PingStatsBatch.from_stats(make_summary_stats_list())
+
+        assert list(batch.packet_loss_count()) == [1, 5, 0, -1]
+        assert_nan_equal(batch.packet_loss_rate(), [10.0, 50.0, 0.0, None])
+        assert_nan_equal(batch.column("packet_duplicate_rate"), [100 / 9, 0.0, 0.0, None])
+
+    def test_normal_filter_take(self):
+        batch = PingStatsBatch.from_stats(make_summary_stats_list())
+
+        filtered = batch.filter(rate > 5 for rate in batch.packet_loss_rate())
+        assert [stats.destination for stats in filtered] == ["a", "b"]
+        assert list(filtered.column("packet_receive")) == [9, 5]
+
+        taken = batch.take([2, 0])
+        assert list(taken.column("rtt_avg")) == [3.0, 2.0]
+
+        with pytest.raises(ValueError):
+            batch.filter([True])
+
+    @pytest.mark.parametrize(
+        ["k", "key", "largest", "expected"],
+        [
+            [2, "packet_loss_rate", True, [1, 0]],
+            [10, "packet_loss_rate", True, [1, 0, 2]],
+            [1, "rtt_min", False, [2]],
+            [2, "packet_duplicate_count", True, [0, 1]],
+        ],
+    )
+    def test_normal_top_k(self, k, key, largest, expected):
+        batch = PingStatsBatch.from_stats(make_summary_stats_list())
+
+        assert batch.top_k(k, key, largest=largest) == expected
+
+    def test_normal_group_by_destination(self):
+        batch = PingStatsBatch.from_stats(make_summary_stats_list())
+
+        assert batch.group_by_destination() == {"a": [0, 2], "b": [1], None: [3]}
+
+        aggregated = batch.aggregate_by_destination()
+        assert len(aggregated) == 3
+        stats = aggregated.get_stats(0)
+        assert stats.destination == "a"
+        assert stats.packet_transmit == 20
+        assert stats.packet_receive == 19
+        assert stats.packet_duplicate_count == 1
+        assert stats.rtt_min == 0.5
+        assert stats.rtt_max == 4.0
+        assert stats.rtt_avg == pytest.approx((9 * 2.0 + 10 * 3.0) / 19)
+        assert aggregated.get_stats(2).is_empty()
+
+    def test_normal_bytes(self):
+        batch = PingStatsBatch.from_stats(make_summary_stats_list())
+
+        restored = PingStatsBatch.from_bytes(batch.to_bytes())
+
+        assert restored.destinations == batch.destinations
+        assert [stats.as_dict() for stats in restored] == [stats.as_dict() for stats in batch]
+        assert len(PingStatsBatch.from_bytes(PingStatsBatch().to_bytes())) == 0
+
+    @pytest.mark.parametrize(["data"], [[b""], [b"invalid data" * 4], [b"PSB1" + b"\xff" * 24]])
+    def test_exception_bytes(self, data):
+        with pytest.raises(ValueError):
+            PingStatsBatch.from_bytes(data)
+
+    def test_exception_column(self):
+        with pytest.raises(ValueError):
+            PingStatsBatch().column("unknown")
@@ -0,0 +1,234 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import os
+
+import pytest
+import pytz
+
+from pingparsing import ParseCache, PingParsing, PingStats
+from pingparsing.__main__ import OutputFormat, get_parse_cache, parse_ping_file
+
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, WINDOWS7SP1_SUCCESS
+
+
+class Test_ParseCache:
+    def test_normal_lru(self):
+        cache = ParseCache(max_entries=2)
+        cache.put("a", 1, size=1)
+        cache.put("b", 2, size=1)
+        assert cache.get("a") == 1
+
+        cache.put("c", 3, size=1)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.counters == {
+            "hits": 3,
+            "misses": 1,
+            "evictions": 1,
+            "disk_hits": 0,
+            "disk_misses": 0,
+            "disk_evictions": 0,
+        }
+
+    def test_normal_max_bytes(self):
+        cache = ParseCache(max_bytes=100)
+        cache.put("a", 1, size=60)
+        cache.put("b", 2, size=30)
+        cache.put("c", 3, size=30)
+        cache.put("d", 4, size=101)
+
+        assert cache.get("a") is None
+        assert cache.get("d") is None
+        assert cache.num_entries == 2
+        assert cache.num_bytes == 60
+
+    def test_normal_make_key(self):
+        key = ParseCache.make_key("text", None)
+
+        assert key == ParseCache.make_key(b"text", None)
+        assert key != ParseCache.make_key("text", pytz.utc)
+        assert key != ParseCache.make_key("text ", None)
+
+    def test_normal_disk(self, tmpdir):
+        file_path = str(tmpdir.join("ping.txt"))
+        with open(file_path, "w") as f:
+            f.write("a")
+        cache = ParseCache(disk_dir=str(tmpdir.join("cache")))
+
+        stats = PingParsing().parse(DEBIAN_SUCCESS_0.value)
+
+        assert cache.get_file(file_path) is None
+        cache.put_file(file_path, [stats])
+        assert os.listdir(cache.disk_dir)[0].endswith(".msgpack")
+        stats_list = ParseCache(disk_dir=cache.disk_dir).get_file(file_path)
+        assert [s.as_dict(include_icmp_replies=True) for s in stats_list] == [
+            stats.as_dict(include_icmp_replies=True)
+        ]
+        assert cache.get_file(file_path, "option") is None
+
+        with open(file_path, "w") as f:
+            f.write("ab")
+        assert cache.get_file(file_path) is None
+        assert cache.counters["disk_misses"] == 3
+
+    def test_normal_disk_version(self, tmpdir, monkeypatch):
+        file_path = str(tmpdir.join("ping.txt"))
+        with open(file_path, "w") as f:
+            f.write("a")
+        cache = ParseCache(disk_dir=str(tmpdir.join("cache")))
+        cache.put_file(file_path, [PingStats(destination="a")])
+
+        monkeypatch.setattr("pingparsing._cache.__version__", "0.0.0")
+
+        assert cache.get_file(file_path) is None
+
+    def test_normal_disk_corrupted(self, tmpdir):
+        file_path = str(tmpdir.join("ping.txt"))
+        with open(file_path, "w") as f:
+            f.write("a")
+        cache = ParseCache(disk_dir=str(tmpdir.join("cache")))
+        cache.put_file(file_path, [PingStats(destination="a")])
+        for name in os.listdir(cache.disk_dir):
+            with open(os.path.join(cache.disk_dir, name), "wb") as f:
+                f.write(b"\x93\xc4\x01a")
+
+        assert cache.get_file(file_path) is None
+        assert cache.counters["disk_misses"] == 1
+
+    def test_normal_max_disk_entries(self, tmpdir):
+        cache = ParseCache(disk_dir=str(tmpdir.join("cache")), max_disk_entries=2)
+        file_paths = []
+        for i in range(3):
+            file_path = str(tmpdir.join(f"ping_{i}.txt"))
+            with open(file_path, "w") as f:
+                f.write("a")
+            file_paths.append(file_path)
+
+        cache.put_file(file_paths[0], [PingStats(destination="0")])
+        cache.put_file(file_paths[1], [PingStats(destination="1")])
+        for name in os.listdir(cache.disk_dir):
+            os.utime(os.path.join(cache.disk_dir, name), ns=(0, 0))
+        assert cache.get_file(file_paths[0]) is not None
+        cache.put_file(file_paths[2], [PingStats(destination="2")])
+
+        assert len(os.listdir(cache.disk_dir)) == 2
+        assert cache.get_file(file_paths[0]) is not None
+        assert cache.get_file(file_paths[1]) is None
+        assert cache.get_file(file_paths[2])[0].destination == "2"
+        assert cache.counters["disk_evictions"] == 1
+
+    def test_normal_disk_scan_once(self, tmpdir, monkeypatch):
+        cache = ParseCache(disk_dir=str(tmpdir.join("cache")), max_disk_entries=2)
+        scandir_calls = []
+        scandir = os.scandir
+
+        def counting_scandir(path):
+            scandir_calls.append(path)
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+
+        for i in range(5):
+            file_path = str(tmpdir.join(f"ping_{i}.txt"))
+            with open(file_path, "w") as f:
+                f.write("a")
+            cache.put_file(file_path, [PingStats(destination=str(i))])
+
+        assert len(scandir_calls) == 1
+        assert len(os.listdir(cache.disk_dir)) == 2
+        assert cache.counters["disk_evictions"] == 3
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [
+            [{"max_entries": 0}, ValueError],
+            [{"max_bytes": 0}, ValueError],
+            [{"max_disk_entries": 0}, ValueError],
+        ],
+    )
+    def test_exception(self, kwargs, expected):
+        with pytest.raises(expected):
+            ParseCache(**kwargs)
+
+
+class Test_PingParsing_cache:
+    def test_normal(self):
+        cache = ParseCache()
+        parser = PingParsing(cache=cache)
+
+        for value in (DEBIAN_SUCCESS_0, WINDOWS7SP1_SUCCESS, DEBIAN_SUCCESS_0):
+            assert parser.parse(value.value).as_dict() == value.expected
+
+        assert parser.parser_name == "Linux"
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+        assert PingParsing(cache=cache).parse(UBUNTU_SUCCESS_1.value).as_dict() == (
+            UBUNTU_SUCCESS_1.expected
+        )
+        assert cache.misses == 3
+
+    def test_normal_shared(self):
+        parser = PingParsing(cache=ParseCache())
+
+        # cached results are shared, not copied
+        assert parser.parse(DEBIAN_SUCCESS_0.value) is parser.parse(DEBIAN_SUCCESS_0.value)
+
+    def test_normal_options(self):
+        cache = ParseCache()
+
+        PingParsing(cache=cache).parse(DEBIAN_SUCCESS_0.value)
+        PingParsing(cache=cache, timezone=pytz.utc).parse(DEBIAN_SUCCESS_0.value)
+        PingParsing(cache=cache).parse(DEBIAN_SUCCESS_0.value, max_replies=10)
+
+        assert cache.hits == 0
+        assert cache.misses == 3
+
+    def test_normal_num_bytes(self):
+        cache = ParseCache()
+        ping_text = DEBIAN_SUCCESS_0.value.decode().replace("google.com", "\u4f8b\u3048.jp")
+
+        PingParsing(cache=cache).parse(ping_text)
+
+        # sizes of inputs are counted in bytes, not characters
+        assert cache.num_bytes == len(ping_text.encode("utf-8"))
+        assert cache.num_bytes > len(ping_text)
+
+
+class Test_parse_ping_file:
+    def test_normal_cache_dir(self, tmpdir):
+        file_path = str(tmpdir.join("ping.txt"))
+        with open(file_path, "wb") as f:
+            f.write(DEBIAN_SUCCESS_0.value)
+        cache_dir = str(tmpdir.join("cache"))
+
+        for _ in range(2):
+            key, output = parse_ping_file(
+                file_path, False, "", OutputFormat.JSON, cache_dir=cache_dir
+            )
+            assert key == file_path
+            assert output == DEBIAN_SUCCESS_0.expected
+
+        assert len(os.listdir(cache_dir)) == 1
+
+    def test_normal_cache_shared(self, tmpdir):
+        cache_dir = str(tmpdir.join("cache"))
+        for i in range(2):
+            file_path = str(tmpdir.join(f"ping_{i}.txt"))
+            with open(file_path, "wb") as f:
+                f.write(DEBIAN_SUCCESS_0.value)
+
+            _, output = parse_ping_file(
+                file_path, False, "", OutputFormat.JSON, cache_dir=cache_dir
+            )
+            assert output == DEBIAN_SUCCESS_0.expected
+
+        # the in-memory tier is reused among files in the same process
+        cache = get_parse_cache(cache_dir)
+        assert cache is get_parse_cache(cache_dir)
+        assert cache.hits == 1
+        assert cache.counters["disk_misses"] == 2
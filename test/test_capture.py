@@ -0,0 +1,129 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from pingparsing import FakePingBackend, PingParsing
+from pingparsing._capture import BoundedLineBuffer, SamplingMethod
+from pingparsing._generator import OsType, generate_ping_output
+
+from .common import FakePopen, make_transmitter
+
+
+LINES = ["header"] + [f"line {i}" for i in range(100)] + ["stats 0", "stats 1"]
+
+
+class Test_BoundedLineBuffer:
+    def test_normal_tail(self):
+        buffer = BoundedLineBuffer(max_lines=5, tail_lines=2)
+        buffer.extend(LINES)
+
+        assert buffer.getlines() == ["header"] + [f"line {i}" for i in range(95, 100)] + [
+            "stats 0",
+            "stats 1",
+        ]
+        assert buffer.num_lines == len(LINES)
+        assert buffer.num_dropped_lines == 95
+
+    def test_normal_reservoir(self):
+        buffer = BoundedLineBuffer(
+            max_lines=10, sampling=SamplingMethod.RESERVOIR, tail_lines=2, seed=0
+        )
+        buffer.extend(line + "\n" for line in LINES)
+        lines = buffer.getlines()
+
+        assert len(lines) == 13
+        assert lines[0] == "header"
+        assert lines[-2:] == ["stats 0", "stats 1"]
+        body = lines[1:-2]
+        assert set(body) <= set(LINES[1:-2])
+        assert body == sorted(body, key=lambda line: int(line.split()[1]))
+        # not only the first/last lines are sampled
+        assert body != LINES[1:11]
+        assert body != LINES[-12:-2]
+
+    def test_normal_short(self):
+        buffer = BoundedLineBuffer(max_lines=10)
+        buffer.extend(LINES[:3])
+
+        assert buffer.getvalue() == "header\nline 0\nline 1\n"
+        assert buffer.num_dropped_lines == 0
+        assert BoundedLineBuffer(max_lines=10).getvalue() == ""
+
+    def test_normal_zero(self):
+        buffer = BoundedLineBuffer(max_lines=0, tail_lines=2)
+        buffer.extend(LINES)
+
+        assert buffer.getlines() == ["header", "stats 0", "stats 1"]
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [[{"max_lines": -1}, ValueError], [{"max_lines": 1, "sampling": "head"}, ValueError]],
+    )
+    def test_exception(self, kwargs, expected):
+        with pytest.raises(expected):
+            BoundedLineBuffer(**kwargs)
+
+
+class LongPopen(FakePopen):
+    text = generate_ping_output(OsType.LINUX, count=10000, loss_rate=0.1, seed=0).text
+
+
+class Test_PingTransmitter_max_stdout_lines:
+    @pytest.mark.parametrize(["sampling"], [[method] for method in SamplingMethod.LIST])
+    def test_normal_backend(self, sampling):
+        expected_transmitter = make_transmitter(count=10000, max_stdout_lines=None)
+        expected_transmitter.backend = FakePingBackend(loss_rate=0.1, duplicate_rate=0.01, seed=0)
+        expected = PingParsing().parse(expected_transmitter.ping())
+
+        transmitter = make_transmitter(count=10000, max_stdout_lines=100, stdout_sampling=sampling)
+        transmitter.backend = FakePingBackend(loss_rate=0.1, duplicate_rate=0.01, seed=0)
+        result = transmitter.ping()
+        stats = PingParsing().parse(result)
+
+        assert len(result.stdout.splitlines()) <= 1 + 100 + 8
+        assert stats.as_dict() == expected.as_dict()
+        assert 100 <= len(stats.icmp_replies) <= 100 + 8
+
+        transmitter.backend = FakePingBackend(loss_rate=0.1, duplicate_rate=0.01, seed=0)
+        async_result = asyncio.run(transmitter.ping_async())
+        assert PingParsing().parse(async_result).as_dict() == expected.as_dict()
+
+    def test_normal_process(self, monkeypatch):
+        monkeypatch.setattr(subprocess, "Popen", LongPopen)
+        transmitter = make_transmitter(count=10000, max_stdout_lines=10)
+        result = transmitter.ping()
+        stats = PingParsing().parse(result)
+
+        assert result.returncode == 0
+        assert len(result.stdout.splitlines()) <= 1 + 10 + 8
+        assert stats.packet_transmit == 10000
+        assert 10 <= len(stats.icmp_replies) <= 10 + 8
+
+    @pytest.mark.parametrize(["is_async"], [[False], [True]])
+    def test_normal_large_stderr(self, is_async):
+        # a child that writes to stderr more than the size of a pipe before writing to stdout
+        script = "; ".join(
+            [
+                "import sys",
+                "sys.stderr.write('e' * 1024 * 1024)",
+                "sys.stderr.flush()",
+                "print('PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.\\r')",
+            ]
+        )
+        transmitter = make_transmitter(count=10000, max_stdout_lines=10)
+        transmitter._PingTransmitter__make_ping_command = lambda: [sys.executable, "-c", script]
+
+        if is_async:
+            result = asyncio.run(asyncio.wait_for(transmitter.ping_async(), timeout=30))
+        else:
+            result = transmitter.ping()
+
+        assert result.returncode == 0
+        assert result.stdout == "PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.\n"
+        assert result.stderr == "e" * 1024 * 1024
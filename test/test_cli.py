@@ -2,6 +2,7 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import argparse
 import json
 import sys
 from textwrap import dedent
@@ -9,9 +10,28 @@ from textwrap import dedent
 import pytest
 from subprocrunner import SubprocessRunner
 
+from pingparsing.__main__ import (
+    ExecutorType,
+    OutputFormat,
+    iter_dir_files,
+    iter_targets,
+    iter_targets_file,
+    parse_ping_file,
+    run_async,
+    run_pool,
+    select_executor_type,
+)
+
 from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, UBUNTU_SUCCESS_2, WINDOWS7SP1_SUCCESS
 
 
+TRUNCATED_SESSION = b"""\
+PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.
+
+--- 192.168.0.1 ping statistics ---
+"""
+
+
 def print_result(stdout, stderr, expected=None):
     if expected:
         print(f"[expected]\n{expected}")
@@ -65,6 +85,37 @@ class Test_cli_file:
         assert parsed_result[tmp_ping_path_deb] == DEBIAN_SUCCESS_0.expected
         assert parsed_result[tmp_ping_path_win] == WINDOWS7SP1_SUCCESS.expected
 
+    @pytest.mark.parametrize(["executor"], [[executor] for executor in ExecutorType.LIST])
+    def test_normal_executor(self, tmpdir, executor):
+        tmp_ping_file_deb = tmpdir.join("ping_deb.txt")
+        tmp_ping_file_deb.write(DEBIAN_SUCCESS_0.value)
+        tmp_ping_path_deb = str(tmp_ping_file_deb)
+
+        tmp_ping_file_win = tmpdir.join("ping_win.txt")
+        tmp_ping_file_win.write(WINDOWS7SP1_SUCCESS.value)
+        tmp_ping_path_win = str(tmp_ping_file_win)
+
+        runner = SubprocessRunner(
+            [
+                sys.executable,
+                "-m",
+                "pingparsing",
+                "--executor",
+                executor,
+                tmp_ping_path_deb,
+                tmp_ping_path_win,
+            ]
+        )
+        runner.run()
+
+        print_result(stdout=runner.stdout, stderr=runner.stderr)
+
+        assert runner.returncode == 0
+        assert runner.stdout is not None
+        parsed_result = json.loads(runner.stdout)
+        assert parsed_result[tmp_ping_path_deb] == DEBIAN_SUCCESS_0.expected
+        assert parsed_result[tmp_ping_path_win] == WINDOWS7SP1_SUCCESS.expected
+
     def test_normal_timezone(self, tmpdir):
         tmp_ping_file = tmpdir.join("ping_timezone.txt")
         tmp_ping_file.write(UBUNTU_SUCCESS_1.value)
@@ -148,6 +199,155 @@ class Test_cli_file:
         }
 
 
+class Test_select_executor_type:
+    @pytest.mark.parametrize(
+        ["executor_type", "expected"],
+        [[executor_type, executor_type] for executor_type in ExecutorType.LIST],
+    )
+    def test_normal_specified(self, executor_type, expected):
+        assert select_executor_type(executor_type, ["localhost"]) == expected
+
+    def test_normal_files(self, tmpdir):
+        tmp_ping_file = tmpdir.join("ping_deb.txt")
+        tmp_ping_file.write(DEBIAN_SUCCESS_0.value)
+
+        assert select_executor_type(None, [str(tmp_ping_file)]) == ExecutorType.PROCESS
+
+    def test_normal_destinations(self, tmpdir):
+        tmp_ping_file = tmpdir.join("ping_deb.txt")
+        tmp_ping_file.write(DEBIAN_SUCCESS_0.value)
+
+        assert select_executor_type(None, [str(tmp_ping_file), "localhost"]) == ExecutorType.THREAD
+
+
+def make_ping_files(tmpdir):
+    file_paths = []
+    for dir_path, file_name in (
+        ("", "a.txt"),
+        ("", "b.log"),
+        ("sub", "c.txt"),
+        ("sub/subsub", "d.txt"),
+    ):
+        file_path = tmpdir.join(dir_path, file_name)
+        file_path.dirpath().ensure(dir=True)
+        file_path.write(DEBIAN_SUCCESS_0.value, mode="wb")
+        file_paths.append(str(file_path))
+
+    return file_paths
+
+
+def make_ping_args():
+    return (None, 1, None, None, None, None, False, "none", "", [], False, OutputFormat.JSON, None)
+
+
+class Test_iter_dir_files:
+    def test_normal(self, tmpdir):
+        file_paths = make_ping_files(tmpdir)
+
+        assert sorted(iter_dir_files(str(tmpdir))) == sorted(file_paths)
+
+    def test_normal_pattern(self, tmpdir):
+        file_paths = make_ping_files(tmpdir)
+
+        assert sorted(iter_dir_files(str(tmpdir), "*.txt")) == sorted(
+            file_path for file_path in file_paths if file_path.endswith(".txt")
+        )
+
+    def test_normal_not_exist(self, tmpdir):
+        assert list(iter_dir_files(str(tmpdir.join("not_exist")))) == []
+
+
+class Test_iter_targets:
+    def test_normal(self, tmpdir):
+        file_paths = make_ping_files(tmpdir.join("dir"))
+        targets_file = tmpdir.join("targets.txt")
+        targets_file.write("# comment\n\nexample.com\n  192.168.0.1  \n")
+        options = argparse.Namespace(
+            destination_or_file=["localhost"],
+            targets_file=str(targets_file),
+            recursive=[str(tmpdir.join("dir"))],
+            glob=None,
+        )
+
+        assert list(iter_targets_file(str(targets_file))) == ["example.com", "192.168.0.1"]
+
+        targets = list(iter_targets(options))
+        assert targets[:3] == ["localhost", "example.com", "192.168.0.1"]
+        assert sorted(targets[3:]) == sorted(file_paths)
+
+
+class Test_run_pool:
+    @pytest.mark.parametrize(["executor_type"], [[ExecutorType.THREAD], [ExecutorType.ASYNC]])
+    def test_normal(self, tmpdir, executor_type):
+        file_paths = make_ping_files(tmpdir) * 10
+        consumed = []
+
+        def gen_targets():
+            for file_path in file_paths:
+                consumed.append(file_path)
+                yield file_path
+
+        if executor_type == ExecutorType.ASYNC:
+            output = run_async(2, gen_targets(), make_ping_args())
+        else:
+            output = run_pool(executor_type, 2, gen_targets(), make_ping_args())
+
+        assert len(consumed) == len(file_paths)
+        assert sorted(output) == sorted(set(file_paths))
+        for ping_data in output.values():
+            assert ping_data == DEBIAN_SUCCESS_0.expected
+
+    @pytest.mark.parametrize(
+        ["executor_type"], [[ExecutorType.PROCESS], [ExecutorType.THREAD], [ExecutorType.ASYNC]]
+    )
+    def test_normal_corrupted_file(self, tmpdir, executor_type):
+        file_paths = make_ping_files(tmpdir)
+        corrupted_file = tmpdir.join("corrupted.txt.gz")
+        corrupted_file.write(b"\x1f\x8b\x08\x00corrupted", mode="wb")
+        targets = file_paths[:1] + [str(corrupted_file)] + file_paths[1:]
+
+        if executor_type == ExecutorType.ASYNC:
+            output = run_async(2, iter(targets), make_ping_args())
+        else:
+            output = run_pool(executor_type, 2, iter(targets), make_ping_args())
+
+        # a failure of a target should not discard the results of the other targets
+        assert sorted(output) == sorted(targets)
+        assert list(output.pop(str(corrupted_file))) == ["error"]
+        for ping_data in output.values():
+            assert ping_data == DEBIAN_SUCCESS_0.expected
+
+
+class Test_parse_ping_file:
+    def test_normal_truncated(self, tmpdir):
+        tmp_ping_file = tmpdir.join("ping.log")
+        tmp_ping_file.write(
+            TRUNCATED_SESSION + DEBIAN_SUCCESS_0.value + TRUNCATED_SESSION, mode="wb"
+        )
+        tmp_ping_path = str(tmp_ping_file)
+
+        assert parse_ping_file(tmp_ping_path, False, "") == (
+            tmp_ping_path,
+            DEBIAN_SUCCESS_0.expected,
+        )
+
+    def test_normal_multi_sessions(self, tmpdir):
+        tmp_ping_file = tmpdir.join("ping.log")
+        tmp_ping_file.write(
+            DEBIAN_SUCCESS_0.value
+            + TRUNCATED_SESSION
+            + b"\n"
+            + WINDOWS7SP1_SUCCESS.value.encode("utf-8"),
+            mode="wb",
+        )
+        tmp_ping_path = str(tmp_ping_file)
+
+        assert parse_ping_file(tmp_ping_path, False, "") == (
+            tmp_ping_path,
+            [DEBIAN_SUCCESS_0.expected, WINDOWS7SP1_SUCCESS.expected],
+        )
+
+
 @pytest.mark.xfail(run=False)
 class Test_cli_pipe:
     def test_normal(self):
@@ -213,6 +413,16 @@ class Test_cli_pipe:
         assert runner.stdout is not None
         assert json.loads(runner.stdout) == json.loads(expected)
 
+    def test_normal_truncated(self):
+        runner = SubprocessRunner([sys.executable, "-m", "pingparsing"])
+        runner.run(input=DEBIAN_SUCCESS_0.value + TRUNCATED_SESSION)
+
+        print_result(stdout=runner.stdout, stderr=runner.stderr)
+
+        assert runner.returncode == 0
+        assert runner.stdout is not None
+        assert json.loads(runner.stdout) == DEBIAN_SUCCESS_0.expected
+
 
 @pytest.mark.xfail(run=False)
 class Test_PingParsing_ping:
@@ -167,3 +167,15 @@ class Test_CmdMaker_make_cmd:
         cmd_1 = maker_class(ping_option=["-a", "-b"], count=1).make_cmd(destination=host)
         assert cmd_0 == expected
         assert cmd_1 == expected
+
+    @pytest.mark.parametrize(
+        ["maker_class", "host", "expected"],
+        [
+            [LinuxPingCmdMaker, "localhost", "ping -D -O localhost".split()],
+            [MacosPingCmdMaker, "localhost", "ping localhost".split()],
+        ],
+    )
+    def test_normal_continuous(self, maker_class, host, expected):
+        timestamp = maker_class is LinuxPingCmdMaker
+        cmd = maker_class(timestamp=timestamp, is_continuous=True).make_cmd(destination=host)
+        assert cmd == expected
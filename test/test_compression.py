@@ -0,0 +1,87 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+from pingparsing.__main__ import OutputFormat, parse_ping_file
+from pingparsing._compression import Compression, detect_compression, open_ping_file
+
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1
+
+
+PING_TEXT = (DEBIAN_SUCCESS_0.value + b"\n" + UBUNTU_SUCCESS_1.value).decode("utf-8")
+
+
+def compress_zstd(data: bytes) -> bytes:
+    zstandard = pytest.importorskip("zstandard")
+
+    return zstandard.ZstdCompressor().compress(data)
+
+
+COMPRESSORS = {
+    Compression.NONE: lambda data: data,
+    Compression.GZIP: gzip.compress,
+    Compression.BZIP2: bz2.compress,
+    Compression.XZ: lzma.compress,
+    Compression.ZSTD: compress_zstd,
+}
+
+
+def write_file(tmpdir, compression: str, data: bytes) -> str:
+    file_path = str(tmpdir.join(f"ping.{compression}"))
+    with open(file_path, "wb") as f:
+        f.write(COMPRESSORS[compression](data))
+
+    return file_path
+
+
+class Test_detect_compression:
+    @pytest.mark.parametrize(["compression"], [[compression] for compression in Compression.LIST])
+    def test_normal(self, tmpdir, compression):
+        file_path = write_file(tmpdir, compression, PING_TEXT.encode("utf-8"))
+
+        assert detect_compression(file_path) == compression
+
+    def test_normal_empty(self, tmpdir):
+        file_path = write_file(tmpdir, Compression.NONE, b"")
+
+        assert detect_compression(file_path) == Compression.NONE
+
+
+class Test_open_ping_file:
+    @pytest.mark.parametrize(["compression"], [[compression] for compression in Compression.LIST])
+    def test_normal(self, tmpdir, compression):
+        file_path = write_file(tmpdir, compression, PING_TEXT.encode("utf-8"))
+
+        with open_ping_file(file_path) as f:
+            lines = list(f)
+
+        assert "".join(lines) == PING_TEXT
+        assert len(lines) == PING_TEXT.count("\n")
+
+    def test_exception(self, tmpdir):
+        with pytest.raises(OSError):
+            open_ping_file(str(tmpdir.join("not_exist")))
+
+
+class Test_parse_ping_file:
+    @pytest.mark.parametrize(["compression"], [[compression] for compression in Compression.LIST])
+    def test_normal_multi_sessions(self, tmpdir, compression):
+        file_path = write_file(tmpdir, compression, PING_TEXT.encode("utf-8"))
+
+        key, output = parse_ping_file(file_path, False, "", OutputFormat.JSON)
+
+        assert key == file_path
+        assert output == [DEBIAN_SUCCESS_0.expected, UBUNTU_SUCCESS_1.expected]
+
+    def test_normal_single_session(self, tmpdir):
+        file_path = write_file(tmpdir, Compression.GZIP, DEBIAN_SUCCESS_0.value)
+
+        _, output = parse_ping_file(file_path, False, "", OutputFormat.JSON)
+
+        assert output == DEBIAN_SUCCESS_0.expected
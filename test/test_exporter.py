@@ -0,0 +1,129 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from pingparsing import PingParsing, PingResult, PingStats
+from pingparsing.exporter import PingExporter, calc_rtt_quantiles, render_metrics
+
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_0, WINDOWS7SP1_SUCCESS
+
+
+class StubTransmitter:
+    def __init__(self, stdout, returncode=0):
+        self.__stdout = stdout
+        self.__returncode = returncode
+
+    def ping(self):
+        return PingResult(self.__stdout, "", self.__returncode)
+
+
+def make_stub_factory(output_map):
+    def factory(destination):
+        output = output_map[destination]
+        if isinstance(output, Exception):
+            raise output
+
+        return StubTransmitter(output)
+
+    return factory
+
+
+class Test_calc_rtt_quantiles:
+    def test_normal(self):
+        stats = PingParsing().parse(WINDOWS7SP1_SUCCESS.value)
+
+        assert calc_rtt_quantiles(stats) == {0.5: 96.0, 0.9: 165.0, 0.99: 194.0}
+
+    def test_normal_empty(self):
+        assert calc_rtt_quantiles(PingStats()) == {}
+
+
+class Test_render_metrics:
+    def test_normal(self):
+        stats = PingParsing().parse(UBUNTU_SUCCESS_0.value)
+        text = render_metrics({"twitter.com": stats}, {"twitter.com": True}, {"twitter.com": 1.5})
+
+        assert "# TYPE ping_packet_loss_rate gauge" in text
+        assert 'ping_up{destination="twitter.com"} 1' in text
+        assert 'ping_last_update_timestamp_seconds{destination="twitter.com"} 1.5' in text
+        assert 'ping_packets_transmitted{destination="twitter.com"} 5.0' in text
+        assert 'ping_rtt_avg_milliseconds{destination="twitter.com"} 66.494' in text
+        assert 'ping_rtt_milliseconds{destination="twitter.com",quantile="0.5"} 65.6' in text
+        assert text.endswith("\n")
+
+    def test_normal_skip_none(self):
+        text = render_metrics({'a"b\\c': PingStats(packet_transmit=1)})
+
+        assert 'ping_packets_transmitted{destination="a\\"b\\\\c"} 1.0' in text
+        assert "ping_rtt_avg_milliseconds{" not in text
+
+
+class Test_PingExporter:
+    def test_normal_run_cycle(self):
+        exporter = PingExporter(
+            ["google.com", "twitter.com", "invalid", "truncated"],
+            transmitter_factory=make_stub_factory(
+                {
+                    "google.com": DEBIAN_SUCCESS_0.value,
+                    "twitter.com": UBUNTU_SUCCESS_0.value,
+                    "invalid": ValueError("invalid"),
+                    # raises ParseError: a statistics headline without the statistics
+                    "truncated": "PING a (192.168.0.1)\n--- a ping statistics ---\n",
+                }
+            ),
+        )
+        assert b"destination=" not in exporter.metrics
+
+        exporter.run_cycle()
+
+        metrics = exporter.metrics.decode("utf-8")
+        assert 'ping_up{destination="google.com"} 1' in metrics
+        assert 'ping_up{destination="invalid"} 0' in metrics
+        assert 'ping_up{destination="truncated"} 0' in metrics
+        assert 'ping_rtt_max_milliseconds{destination="google.com"} 212.597' in metrics
+        assert set(exporter.stats_map) == {"google.com", "twitter.com"}
+
+    def test_normal_server(self):
+        exporter = PingExporter(
+            ["127.0.0.1"],
+            transmitter_factory=make_stub_factory({"127.0.0.1": DEBIAN_SUCCESS_0.value}),
+        )
+        exporter.run_cycle()
+        server = exporter.make_server("127.0.0.1", 0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                assert response.status == 200
+                assert response.read() == exporter.metrics
+
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_normal_start_stop(self):
+        exporter = PingExporter(
+            ["127.0.0.1"],
+            interval=0.05,
+            transmitter_factory=make_stub_factory({"127.0.0.1": DEBIAN_SUCCESS_0.value}),
+            render_interval=0.01,
+        )
+        exporter.start()
+        for _ in range(500):
+            if "127.0.0.1" in exporter.stats_map:
+                break
+            time.sleep(0.01)
+        exporter.stop(timeout=10)
+
+        assert b'ping_up{destination="127.0.0.1"} 1' in exporter.metrics
@@ -0,0 +1,156 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import os
+
+import pytest
+
+from pingparsing import PingParsing, PingStreamParser
+from pingparsing._follow import FileFollower
+from pingparsing._generator import OsType, generate_ping_output
+
+
+def append(file_path, text, mode="a"):
+    with open(file_path, mode) as f:
+        f.write(text)
+
+
+class Test_FileFollower:
+    def test_normal_append(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "a\nb\n")
+
+        with FileFollower(file_path) as follower:
+            assert follower.read_lines() == ["a", "b"]
+            assert follower.read_lines() == []
+
+            append(file_path, "c\r\nd")
+            assert follower.read_lines() == ["c"]
+
+            append(file_path, "e\n")
+            assert follower.read_lines() == ["de"]
+            assert follower.offset == os.path.getsize(file_path)
+
+    def test_normal_from_end(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "a\nb\n")
+
+        with FileFollower(file_path, from_start=False) as follower:
+            assert follower.read_lines() == []
+
+            append(file_path, "c\n")
+            assert follower.read_lines() == ["c"]
+
+    def test_normal_not_exist(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+
+        with FileFollower(file_path, from_start=False) as follower:
+            assert follower.read_lines() == []
+
+            append(file_path, "a\n")
+            assert follower.read_lines() == ["a"]
+
+    def test_normal_rotate(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "a\n")
+
+        with FileFollower(file_path) as follower:
+            assert follower.read_lines() == ["a"]
+
+            append(file_path, "b\nc")
+            os.rename(file_path, file_path + ".1")
+            assert follower.read_lines() == ["b"]
+
+            append(file_path, "d\n")
+            assert follower.read_lines() == ["c", "d"]
+
+    def test_normal_truncate(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "a\nb\n")
+
+        with FileFollower(file_path) as follower:
+            assert follower.read_lines() == ["a", "b"]
+
+            append(file_path, "c\n", mode="w")
+            assert follower.read_lines() == ["c"]
+            assert follower.offset == 2
+
+    def test_normal_iter_lines(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        sleep_counts = []
+
+        def sleep(seconds):
+            append(file_path, f"{len(sleep_counts)}\n")
+            sleep_counts.append(seconds)
+
+        with FileFollower(file_path, poll_interval=0.5, sleep=sleep) as follower:
+            lines = follower.iter_lines(stop=lambda: len(sleep_counts) >= 3)
+
+            assert list(lines) == ["0", "1", "2"]
+            assert sleep_counts == [0.5, 0.5, 0.5]
+
+    def test_normal_max_line_size(self, tmpdir):
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "a" * 20)
+
+        with FileFollower(file_path, max_line_size=16) as follower:
+            assert follower.read_lines() == ["a" * 20]
+
+            append(file_path, "b\nc\n")
+            assert follower.read_lines() == ["b", "c"]
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [[{"poll_interval": -1}, ValueError], [{"max_line_size": 0}, ValueError]],
+    )
+    def test_exception(self, tmpdir, kwargs, expected):
+        with pytest.raises(expected):
+            FileFollower(str(tmpdir.join("ping.log")), **kwargs)
+
+
+class Test_PingStreamParser_follow:
+    def test_normal(self, tmpdir):
+        generated = generate_ping_output(
+            OsType.LINUX, count=150, timestamp=True, loss_rate=0.1, start_time=1596880800.0
+        )
+        lines = generated.text.splitlines(keepends=True)
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, "".join(lines[:70]))
+
+        # rotate the log file in the middle of the output
+        def stop():
+            if os.path.exists(file_path + ".1"):
+                return True
+
+            os.rename(file_path, file_path + ".1")
+            append(file_path, "".join(lines[70:]))
+
+            return False
+
+        stats_list = list(PingStreamParser(window=60).follow(file_path, stop=stop))
+
+        assert len(stats_list) == 3
+        expected = PingParsing().parse(generated.text)
+        assert sum(stats.packet_transmit for stats in stats_list) == expected.packet_transmit
+        assert sum(stats.packet_receive for stats in stats_list) == expected.packet_receive
+
+    def test_normal_idle(self, tmpdir):
+        generated = generate_ping_output(
+            OsType.LINUX, count=10, timestamp=True, start_time=1596880800.0
+        )
+        file_path = str(tmpdir.join("ping.log"))
+        append(file_path, generated.text)
+        polls = []
+
+        def stop():
+            polls.append(len(polls))
+            return False
+
+        stream_parser = PingStreamParser(window=60, clock=lambda: 1596880800.0 + 3600)
+        stats_iter = stream_parser.follow(file_path, poll_interval=0, stop=stop)
+
+        # yielded while the log is idle, without waiting for lines of the next window
+        stats = next(stats_iter)
+        assert stats.packet_transmit == 10
+        assert len(polls) == 2
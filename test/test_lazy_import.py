@@ -0,0 +1,71 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import subprocess
+import sys
+from textwrap import dedent
+
+import pytest
+
+import pingparsing
+
+
+def run_python(code):
+    proc = subprocess.run(
+        [sys.executable, "-c", dedent(code)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    print(proc.stderr, file=sys.stderr)
+
+    return proc
+
+
+class Test_lazy_import:
+    @pytest.mark.parametrize(
+        ["code"],
+        [
+            [
+                """\
+                import sys
+                import pingparsing
+                assert "subprocrunner" not in sys.modules
+                assert "pyparsing" not in sys.modules
+                """
+            ],
+            [
+                """\
+                import sys
+                import pingparsing
+                pingparsing.PingParsing().parse("")
+                assert "subprocrunner" not in sys.modules
+                assert "pingparsing._pingtransmitter" not in sys.modules
+                """
+            ],
+            [
+                """\
+                import sys
+                import pingparsing.__main__
+                assert "subprocrunner" not in sys.modules
+                assert "pytz" not in sys.modules
+                assert "pingparsing._pingparsing" not in sys.modules
+                """
+            ],
+        ],
+    )
+    def test_normal_not_loaded(self, code):
+        assert run_python(code).returncode == 0
+
+    @pytest.mark.parametrize(
+        ["name"],
+        [["PingParsing"], ["PingResult"], ["PingStats"], ["PingTransmitter"]],
+    )
+    def test_normal_attr(self, name):
+        assert getattr(pingparsing, name) is getattr(pingparsing, name)
+        assert name in dir(pingparsing)
+
+    def test_abnormal_attr(self):
+        with pytest.raises(AttributeError):
+            pingparsing.NotExistAttr
@@ -4,7 +4,7 @@
 
 import pytest
 
-from pingparsing import set_logger
+from pingparsing import PingParsing, set_logger
 from pingparsing._logger import NullLogger
 
 
@@ -19,3 +19,23 @@ class Test_NullLogger:
     def test_smoke(self, value, monkeypatch):
         monkeypatch.setattr("pingparsing._logger.logger", NullLogger())
         set_logger(value)
+
+    def test_normal_opt(self):
+        logger = NullLogger()
+        logger.opt(lazy=True).debug("{}", lambda: "value")
+
+
+class Test_deferred_format:
+    def test_normal(self):
+        loguru = pytest.importorskip("loguru")
+        messages = []
+        handler_id = loguru.logger.add(messages.append, level="DEBUG", format="{message}")
+
+        try:
+            set_logger(True)
+            PingParsing().parse("PING {0} {unknown}")
+        finally:
+            set_logger(False)
+            loguru.logger.remove(handler_id)
+
+        assert any("parsing ping result: PING {0} {unknown}" in message for message in messages)
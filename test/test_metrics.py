@@ -0,0 +1,93 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import time
+
+import pytest
+import pytz
+
+from pingparsing import ParseMetrics, ParseStage, PingParsing
+from pingparsing._generator import OsType, generate_ping_output
+from pingparsing._metrics import ParseCounter
+
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, WINDOWS7SP1_SUCCESS
+
+
+class Test_ParseMetrics:
+    def test_normal_linux(self):
+        metrics = ParseMetrics()
+        parser = PingParsing(timezone=pytz.UTC, metrics=metrics)
+
+        stats = parser.parse(UBUNTU_SUCCESS_1.value)
+
+        counters = metrics.counters
+        assert counters[ParseCounter.PARSE] == 1
+        assert counters[ParseCounter.PARSER_ATTEMPTS] == 1
+        assert counters[ParseCounter.NULL_PARSER_FALLBACKS] == 0
+        assert counters[ParseCounter.ICMP_REPLIES] == len(stats.icmp_replies) == 5
+        assert counters[ParseCounter.LINES_SCANNED] > 0
+
+        durations = metrics.durations
+        for stage in (
+            ParseStage.FORMAT_DETECTION,
+            ParseStage.ICMP_REPLY,
+            ParseStage.STATS_HEADLINE,
+            ParseStage.STATS_BODY,
+            ParseStage.TIMESTAMP,
+        ):
+            assert durations[stage] > 0
+
+    def test_normal_detection(self):
+        metrics = ParseMetrics()
+        parser = PingParsing(metrics=metrics)
+
+        parser.parse(WINDOWS7SP1_SUCCESS.value)
+        parser.parse("invalid")
+
+        counters = metrics.counters
+        assert counters[ParseCounter.PARSE] == 2
+        assert counters[ParseCounter.PARSER_ATTEMPTS] == 2 + 4
+        assert counters[ParseCounter.NULL_PARSER_FALLBACKS] == 1
+        assert metrics.durations[ParseStage.FORMAT_DETECTION] > 0
+
+    def test_normal_failed_attempt(self):
+        metrics = ParseMetrics()
+        parser = PingParsing(metrics=metrics)
+
+        text = generate_ping_output(OsType.MACOS, count=100).text
+
+        # the Linux parser finds the statistics headline of macOS outputs, but fails to parse
+        start_time = time.perf_counter()
+        parser.parse(text)
+        total = time.perf_counter() - start_time
+
+        counters = metrics.counters
+        assert parser.parser_name == "macOS"
+        assert counters[ParseCounter.PARSER_ATTEMPTS] == 3
+        assert counters[ParseCounter.LINES_SCANNED] == len(text.splitlines())
+        assert sum(metrics.durations.values()) <= total
+
+    def test_normal_callback(self):
+        records = []
+        metrics = ParseMetrics(callback=lambda stage, duration: records.append(stage))
+        PingParsing(metrics=metrics).parse(DEBIAN_SUCCESS_0.value)
+
+        assert ParseStage.STATS_BODY in records
+        assert ParseStage.TIMESTAMP not in records
+
+    def test_normal_reset(self):
+        metrics = ParseMetrics()
+        PingParsing(metrics=metrics).parse(DEBIAN_SUCCESS_0.value)
+        metrics.reset()
+
+        assert all(value == 0 for value in metrics.counters.values())
+        assert all(value == 0 for value in metrics.durations.values())
+        assert set(metrics.as_dict()) == {"durations", "counters"}
+
+    @pytest.mark.parametrize(["value"], [[DEBIAN_SUCCESS_0.value], [""]])
+    def test_normal_disabled(self, value):
+        parser = PingParsing()
+
+        assert parser.metrics is None
+        parser.parse(value)
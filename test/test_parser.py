@@ -0,0 +1,193 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import random
+import re
+import time
+
+import pytest
+
+from pingparsing import PingParsing
+from pingparsing._parser import (
+    MAX_LINE_LENGTH,
+    AlpineLinuxPingParser,
+    LinuxPingParser,
+    MacOsPingParser,
+    WindowsPingParser,
+)
+
+from .data import WINDOWS7SP1_SUCCESS
+
+
+PARSER_CLASSES = (LinuxPingParser, WindowsPingParser, MacOsPingParser, AlpineLinuxPingParser)
+PATTERN_NAMES = (
+    ("_icmp_reply_pattern", re.IGNORECASE),
+    ("_icmp_no_ans_pattern", re.IGNORECASE),
+    ("_duplicate_packet_pattern", 0),
+    ("_stats_headline_pattern", 0),
+)
+
+# fragments of lines that nearly match the patterns
+FRAGMENTS = (
+    "9",
+    " ",
+    "\t",
+    ":",
+    "a",
+    ".",
+    "[",
+    "]",
+    "(",
+    ")",
+    "%",
+    "64 bytes from ",
+    " from ",
+    "Reply from ",
+    "icmp_seq=",
+    " ttl=",
+    " time=",
+    "bytes=",
+    "--- ",
+    " ping statistics",
+    "Ping statistics for ",
+    " no answer yet for ",
+    " (DUP!",
+)
+LINE_LENGTH = 10000
+GROWTH_FACTOR = 4
+
+# matching time of the patterns is linear in the line length: the time grows about
+# GROWTH_FACTOR times for GROWTH_FACTOR times longer lines, while quadratic backtracking
+# grows GROWTH_FACTOR ** 2 times. growth is compared instead of absolute times,
+# which depend on the machine (absolute times are measured by the benchmarks).
+MAX_GROWTH_RATIO = GROWTH_FACTOR * 2
+# allowance for the timer resolution and noise of short measurements [sec]
+TIME_SLACK = 0.01
+
+
+def measure_time(func, repeat=3):
+    elapsed_times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        elapsed_times.append(time.perf_counter() - start_time)
+
+    return min(elapsed_times)
+
+
+def assert_linear_growth(small_time, large_time, msg=None):
+    assert large_time < small_time * MAX_GROWTH_RATIO + TIME_SLACK, msg
+
+
+def make_adversarial_lines(line_length=LINE_LENGTH):
+    rand = random.Random(0)
+    lines = [
+        "9" * line_length,
+        " " * line_length + "x",
+        "[" + "1" * line_length,
+        "64 bytes from " + "a:" * (line_length // 2),
+        "1 bytes from " * (line_length // 13),
+        " from a" * (line_length // 7),
+        "--- " * (line_length // 4),
+        "64 bytes from a" + " (a" * (line_length // 3),
+        "64 bytes from " + "a (b) " * (line_length // 6),
+        "Ping statistics for " + "a:" * (line_length // 2),
+        "a" * line_length + " (DUP!",
+    ]
+    for _ in range(8):
+        line = ""
+        while len(line) < line_length:
+            line += rand.choice(FRAGMENTS) * rand.randint(1, 64)
+        lines.append(line)
+
+    return lines
+
+
+class Test_PingParser_patterns:
+    @pytest.mark.parametrize(["parser_class"], [[parser_class] for parser_class in PARSER_CLASSES])
+    def test_normal_adversarial(self, parser_class):
+        parser = parser_class()
+        regexps = [parser._get_regexp(name, flags) for name, flags in PATTERN_NAMES]
+
+        def search_all(line):
+            for regexp in regexps:
+                regexp.search(line)
+
+        for small_line, large_line in zip(
+            make_adversarial_lines(), make_adversarial_lines(LINE_LENGTH * GROWTH_FACTOR)
+        ):
+            assert_linear_growth(
+                measure_time(lambda: search_all(small_line)),
+                measure_time(lambda: search_all(large_line)),
+                small_line[:64],
+            )
+
+    @pytest.mark.parametrize(
+        ["line", "expected"],
+        [
+            [
+                "64 bytes from host-1.example.com (192.168.0.1): icmp_seq=1 ttl=64 time=0.1 ms",
+                "host-1.example.com (192.168.0.1)",
+            ],
+            ["64 bytes from fe80::1%eth0: icmp_seq=1 ttl=64 time=0.1 ms", "fe80::1%eth0"],
+            ["[1596881133.010052]64 bytes from ::1: icmp_seq=1 ttl=64 time=0.1 ms", "::1"],
+            [
+                "64 bytes from {}: icmp_seq=1 ttl=64 time=0.1 ms".format("a" * 253),
+                "a" * 253,
+            ],
+            [
+                "64 bytes from my host (192.168.0.1): icmp_seq=1 ttl=64 time=0.1 ms",
+                "my host (192.168.0.1)",
+            ],
+        ],
+    )
+    def test_normal_destination(self, line, expected):
+        reply = LinuxPingParser()._parse_icmp_reply_line(line)
+
+        assert reply["destination"] == expected
+
+    @pytest.mark.parametrize(
+        ["parser_class", "line", "expected"],
+        [
+            [LinuxPingParser, "--- my host ping statistics ---", "my host"],
+            [MacOsPingParser, "--- 192.168.0.1 ping statistics ---", "192.168.0.1"],
+            [WindowsPingParser, "Ping statistics for my host:", "my host"],
+            [WindowsPingParser, "Ping statistics for 192.168.0.1:", "192.168.0.1"],
+        ],
+    )
+    def test_normal_headline_destination(self, parser_class, line, expected):
+        assert parser_class()._parse_destination(line) == expected
+
+    def test_normal_duplicate(self):
+        parser = LinuxPingParser()
+
+        assert parser._parse_icmp_reply_line(
+            "64 bytes from ::1: icmp_seq=1 ttl=64 time=0.1 ms (DUP!)"
+        )["duplicate"]
+
+    def test_normal_max_line_length(self):
+        line = "64 bytes from ::1: icmp_seq=1 ttl=64 time=0.1 ms"
+        parser = LinuxPingParser()
+
+        assert parser._parse_icmp_reply_line(line.ljust(MAX_LINE_LENGTH)) is not None
+        assert parser._parse_icmp_reply_line(line.ljust(MAX_LINE_LENGTH + 1)) is None
+
+
+class Test_PingParsing_adversarial:
+    def test_normal(self):
+        def make_text(line_length):
+            lines = WINDOWS7SP1_SUCCESS.value.splitlines()
+            lines[1:1] = make_adversarial_lines(line_length)
+
+            return "\n".join(lines)
+
+        small_text = make_text(LINE_LENGTH)
+        large_text = make_text(LINE_LENGTH * GROWTH_FACTOR)
+        parser = PingParsing()
+
+        assert_linear_growth(
+            measure_time(lambda: parser.parse(small_text)),
+            measure_time(lambda: parser.parse(large_text)),
+        )
+        assert parser.parse(large_text).as_dict() == WINDOWS7SP1_SUCCESS.expected
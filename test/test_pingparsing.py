@@ -8,7 +8,7 @@ from textwrap import dedent
 import pytest
 import pytz
 
-from pingparsing import ParseError, PingResult
+from pingparsing import ParseError, PingResult, PingStats
 
 from .common import PingTestData, ping_parser  # noqa
 from .data import (
@@ -398,6 +398,51 @@ MACOS_DUPLICATE_0 = PingTestData(
     [],
 )
 
+MACOS_IPV6_SUCCESS = PingTestData(
+    dedent(
+        """\
+        PING6(56=40+8+8 bytes) 2001:db8::2 --> 2001:4860:4860::8888
+        16 bytes from 2001:4860:4860::8888, icmp_seq=0 hlim=117 time=13.093 ms
+        16 bytes from 2001:4860:4860::8888, icmp_seq=1 hlim=117 time=12.716 ms
+
+        --- 2001:4860:4860::8888 ping6 statistics ---
+        2 packets transmitted, 2 packets received, 0.0% packet loss
+        round-trip min/avg/max/std-dev = 12.716/12.905/13.093/0.189 ms
+        """
+    ),
+    {
+        "destination": "2001:4860:4860::8888",
+        "packet_transmit": 2,
+        "packet_receive": 2,
+        "packet_loss_count": 0,
+        "packet_loss_rate": 0.0,
+        "packet_duplicate_count": 0,
+        "packet_duplicate_rate": 0,
+        "rtt_min": 12.716,
+        "rtt_avg": 12.905,
+        "rtt_max": 13.093,
+        "rtt_mdev": 0.189,
+    },
+    [
+        {
+            "bytes": 16,
+            "destination": "2001:4860:4860::8888",
+            "icmp_seq": 0,
+            "ttl": 117,
+            "time": 13.093,
+            "duplicate": False,
+        },
+        {
+            "bytes": 16,
+            "destination": "2001:4860:4860::8888",
+            "icmp_seq": 1,
+            "ttl": 117,
+            "time": 12.716,
+            "duplicate": False,
+        },
+    ],
+)
+
 ALPINE_LINUX_SUCCESS = PingTestData(
     dedent(
         """\
@@ -795,6 +840,7 @@ class Test_PingParsing_parse:
             [MACOS_UNREACHABLE_1, "macOS"],
             [MACOS_UNREACHABLE_2, "macOS"],
             [MACOS_DUPLICATE_0, "macOS"],
+            [MACOS_IPV6_SUCCESS, "macOS"],
             [ALPINE_LINUX_SUCCESS, "AlpineLinux"],
             [ALPINE_LINUX_DUP_LOSS, "AlpineLinux"],
             [WINDOWS7SP1_SUCCESS, "Windows"],
@@ -816,6 +862,7 @@ class Test_PingParsing_parse:
             print(icmp_reply)
 
         assert ping_parser.parser_name == parser_name
+        assert stats.parser_name == parser_name
         assert stats.as_dict() == test_data.expected
         assert stats.icmp_replies == test_data.replies
 
@@ -855,6 +902,8 @@ class Test_PingParsing_parse:
         stats = ping_parser.parse("")
 
         assert stats.is_empty()
+        assert stats.parser_name is None
+        assert ping_parser.parser_name == "null"
 
     @pytest.mark.parametrize(
         ["value"],
@@ -884,6 +933,76 @@ class Test_PingParsing_parse:
             ping_parser.parse(value)
 
 
+def to_text(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class Test_PingParsing_parse_all:
+    @pytest.mark.parametrize(
+        ["test_data_list"],
+        [
+            [[DEBIAN_SUCCESS_0]],
+            [[DEBIAN_SUCCESS_0, WINDOWS7SP1_SUCCESS, MACOS_SUCCESS_0, ALPINE_LINUX_DUP_LOSS]],
+            [[FEDORA_DUP_LOSS, FEDORA_DUP_LOSS, WINDOWS10_LOSS, IPV6_LINUX]],
+            [[MACOS_IPV6_SUCCESS, MACOS_SUCCESS_0, MACOS_IPV6_SUCCESS, MACOS_IPV6_SUCCESS]],
+        ],
+    )
+    def test_normal(self, ping_parser, test_data_list):
+        text = "\n".join(to_text(test_data.value) for test_data in test_data_list)
+
+        stats_list = list(ping_parser.parse_all(text))
+
+        assert [stats.as_dict() for stats in stats_list] == [
+            test_data.expected for test_data in test_data_list
+        ]
+        assert [stats.icmp_replies for stats in stats_list] == [
+            test_data.replies for test_data in test_data_list
+        ]
+
+    def test_normal_file(self, ping_parser, tmpdir):
+        file_path = tmpdir.join("ping.log")
+        file_path.write(to_text(DEBIAN_SUCCESS_0.value) * 3)
+
+        with open(str(file_path)) as f:
+            stats_list = list(ping_parser.parse_all(f))
+
+        assert [stats.as_dict() for stats in stats_list] == [DEBIAN_SUCCESS_0.expected] * 3
+
+    def test_normal_interrupted(self, ping_parser):
+        text = "\n".join(
+            [
+                "PING google.com (216.58.196.238) 56(84) bytes of data.",
+                "64 bytes from 216.58.196.238: icmp_seq=1 ttl=117 time=10.1 ms",
+                to_text(DEBIAN_SUCCESS_0.value),
+            ]
+        )
+
+        stats_list = list(ping_parser.parse_all(text))
+
+        assert [stats.as_dict() for stats in stats_list] == [DEBIAN_SUCCESS_0.expected]
+
+    @pytest.mark.parametrize(["value"], [[""], [PingResult(stdout="", stderr="", returncode=2)]])
+    def test_normal_empty(self, ping_parser, value):
+        assert list(ping_parser.parse_all(value)) == []
+
+    def test_normal_truncated(self, ping_parser):
+        text = "\n".join(
+            [
+                to_text(DEBIAN_SUCCESS_0.value),
+                to_text(PING_FEDORA_EMPTY_BODY),
+                to_text(WINDOWS7SP1_SUCCESS.value),
+                to_text(PING_FEDORA_EMPTY_BODY),
+            ]
+        )
+
+        stats_list = list(ping_parser.parse_all(text))
+
+        assert [stats.as_dict() for stats in stats_list] == [
+            DEBIAN_SUCCESS_0.expected,
+            WINDOWS7SP1_SUCCESS.expected,
+        ]
+
+
 class Test_PingParsing_as_tuple:
     def test_normal(self, ping_parser):
         stats = ping_parser.parse(DEBIAN_SUCCESS_0.value)
@@ -901,3 +1020,36 @@ class Test_PingParsing_as_tuple:
         assert result.rtt_max == 212.597
         assert result.rtt_mdev == 27.566
         assert stats.icmp_replies == []
+
+        assert result == tuple(stats.as_dict().values())
+        assert type(result) is type(PingStats().as_tuple())
+
+
+class Test_PingStats_rows:
+    def test_normal(self, ping_parser):
+        stats_list = [
+            ping_parser.parse(DEBIAN_SUCCESS_0.value),
+            ping_parser.parse(UBUNTU_SUCCESS_1.value),
+            PingStats(),
+        ]
+
+        assert list(PingStats.rows(stats_list)) == [
+            tuple(stats.as_dict().values()) for stats in stats_list
+        ]
+
+    @pytest.mark.parametrize(
+        ["fields", "expected"],
+        [
+            [["rtt_avg"], [(99.731,), (None,)]],
+            [["destination", "packet_loss_rate"], [("google.com", 0.0), (None, None)]],
+        ],
+    )
+    def test_normal_fields(self, ping_parser, fields, expected):
+        stats_list = [ping_parser.parse(DEBIAN_SUCCESS_0.value), PingStats()]
+
+        assert list(PingStats.rows(stats_list, fields=fields)) == expected
+
+    @pytest.mark.parametrize(["fields"], [[[]], [["rtt_avg", "icmp_replies"]], [["unknown"]]])
+    def test_exception(self, fields):
+        with pytest.raises(ValueError):
+            PingStats.rows([PingStats()], fields=fields)
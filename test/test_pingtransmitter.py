@@ -2,6 +2,8 @@
 .. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
 """
 
+import asyncio
+
 import pytest
 from typepy import RealNumber
 
@@ -152,3 +154,84 @@ class Test_PingTransmitter_ping:
         transmitter.count = count
         with pytest.raises(expected):
             transmitter.ping()
+
+    @pytest.mark.parametrize(
+        ["host", "count", "expected"],
+        [
+            ["localhost", 0, ValueError],
+            ["localhost", "a", ValueError],
+        ],
+    )
+    def test_except_count_async(self, transmitter, host, count, expected):
+        transmitter.destination = host
+        transmitter.count = count
+        with pytest.raises(expected):
+            asyncio.run(transmitter.ping_async())
+
+
+class FakeSubprocessRunner:
+    commands = []
+
+    def __init__(self, command):
+        self.commands.append(command)
+        self.stdout = ""
+        self.stderr = ""
+        self.returncode = 0
+
+    def run(self):
+        return self.returncode
+
+
+class Test_PingTransmitter_cmd_cache:
+    @pytest.fixture
+    def commands(self, monkeypatch):
+        import pingparsing._pingtransmitter as transmitter_module
+
+        num_system_calls = []
+
+        def system():
+            num_system_calls.append(1)
+            return "Linux"
+
+        FakeSubprocessRunner.commands = []
+        monkeypatch.setattr(
+            transmitter_module.subprocrunner, "SubprocessRunner", FakeSubprocessRunner
+        )
+        monkeypatch.setattr(transmitter_module.platform, "system", system)
+        transmitter_module._get_cmd_maker_class.cache_clear()
+        yield FakeSubprocessRunner.commands
+
+        assert len(num_system_calls) <= 1
+        transmitter_module._get_cmd_maker_class.cache_clear()
+
+    def test_normal(self, transmitter, commands):
+        transmitter.destination = "192.168.0.1"
+        transmitter.count = 3
+
+        for _ in range(3):
+            transmitter.ping()
+
+        assert commands == [["ping", "-c", "3", "192.168.0.1"]] * 3
+
+        commands[0].append("modified")
+        transmitter.ping()
+        assert commands[-1] == ["ping", "-c", "3", "192.168.0.1"]
+
+    def test_normal_invalidate(self, transmitter, commands):
+        transmitter.destination = "192.168.0.1"
+        transmitter.count = 3
+        transmitter.ping()
+
+        transmitter.destination = "::1"
+        transmitter.ping()
+        transmitter.deadline = 5
+        transmitter.ping()
+        transmitter.ping_option = ["-n"]
+        transmitter.ping()
+
+        assert commands == [
+            ["ping", "-c", "3", "192.168.0.1"],
+            ["ping6", "-c", "3", "::1"],
+            ["ping6", "-w", "5", "-c", "3", "::1"],
+            ["ping6", "-w", "5", "-c", "3", "-n", "::1"],
+        ]
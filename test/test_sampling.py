@@ -0,0 +1,183 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import math
+import random
+
+import pytest
+
+from pingparsing import PingParsing, PingStreamParser, RttSketch
+from pingparsing._generator import OsType, generate_ping_output
+from pingparsing._sampling import IcmpReplySampler
+from pingparsing.exporter import calc_rtt_quantiles
+
+
+def nearest_rank(values, q):
+    values = sorted(values)
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+class Test_RttSketch:
+    @pytest.mark.parametrize(["q"], [[0.0], [0.1], [0.5], [0.9], [0.99], [1.0]])
+    def test_normal(self, q):
+        rand = random.Random(0)
+        values = [rand.lognormvariate(3, 0.5) for _ in range(10000)]
+        sketch = RttSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.count == len(values)
+        assert sketch.min == min(values)
+        assert sketch.max == max(values)
+        assert sketch.quantile(q) == pytest.approx(nearest_rank(values, q), rel=0.01)
+
+    def test_normal_merge(self):
+        lhs = RttSketch()
+        rhs = RttSketch()
+        for value in range(1, 101):
+            (lhs if value % 2 else rhs).add(float(value))
+        lhs.merge(rhs)
+
+        assert lhs.count == 100
+        assert lhs.min == 1.0
+        assert lhs.max == 100.0
+        assert lhs.quantile(0.5) == pytest.approx(50.0, rel=0.01)
+
+    def test_normal_zero(self):
+        sketch = RttSketch()
+        for value in [0.0, 0.0, 0.0, 1.0, 2.0]:
+            sketch.add(value)
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == 2.0
+
+    def test_normal_empty(self):
+        assert RttSketch().quantile(0.5) is None
+
+    @pytest.mark.parametrize(
+        ["kwargs", "q", "expected"],
+        [
+            [{"relative_accuracy": 0}, 0.5, ValueError],
+            [{"relative_accuracy": 1}, 0.5, ValueError],
+            [{}, 1.5, ValueError],
+            [{}, -0.1, ValueError],
+        ],
+    )
+    def test_exception(self, kwargs, q, expected):
+        with pytest.raises(expected):
+            RttSketch(**kwargs).quantile(q)
+
+
+class Test_IcmpReplySampler:
+    @pytest.mark.parametrize(["sampling"], [["reservoir"], ["tail"]])
+    def test_normal(self, sampling):
+        sampler = IcmpReplySampler(10, sampling=sampling, seed=0)
+        for seq in range(1, 101):
+            if seq in (30, 31):
+                # lost packets
+                continue
+
+            sampler.add({"icmp_seq": seq, "time": float(seq), "duplicate": False})
+            if seq == 50:
+                sampler.add({"icmp_seq": seq, "time": float(seq), "duplicate": True})
+        sampler.add({"icmp_seq": 101, "duplicate": False})
+
+        replies = sampler.get_replies()
+        seqs = [reply["icmp_seq"] for reply in replies]
+
+        assert sampler.num_replies == 100
+        assert len(replies) == 10 + 3
+        assert seqs == sorted(seqs)
+        assert 32 in seqs  # the reply after the gap
+        assert 101 in seqs  # no answer
+        assert [reply["duplicate"] for reply in replies].count(True) == 1
+        assert sampler.rtt_sketch.count == 98
+        assert sampler.rtt_sketch.max == 100.0
+        if sampling == "tail":
+            assert seqs[-11:-1] == list(range(91, 101))
+
+    def test_normal_wrap_around(self):
+        sampler = IcmpReplySampler(0)
+        for seq in (65533, 65534, 65535, 0, 2, 3):
+            # the packet of 1 is lost just after the wrap around
+            sampler.add({"icmp_seq": seq, "time": 1.0, "duplicate": False})
+
+        assert [reply["icmp_seq"] for reply in sampler.get_replies()] == [2]
+
+    def test_normal_uniform(self):
+        counts = [0] * 100
+        for seed in range(200):
+            sampler = IcmpReplySampler(10, seed=seed)
+            for seq in range(100):
+                sampler.add({"icmp_seq": seq, "time": 1.0, "duplicate": False})
+
+            for reply in sampler.get_replies():
+                counts[reply["icmp_seq"]] += 1
+
+        # each reply is sampled with the probability of 10%
+        assert sum(counts[:50]) == pytest.approx(sum(counts[50:]), rel=0.2)
+
+    @pytest.mark.parametrize(
+        ["max_replies", "sampling", "expected"],
+        [[-1, "reservoir", ValueError], [10, "unknown", ValueError]],
+    )
+    def test_exception(self, max_replies, sampling, expected):
+        with pytest.raises(expected):
+            IcmpReplySampler(max_replies, sampling=sampling)
+
+
+class Test_PingParsing_parse_max_replies:
+    @pytest.mark.parametrize(["os_type"], [[os_type] for os_type in OsType.LIST])
+    def test_normal(self, os_type):
+        generated = generate_ping_output(
+            os_type, count=1000, loss_rate=0.05, duplicate_rate=0.01, seed=0
+        )
+        expected = PingParsing().parse(generated.text)
+
+        stats = PingParsing().parse(generated.text, max_replies=50)
+
+        assert stats.as_dict() == expected.as_dict()
+        assert len(stats.icmp_replies) < len(expected.icmp_replies)
+        assert all(reply in expected.icmp_replies for reply in stats.icmp_replies)
+        assert expected.rtt_sketch is None
+
+        expected_quantiles = calc_rtt_quantiles(expected)
+        for q, value in calc_rtt_quantiles(stats).items():
+            assert value == pytest.approx(expected_quantiles[q], rel=0.01)
+
+    def test_normal_keep_losses(self):
+        generated = generate_ping_output(
+            OsType.LINUX, count=1000, loss_rate=0.05, duplicate_rate=0.01, seed=1
+        )
+        expected = PingParsing().parse(generated.text)
+
+        stats = PingParsing().parse(generated.text, max_replies=0)
+
+        assert [reply for reply in expected.icmp_replies if reply["duplicate"]] == [
+            reply for reply in stats.icmp_replies if reply["duplicate"]
+        ]
+        assert stats.rtt_sketch.count == expected.packet_receive
+
+    def test_exception(self):
+        generated = generate_ping_output(OsType.LINUX, count=10)
+
+        with pytest.raises(ValueError):
+            PingParsing().parse(generated.text, max_replies=10, sampling="unknown")
+
+
+class Test_PingStreamParser_max_replies:
+    def test_normal(self):
+        generated = generate_ping_output(
+            OsType.LINUX, count=500, timestamp=True, loss_rate=0.05, seed=0
+        )
+        expected = list(PingStreamParser(window=3600).iter_stats(generated.text.splitlines()))
+
+        stats_list = list(
+            PingStreamParser(window=3600, max_replies=20).iter_stats(generated.text.splitlines())
+        )
+
+        assert len(stats_list) == len(expected) == 1
+        assert stats_list[0].as_dict() == expected[0].as_dict()
+        assert len(stats_list[0].icmp_replies) < len(expected[0].icmp_replies)
+        assert stats_list[0].rtt_sketch.count == expected[0].packet_receive
@@ -0,0 +1,258 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import threading
+from concurrent import futures
+
+import pytest
+
+from pingparsing import PingParsing, PingResult, ProbeScheduler
+
+from .common import FakeClock
+from .data import DEBIAN_SUCCESS_0
+
+
+class ManualExecutor(futures.Executor):
+    """
+    Executor that does not run a function until complete() is called.
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = futures.Future()
+        self.pending.append((future, fn, args, kwargs))
+
+        return future
+
+    def complete(self, num=None):
+        pending = self.pending[:num]
+        self.pending = self.pending[len(pending) :]
+
+        for future, fn, args, kwargs in pending:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class StubTransmitter:
+    def __init__(self):
+        self.destinations = []
+
+    def ping(self, destination):
+        self.destinations.append(destination)
+
+        return PingResult(DEBIAN_SUCCESS_0.value, "", 0)
+
+
+def make_scheduler(targets, clock, executor, **kwargs):
+    transmitter = StubTransmitter()
+    results = {}
+
+    def on_result(target, result):
+        results[target] = PingParsing().parse(result)
+
+    scheduler = ProbeScheduler(
+        targets,
+        transmitter.ping,
+        clock=clock,
+        executor=executor,
+        on_result=on_result,
+        seed=0,
+        **kwargs,
+    )
+
+    return scheduler, transmitter, results
+
+
+class Test_ProbeScheduler:
+    def test_normal_phase_offset(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+        targets = [f"192.168.0.{i}" for i in range(100)]
+        scheduler, transmitter, results = make_scheduler(
+            targets, clock, executor, interval=60, jitter=0
+        )
+
+        offsets = [scheduler.phase_offset(target) for target in targets]
+        assert all(0 <= offset < 60 for offset in offsets)
+        assert offsets == [scheduler.phase_offset(target) for target in targets]
+
+        # probes are spread across the interval instead of starting all at once
+        assert scheduler.run_pending() == []
+        launched_per_sec = []
+        for _ in range(60):
+            clock.advance(1)
+            launched_per_sec.append(len(scheduler.run_pending()))
+            executor.complete()
+
+        assert sum(launched_per_sec) == 100
+        assert max(launched_per_sec) < 10
+        assert len(results) == 100
+        assert scheduler.counters["completed"] == 100
+
+        # each target is probed once per interval
+        for _ in range(60):
+            clock.advance(1)
+            scheduler.run_pending()
+            executor.complete()
+
+        assert len(transmitter.destinations) == 200
+        assert set(transmitter.destinations) == set(targets)
+
+    def test_normal_jitter(self):
+        clock = FakeClock()
+        scheduler, _, _ = make_scheduler(["a"], clock, ManualExecutor(), interval=10, jitter=0.5)
+        due = scheduler.next_due()
+
+        assert clock.now + scheduler.phase_offset("a") <= due
+        assert due < clock.now + scheduler.phase_offset("a") + 5
+
+    def test_normal_max_pps(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+        targets = [f"host{i}" for i in range(10)]
+        scheduler, _, _ = make_scheduler(
+            targets, clock, executor, interval=1, jitter=0, packets_per_probe=5, max_pps=10
+        )
+
+        clock.advance(1)
+        assert len(scheduler.run_pending()) == 2
+        executor.complete()
+        assert scheduler.counters["deferred"] > 0
+
+        # budget is refilled at 10 packets/sec: 2 probes/sec
+        launched = 0
+        for _ in range(4):
+            clock.advance(1)
+            launched += len(scheduler.run_pending())
+            executor.complete()
+
+        assert launched == 8
+
+    def test_normal_max_concurrency(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+        targets = [f"host{i}" for i in range(10)]
+        scheduler, _, _ = make_scheduler(
+            targets, clock, executor, interval=10, jitter=0, max_concurrency=3
+        )
+
+        clock.advance(10)
+        assert len(scheduler.run_pending()) == 3
+        assert scheduler.running == 3
+        assert scheduler.run_pending() == []
+
+        executor.complete(2)
+        assert scheduler.running == 1
+        assert len(scheduler.run_pending()) == 2
+
+    def test_normal_overrun(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+        scheduler, transmitter, _ = make_scheduler(["a"], clock, executor, interval=10, jitter=0)
+
+        clock.advance(10)
+        assert scheduler.run_pending() == ["a"]
+
+        # the previous probe is still running at the next slot
+        clock.advance(10)
+        assert scheduler.run_pending() == []
+        assert scheduler.counters["overrun"] == 1
+
+        executor.complete()
+        clock.advance(10)
+        assert scheduler.run_pending() == ["a"]
+        assert scheduler.counters["launched"] == 2
+
+    def test_normal_skip_missed_slots(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+        scheduler, _, _ = make_scheduler(["a"], clock, executor, interval=10, jitter=0)
+        offset = scheduler.phase_offset("a")
+
+        clock.advance(55)
+        assert scheduler.run_pending() == ["a"]
+        executor.complete()
+
+        # no burst to catch up with the missed slots
+        assert scheduler.run_pending() == []
+        assert scheduler.counters["skipped"] == int((55 - offset) // 10)
+        assert clock.now < scheduler.next_due() <= clock.now + 10
+
+    def test_normal_failed(self):
+        clock = FakeClock()
+        executor = ManualExecutor()
+
+        def probe(target):
+            raise RuntimeError("failed")
+
+        scheduler = ProbeScheduler(
+            ["a"], probe, interval=1, jitter=0, clock=clock, executor=executor
+        )
+        clock.advance(1)
+        scheduler.run_pending()
+        executor.complete()
+
+        assert scheduler.counters["failed"] == 1
+        assert scheduler.running == 0
+
+    def test_normal_run(self):
+        transmitter = StubTransmitter()
+        scheduler = ProbeScheduler(["a", "b"], transmitter.ping, interval=0.05, jitter=0)
+        stop_event = threading.Event()
+        thread = threading.Thread(target=scheduler.run, args=(stop_event, 0.01))
+        thread.start()
+
+        try:
+            for _ in range(500):
+                if {"a", "b"} <= set(transmitter.destinations):
+                    break
+                stop_event.wait(0.01)
+        finally:
+            stop_event.set()
+            thread.join()
+            scheduler.shutdown()
+
+        assert {"a", "b"} <= set(transmitter.destinations)
+
+    def test_normal_run_saturated(self):
+        release_event = threading.Event()
+        ticks = []
+
+        def probe(target):
+            release_event.wait(5)
+
+        scheduler = ProbeScheduler(["a", "b"], probe, interval=0.01, jitter=0, max_concurrency=1)
+        stop_event = threading.Event()
+        thread = threading.Thread(
+            target=scheduler.run, args=(stop_event, 0.1, lambda: ticks.append(None))
+        )
+        thread.start()
+
+        try:
+            # a probe is running and the other one is due: the loop must not spin
+            stop_event.wait(0.5)
+        finally:
+            release_event.set()
+            stop_event.set()
+            thread.join()
+            scheduler.shutdown()
+
+        assert len(ticks) < 50
+
+    @pytest.mark.parametrize(
+        ["kwargs", "expected"],
+        [
+            [{"interval": 0}, ValueError],
+            [{"max_pps": 0}, ValueError],
+            [{"max_concurrency": 0}, ValueError],
+            [{"jitter": 1}, ValueError],
+        ],
+    )
+    def test_exception(self, kwargs, expected):
+        with pytest.raises(expected):
+            ProbeScheduler(["a"], lambda target: None, **kwargs)
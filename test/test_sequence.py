@@ -0,0 +1,161 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+from textwrap import dedent
+
+import pytest
+
+from pingparsing import PingParsing, PingStreamParser
+from pingparsing._sequence import SequenceAnalyzer
+
+
+def reply(seq, received=True, duplicate=False):
+    icmp_reply = {"icmp_seq": seq, "duplicate": duplicate}
+    if received:
+        icmp_reply["time"] = 1.0
+
+    return icmp_reply
+
+
+def analyze(replies):
+    analyzer = SequenceAnalyzer()
+    for icmp_reply in replies:
+        analyzer.add(icmp_reply)
+
+    return analyzer.get_stats()
+
+
+PING_LOSS_BURSTS = dedent(
+    """\
+    PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.
+    [1596881133.010052] 64 bytes from 192.168.0.1: icmp_seq=1 ttl=64 time=10.0 ms
+    [1596881134.010052] no answer yet for icmp_seq=2
+    [1596881135.010052] no answer yet for icmp_seq=3
+    [1596881136.010052] 64 bytes from 192.168.0.1: icmp_seq=4 ttl=64 time=10.0 ms
+    [1596881136.510052] 64 bytes from 192.168.0.1: icmp_seq=3 ttl=64 time=1500.0 ms
+    [1596881138.010052] 64 bytes from 192.168.0.1: icmp_seq=6 ttl=64 time=10.0 ms
+    [1596881138.010052] 64 bytes from 192.168.0.1: icmp_seq=6 ttl=64 time=10.0 ms (DUP!)
+    [1596881139.010052] no answer yet for icmp_seq=7
+    [1596881140.010052] no answer yet for icmp_seq=8
+    [1596881141.010052] no answer yet for icmp_seq=9
+    [1596881142.010052] 64 bytes from 192.168.0.1: icmp_seq=10 ttl=64 time=10.0 ms
+
+    --- 192.168.0.1 ping statistics ---
+    10 packets transmitted, 5 received, +1 duplicates, 50% packet loss, time 9000ms
+    rtt min/avg/max/mdev = 10.000/259.167/1500.000/554.777 ms
+    """
+)
+
+
+class Test_SequenceAnalyzer:
+    @pytest.mark.parametrize(
+        ["replies", "expected"],
+        [
+            [
+                [reply(1), reply(2), reply(3)],
+                {
+                    "num_lost": 0,
+                    "loss_episodes": 0,
+                    "max_loss_burst": 0,
+                    "loss_bursts": {},
+                    "out_of_order": 0,
+                    "late_replies": 0,
+                    "gaps": [],
+                },
+            ],
+            [
+                [reply(1), reply(2, False), reply(3), reply(6), reply(7), reply(9)],
+                {
+                    "num_lost": 4,
+                    "loss_episodes": 3,
+                    "max_loss_burst": 2,
+                    "loss_bursts": {1: 2, 2: 1},
+                    "out_of_order": 0,
+                    "late_replies": 0,
+                    "gaps": [(4, 5), (8, 8)],
+                },
+            ],
+            [
+                [reply(1), reply(3), reply(2), reply(4), reply(4, duplicate=True)],
+                {
+                    "num_lost": 0,
+                    "loss_episodes": 0,
+                    "max_loss_burst": 0,
+                    "loss_bursts": {},
+                    "out_of_order": 1,
+                    "late_replies": 1,
+                    "gaps": [(2, 2)],
+                },
+            ],
+            [
+                [reply(1, False), reply(2, False), reply(3, False), reply(2), reply(4)],
+                {
+                    "num_lost": 2,
+                    "loss_episodes": 2,
+                    "max_loss_burst": 1,
+                    "loss_bursts": {1: 2},
+                    "out_of_order": 0,
+                    "late_replies": 1,
+                    "gaps": [],
+                },
+            ],
+        ],
+    )
+    def test_normal(self, replies, expected):
+        assert analyze(replies).as_dict() == expected
+
+    def test_normal_wrap_around(self):
+        stats = analyze([reply(65534), reply(65535), reply(1), reply(0), reply(2), reply(5)])
+
+        assert stats.gaps == [(65536, 65536), (65539, 65540)]
+        assert stats.num_lost == 2
+        assert stats.out_of_order == 1
+        assert stats.late_replies == 1
+
+    def test_normal_no_sequence(self):
+        analyzer = SequenceAnalyzer()
+        analyzer.add({"time": 1.0})
+
+        assert analyzer.num_sequences == 0
+
+
+class Test_PingStats_sequence_stats:
+    @pytest.mark.parametrize(["max_replies"], [[None], [0]])
+    def test_normal(self, max_replies):
+        stats = PingParsing().parse(PING_LOSS_BURSTS, max_replies=max_replies)
+
+        assert stats.sequence_stats.num_lost == stats.packet_loss_count
+        assert stats.sequence_stats.as_dict() == {
+            "num_lost": 5,
+            "loss_episodes": 3,
+            "max_loss_burst": 3,
+            "loss_bursts": {1: 2, 3: 1},
+            "out_of_order": 1,
+            "late_replies": 1,
+            "gaps": [(5, 5)],
+        }
+
+    def test_normal_stream(self):
+        stats_list = list(PingStreamParser(window=3600).iter_stats(PING_LOSS_BURSTS.splitlines()))
+
+        assert len(stats_list) == 1
+        assert stats_list[0].sequence_stats.num_lost == 5
+        assert stats_list[0].sequence_stats.max_loss_burst == 3
+
+    def test_normal_windows(self):
+        stats = PingParsing().parse(
+            dedent(
+                """\
+                Pinging 192.168.0.1 with 32 bytes of data:
+                Reply from 192.168.0.1: bytes=32 time<1ms TTL=64
+
+                Ping statistics for 192.168.0.1:
+                    Packets: Sent = 1, Received = 1, Lost = 0 (0% loss),
+                Approximate round trip times in milli-seconds:
+                    Minimum = 0ms, Maximum = 0ms, Average = 0ms
+                """
+            )
+        )
+
+        assert stats.sequence_stats is None
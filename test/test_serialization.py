@@ -0,0 +1,136 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytz
+
+from pingparsing import PingParsing, PingStats
+from pingparsing.__main__ import OutputFormat, parse_ping_text
+from pingparsing._generator import OsType, generate_ping_output
+
+from .common import local_tz_tokyo  # noqa
+from .data import DEBIAN_SUCCESS_0, WINDOWS7SP1_SUCCESS
+
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class Test_PingStats_to_bytes:
+    @pytest.mark.parametrize(
+        ["os_type", "timestamp"],
+        [[os_type, False] for os_type in OsType.LIST] + [[OsType.LINUX, True]],
+    )
+    def test_normal(self, os_type, timestamp):
+        generated = generate_ping_output(
+            os_type, count=500, timestamp=timestamp, loss_rate=0.1, duplicate_rate=0.05
+        )
+        stats = PingParsing().parse(generated.text)
+
+        data = stats.to_bytes()
+        restored = PingStats.from_bytes(data)
+
+        assert restored.as_dict(include_icmp_replies=True) == stats.as_dict(
+            include_icmp_replies=True
+        )
+        assert restored.parser_name == stats.parser_name
+        assert len(data) < len(json.dumps(stats.as_dict(include_icmp_replies=True), default=str))
+
+    def test_normal_timezone(self):
+        generated = generate_ping_output(OsType.LINUX, count=10, timestamp=True, loss_rate=0.2)
+        stats = PingParsing(timezone=pytz.timezone("Asia/Tokyo")).parse(generated.text)
+
+        restored = PingStats.from_bytes(stats.to_bytes())
+        assert restored.icmp_replies == stats.icmp_replies
+        assert restored.icmp_replies[0]["timestamp"].utcoffset().total_seconds() == 9 * 3600
+
+        restored = PingStats.from_bytes(stats.to_bytes(), timezone=pytz.utc)
+        assert restored.icmp_replies == stats.icmp_replies
+        assert restored.icmp_replies[0]["timestamp"].utcoffset().total_seconds() == 0
+
+    def test_normal_local_timestamp(self, local_tz_tokyo):
+        generated = generate_ping_output(OsType.LINUX, count=10, timestamp=True)
+        stats = PingParsing().parse(generated.text)
+
+        restored = PingStats.from_bytes(stats.to_bytes())
+
+        assert restored.icmp_replies == stats.icmp_replies
+        assert restored.icmp_replies[0]["timestamp"].tzinfo is None
+
+    def test_normal_utc_offsets(self):
+        # timestamps across a daylight saving time transition
+        stats = PingStats(
+            icmp_replies=[
+                {
+                    "icmp_seq": 1,
+                    "timestamp": datetime(
+                        2020, 3, 29, 1, 59, 59, tzinfo=timezone(timedelta(hours=1))
+                    ),
+                    "duplicate": False,
+                },
+                {
+                    "icmp_seq": 2,
+                    "timestamp": datetime(
+                        2020, 3, 29, 3, 0, 0, tzinfo=timezone(timedelta(hours=2))
+                    ),
+                    "duplicate": False,
+                },
+            ],
+        )
+
+        restored = PingStats.from_bytes(stats.to_bytes())
+
+        assert restored.icmp_replies == stats.icmp_replies
+        assert [reply["timestamp"].utcoffset() for reply in restored.icmp_replies] == [
+            timedelta(hours=1),
+            timedelta(hours=2),
+        ]
+
+    def test_normal_float_time(self):
+        stats = PingStats(
+            destination="localhost",
+            icmp_replies=[
+                {"icmp_seq": 1, "time": 0.0123456, "duplicate": False},
+                {"icmp_seq": 2, "time": 10.0, "duplicate": True},
+            ],
+        )
+
+        assert PingStats.from_bytes(stats.to_bytes()).icmp_replies == stats.icmp_replies
+
+    @pytest.mark.parametrize(["value"], [[DEBIAN_SUCCESS_0], [WINDOWS7SP1_SUCCESS]])
+    def test_normal_wo_icmp_replies(self, value):
+        stats = PingParsing().parse(value.value)
+
+        restored = PingStats.from_bytes(stats.to_bytes(include_icmp_replies=False))
+
+        assert restored.as_dict() == value.expected
+        assert restored.icmp_replies == []
+
+    def test_normal_empty(self):
+        assert PingStats.from_bytes(PingStats().to_bytes()).is_empty()
+
+    @pytest.mark.parametrize(
+        ["data", "expected"],
+        [
+            [b"", ValueError],
+            [b"\xc1", ValueError],
+            [msgpack.packb([1, 2]), ValueError],
+            [msgpack.packb({"v": 999, "s": [None] * 8}), ValueError],
+        ],
+    )
+    def test_exception(self, data, expected):
+        with pytest.raises(expected):
+            PingStats.from_bytes(data)
+
+
+class Test_parse_ping_text_msgpack:
+    def test_normal(self):
+        key, output = parse_ping_text(
+            "dest", DEBIAN_SUCCESS_0.value, True, "", output_format=OutputFormat.MSGPACK
+        )
+
+        assert key == "dest"
+        assert PingStats.from_bytes(output).as_dict() == DEBIAN_SUCCESS_0.expected
@@ -0,0 +1,158 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import sqlite3
+
+import pytest
+
+from pingparsing import PingParsing, PingStats
+from pingparsing._generator import OsType, generate_ping_output
+from pingparsing.store import PingStore
+
+from .common import local_tz_tokyo  # noqa
+
+
+START_TIME = 1596880800.0
+
+
+def make_stats(destination="192.168.0.1", count=120, start_time=START_TIME, **kwargs):
+    return PingParsing().parse(
+        generate_ping_output(
+            OsType.LINUX,
+            destination=destination,
+            count=count,
+            timestamp=True,
+            start_time=start_time,
+            **kwargs,
+        ).text
+    )
+
+
+class Test_PingStore:
+    def test_normal(self, tmpdir):
+        db_path = str(tmpdir.join("results.db"))
+        stats = make_stats(loss_rate=0.1, duplicate_rate=0.05)
+
+        with PingStore(db_path) as store:
+            assert store.add(stats) == []
+            assert store.flush() == [1]
+
+        with PingStore(db_path) as store:
+            assert store.add_all([make_stats(destination="192.168.0.2")]) == [2]
+
+            results = store.get_results(destination="192.168.0.1")
+            assert len(results) == 1
+            assert results[0]["timestamp"] == pytest.approx(START_TIME, abs=1)
+            expected = stats.as_dict()
+            del expected["packet_duplicate_rate"]
+            for key, value in expected.items():
+                assert results[0][key] == value
+
+        con = sqlite3.connect(db_path)
+        assert con.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert con.execute(
+            "SELECT COUNT(*), SUM(duplicate) FROM replies WHERE result_id = 1"
+        ).fetchone() == (len(stats.icmp_replies), stats.packet_duplicate_count)
+
+    @pytest.mark.parametrize(["batch_size"], [[1], [100], [10000]])
+    def test_normal_aggregate(self, batch_size):
+        store = PingStore(":memory:", batch_size=batch_size)
+        stats_list = [make_stats(count=60, start_time=START_TIME + i * 60) for i in range(3)]
+        store.add_all(stats_list)
+        store.add(make_stats(destination="192.168.0.2", count=60))
+
+        aggregates = store.aggregate(window=120, destination="192.168.0.1")
+
+        assert [row["window_start"] for row in aggregates] == [START_TIME, START_TIME + 120]
+        assert aggregates[0]["num_results"] == 2
+        assert aggregates[0]["packet_transmit"] == 120
+        assert aggregates[0]["packet_loss_rate"] == 0
+        assert aggregates[0]["rtt_min"] == min(stats.rtt_min for stats in stats_list[:2])
+        assert aggregates[0]["rtt_max"] == max(stats.rtt_max for stats in stats_list[:2])
+        assert aggregates[0]["rtt_avg"] == pytest.approx(
+            sum(stats.rtt_avg for stats in stats_list[:2]) / 2
+        )
+        assert len(store.aggregate(window=3600)) == 2
+        assert len(store.aggregate(window=60, start=START_TIME + 60, end=START_TIME + 120)) == 1
+
+    def test_normal_multiple_stores(self, tmpdir):
+        db_path = str(tmpdir.join("results.db"))
+        stats_list = [make_stats(count=10, start_time=START_TIME + i * 60) for i in range(4)]
+        store_a = PingStore(db_path)
+        store_b = PingStore(db_path)
+
+        store_a.add(stats_list[0])
+        store_b.add(stats_list[1])
+        store_a.add(stats_list[2])
+        result_ids = store_b.flush() + store_a.flush()
+        result_ids.extend(store_b.add_all(stats_list[3:]))
+        store_a.close()
+        store_b.close()
+
+        assert sorted(result_ids) == [1, 2, 3, 4]
+        con = sqlite3.connect(db_path)
+        for result_id, stats in zip(result_ids, [stats_list[1], stats_list[0], stats_list[2]]):
+            assert con.execute(
+                "SELECT COUNT(*), MIN(timestamp) FROM replies WHERE result_id = ?", (result_id,)
+            ).fetchone() == (len(stats.icmp_replies), pytest.approx(START_TIME, abs=200))
+
+    def test_normal_flush_failed(self):
+        store = PingStore(":memory:", batch_size=10000)
+        store.add(make_stats(count=10))
+        store._PingStore__con.execute("DROP TABLE replies")
+
+        with pytest.raises(sqlite3.OperationalError):
+            store.flush()
+
+        assert store.get_results() == []
+        assert store.flush() == []
+        store.close()
+
+    def test_normal_local_timestamp(self, local_tz_tokyo):  # noqa: F811
+        store = PingStore(":memory:")
+        stats = make_stats(count=10)
+
+        store.add_all([stats])
+
+        assert store.get_results()[0]["timestamp"] == pytest.approx(START_TIME, abs=1)
+        (min_timestamp,) = store._PingStore__con.execute(
+            "SELECT MIN(timestamp) FROM replies"
+        ).fetchone()
+        assert min_timestamp == pytest.approx(START_TIME, abs=1)
+
+    def test_normal_aggregate_replies(self):
+        store = PingStore(":memory:")
+        stats = make_stats(count=120, loss_rate=0.2)
+        store.add(stats)
+
+        aggregates = store.aggregate_replies(window=60)
+
+        assert len(aggregates) == 2
+        assert sum(row["num_answered"] for row in aggregates) == stats.packet_receive
+        assert min(row["rtt_min"] for row in aggregates) == stats.rtt_min
+        assert max(row["rtt_max"] for row in aggregates) == stats.rtt_max
+
+    def test_normal_wo_timestamp(self):
+        store = PingStore(":memory:")
+
+        store.add(PingStats(destination="localhost"), timestamp=100.0)
+        store.add(PingParsing().parse(generate_ping_output(OsType.WINDOWS, count=5).text))
+
+        results = store.get_results()
+        assert results[0]["timestamp"] == 100.0
+        assert results[1]["timestamp"] > 100.0
+
+    @pytest.mark.parametrize(["batch_size", "expected"], [[0, ValueError]])
+    def test_exception(self, batch_size, expected):
+        with pytest.raises(expected):
+            PingStore(":memory:", batch_size=batch_size)
+
+    @pytest.mark.parametrize(["window", "expected"], [[0, ValueError], [-1, ValueError]])
+    def test_exception_aggregate(self, window, expected):
+        store = PingStore(":memory:")
+
+        with pytest.raises(expected):
+            store.aggregate(window)
+        with pytest.raises(expected):
+            store.aggregate_replies(window)
@@ -0,0 +1,179 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import subprocess
+
+import pytest
+import subprocrunner
+
+import pingparsing._pingtransmitter
+from pingparsing import FakePingBackend, PingParsing, PingStreamParser
+from pingparsing._cmd_maker import WindowsPingCmdMaker
+from pingparsing._generator import OsType, generate_ping_output
+from pingparsing._pingtransmitter import _get_cmd_maker_class
+
+from .common import FakeClock, FakePopen, make_transmitter
+
+
+class Test_PingStreamParser:
+    @pytest.mark.parametrize(["loss_rate", "duplicate_rate"], [[0.0, 0.0], [0.2, 0.1]])
+    def test_normal_single_window(self, loss_rate, duplicate_rate):
+        generated = generate_ping_output(
+            OsType.LINUX,
+            count=50,
+            timestamp=True,
+            loss_rate=loss_rate,
+            duplicate_rate=duplicate_rate,
+        )
+        expected = PingParsing().parse(generated.text)
+
+        stats_list = list(PingStreamParser(window=3600).iter_stats(generated.text.splitlines()))
+
+        assert len(stats_list) == 1
+        stats = stats_list[0]
+        assert stats.destination == expected.destination
+        assert stats.packet_transmit == expected.packet_transmit
+        assert stats.packet_receive == expected.packet_receive
+        assert stats.packet_duplicate_count == expected.packet_duplicate_count
+        assert stats.rtt_min == expected.rtt_min
+        assert stats.rtt_max == expected.rtt_max
+        assert stats.rtt_avg == pytest.approx(expected.rtt_avg, abs=0.002)
+        assert len(stats.icmp_replies) == len(expected.icmp_replies)
+
+    def test_normal_windows(self):
+        generated = generate_ping_output(
+            OsType.LINUX, count=150, timestamp=True, loss_rate=0.1, start_time=1596881100.0
+        )
+        stream_parser = PingStreamParser(window=60)
+
+        stats_list = []
+        for line in generated.text.splitlines():
+            stats_list.extend(stream_parser.feed(line))
+        assert len(stats_list) == 2
+
+        stats_list.append(stream_parser.flush())
+        assert stream_parser.flush() is None
+        assert [stats.packet_transmit for stats in stats_list] == [60, 60, 30]
+        assert sum(stats.packet_receive for stats in stats_list) == generated.packet_receive
+
+        for i, stats in enumerate(stats_list):
+            window_start = 1596881100 + i * 60
+            for reply in stats.icmp_replies:
+                assert window_start <= reply["timestamp"].timestamp() < window_start + 60
+
+    def test_normal_late_reply(self):
+        lines = [
+            "[1596881100.000000] no answer yet for icmp_seq=1",
+            "[1596881160.100000] 64 bytes from 192.168.0.1: icmp_seq=2 ttl=64 time=1.00 ms",
+            "[1596881160.500000] 64 bytes from 192.168.0.1: icmp_seq=1 ttl=64 time=900 ms",
+        ]
+
+        stats_list = list(PingStreamParser(window=60).iter_stats(lines))
+
+        assert [stats.packet_transmit for stats in stats_list] == [1, 1]
+        assert [stats.packet_receive for stats in stats_list] == [0, 1]
+        assert stats_list[1].rtt_max == 1.0
+
+    def test_normal_arrival_time(self):
+        clock = FakeClock(1000.0)
+        stream_parser = PingStreamParser(window=10, clock=clock, destination="example.com")
+        line = "64 bytes from 192.168.0.1: icmp_seq={} ttl=64 time=1.00 ms"
+
+        assert stream_parser.feed(line.format(1)) == []
+        clock.now = 1005.0
+        assert stream_parser.feed(line.format(2)) == []
+        assert stream_parser.feed("PING 192.168.0.1 (192.168.0.1) 56(84) bytes of data.") == []
+        clock.now = 1010.0
+        stats_list = stream_parser.feed(line.format(3))
+
+        assert len(stats_list) == 1
+        assert stats_list[0].destination == "example.com"
+        assert stats_list[0].packet_receive == 2
+
+    def test_normal_flush_expired(self):
+        clock = FakeClock(1000.0)
+        stream_parser = PingStreamParser(window=10, clock=clock)
+        line = "64 bytes from 192.168.0.1: icmp_seq={} ttl=64 time=1.00 ms"
+
+        assert stream_parser.flush_expired() is None
+        stream_parser.feed(line.format(1))
+        clock.now = 1009.0
+        assert stream_parser.flush_expired() is None
+        clock.now = 1025.0
+        stats = stream_parser.flush_expired()
+        assert stats is not None
+        assert stats.packet_receive == 1
+        assert stream_parser.flush_expired() is None
+
+        # the next line starts a window of its own time
+        assert stream_parser.feed(line.format(2)) == []
+        clock.now = 1030.0
+        assert [stats.packet_receive for stats in stream_parser.feed(line.format(3))] == [1]
+
+    def test_exception(self):
+        with pytest.raises(ValueError):
+            PingStreamParser(window=0)
+
+
+class ContinuousPopen(FakePopen):
+    instances = []
+
+    # a continuous ping process does not output the statistics
+    text = generate_ping_output(
+        OsType.LINUX, count=30, timestamp=True, start_time=1596881100.0
+    ).text.split("\n\n")[0]
+    continuous = True
+
+
+class UnknownHostPopen(FakePopen):
+    stderr_text = "ping: unknown: Name or service not known\n"
+    exit_code = 2
+
+
+class Test_PingTransmitter_ping_stream:
+    def test_normal_fake_backend(self):
+        transmitter = make_transmitter(count=120, backend=FakePingBackend(seed=0), timestamp=True)
+
+        stats_list = list(transmitter.ping_stream(window=30))
+
+        assert 4 <= len(stats_list) <= 5
+        assert sum(stats.packet_transmit for stats in stats_list) == 120
+
+    def test_normal_process(self, monkeypatch):
+        if _get_cmd_maker_class().__name__ != "LinuxPingCmdMaker":
+            pytest.skip("the continuous ping command is only tested on Linux")
+
+        ContinuousPopen.instances = []
+        monkeypatch.setattr(subprocess, "Popen", ContinuousPopen)
+        transmitter = make_transmitter(count=None)
+
+        stream = transmitter.ping_stream(window=10)
+        stats = next(stream)
+        stream.close()
+
+        proc = ContinuousPopen.instances[0]
+        assert proc.command == ["ping", "-D", "-O", "192.168.0.1"]
+        assert proc.terminated
+        assert stats.packet_transmit == 10
+
+    def test_exception_process(self, monkeypatch):
+        if _get_cmd_maker_class().__name__ != "LinuxPingCmdMaker":
+            pytest.skip("the continuous ping command is only tested on Linux")
+
+        monkeypatch.setattr(subprocess, "Popen", UnknownHostPopen)
+        transmitter = make_transmitter("unknown", count=None)
+
+        with pytest.raises(subprocrunner.CommandError) as e:
+            list(transmitter.ping_stream(window=10))
+
+        assert "Name or service not known" in str(e.value)
+
+    def test_exception_windows(self, monkeypatch):
+        monkeypatch.setattr(
+            pingparsing._pingtransmitter, "_get_cmd_maker_class", lambda: WindowsPingCmdMaker
+        )
+        transmitter = make_transmitter(count=None)
+
+        with pytest.raises(RuntimeError):
+            next(transmitter.ping_stream(window=10))
@@ -0,0 +1,84 @@
+"""
+.. codeauthor:: Tsuyoshi Hombashi <tsuyoshi.hombashi@gmail.com>
+"""
+
+import threading
+from concurrent import futures
+
+import pytest
+
+from pingparsing import ParseCache, ParseMetrics, PingParsing
+from pingparsing._metrics import ParseCounter
+
+from .data import DEBIAN_SUCCESS_0, UBUNTU_SUCCESS_1, WINDOWS7SP1_SUCCESS
+
+
+NUM_THREADS = 8
+NUM_PARSES = 200
+
+TEST_DATA_LIST = [
+    [DEBIAN_SUCCESS_0, "Linux"],
+    [WINDOWS7SP1_SUCCESS, "Windows"],
+    [UBUNTU_SUCCESS_1, "Linux"],
+]
+
+
+def run_concurrently(target, func):
+    barrier = threading.Barrier(NUM_THREADS)
+
+    def worker(worker_id):
+        barrier.wait()
+        return [func(target, worker_id + i) for i in range(NUM_PARSES)]
+
+    with futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        return [
+            result for results in executor.map(worker, range(NUM_THREADS)) for result in results
+        ]
+
+
+class Test_PingParsing_threads:
+    @pytest.mark.parametrize(["cache"], [[None], [ParseCache()]])
+    def test_normal(self, cache):
+        metrics = ParseMetrics()
+        parser = PingParsing(metrics=metrics, cache=cache)
+
+        def parse(parser, i):
+            test_data, parser_name = TEST_DATA_LIST[i % len(TEST_DATA_LIST)]
+            stats = parser.parse(test_data.value)
+
+            # parser_name of the instance is local to each thread
+            return (
+                stats.parser_name == parser_name
+                and parser.parser_name == parser_name
+                and stats.as_dict() == test_data.expected
+            )
+
+        assert all(run_concurrently(parser, parse))
+        assert metrics.counters[ParseCounter.PARSE] == NUM_THREADS * NUM_PARSES
+
+    def test_normal_invalid(self):
+        parser = PingParsing()
+
+        def parse(parser, i):
+            if i % 2:
+                return parser.parse("invalid").parser_name is None and (
+                    parser.parser_name == "null"
+                )
+
+            return parser.parse(WINDOWS7SP1_SUCCESS.value).parser_name == "Windows"
+
+        assert all(run_concurrently(parser, parse))
+
+
+class Test_ParseMetrics_threads:
+    def test_normal(self):
+        metrics = ParseMetrics()
+
+        def increment(metrics, i):
+            metrics.increment(ParseCounter.LINES_SCANNED, 2)
+            metrics.add_duration("stage", 1.0)
+
+        run_concurrently(metrics, increment)
+
+        assert metrics.counters[ParseCounter.LINES_SCANNED] == 2 * NUM_THREADS * NUM_PARSES
+        assert metrics.durations["stage"] == NUM_THREADS * NUM_PARSES